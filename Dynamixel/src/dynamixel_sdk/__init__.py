@@ -23,9 +23,31 @@
 # from ..dynamixel_sdk.port_handler import *
 
 #
+import sys
+
 from .port_handler import *
+from .bus_arbiter import *
 from .packet_handler import *
+from .crc16 import *
+from .group_read_base import *
 from .group_sync_read import *
 from .group_sync_write import *
 from .group_bulk_read import *
 from .group_bulk_write import *
+from .health_tracker import *
+from .rtt_estimator import *
+from .bus_scheduler import *
+from .bus_multiplexer import *
+from .write_batch import *
+from .read_coalescer import *
+from .read_planner import *
+
+if sys.version_info >= (3, 5):   # asyncio 版本
+    from .async_port_handler import *
+    from .async_packet_handler import *
+    from .async_group_handler import *
+
+if sys.version_info >= (3, 8):   # multiprocessing.shared_memory
+    from .shared_state import *
+    from .bus_worker import *
+    from .bus_daemon import *
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# asyncio 版本的组通信，需配合 AsyncPortHandler 与 AsyncPacketHandler 使用
+# 参数管理与数据读取 (addParam, getData ...) 与同步版本相同
+
+from .robotis_def import *
+from .group_sync_read import GroupSyncRead
+from .group_bulk_read import GroupBulkRead
+from .group_sync_write import GroupSyncWrite
+from .group_bulk_write import GroupBulkWrite
+
+
+async def reprobeAsync(port, ph, ids):
+    # 重新探测已隔离的设备
+    health_tracker = port.health_tracker
+    if health_tracker is None:
+        return []
+
+    recovered = []
+    for dxl_id in health_tracker.getProbeIds(ids):
+        _, result, _ = await ph.ping(port, dxl_id)
+        health_tracker.reportProbe(dxl_id, result)
+        if result == COMM_SUCCESS:
+            recovered.append(dxl_id)
+
+    return recovered
+
+
+class AsyncGroupSyncRead(GroupSyncRead):
+    # txPacket 与同步版本相同；多个任务共用端口时请在 port.transaction() 中调用 txPacket 与 rxPacket
+    def rxPacketPoll(self):
+        # 非阻塞接收请使用 await rxPacket()
+        return COMM_NOT_AVAILABLE
+
+    async def rxPacket(self):
+        self.last_result = False
+
+        if self.ph.getProtocolVersion() == 1.0:
+            return COMM_NOT_AVAILABLE
+
+        if len(self.data_dict.keys()) == 0:
+            return COMM_NOT_AVAILABLE
+
+        if self.isFastRead():
+            data_list, result = await self.ph.fastReadRx(self.port, [self.data_length] * len(self.param))
+            return self.setFastDataList(data_list, result)
+
+        status_list, result = await self.ph.readRxMulti(self.port, dict.fromkeys(self.param_ids, self.data_length))
+        return self.setStatusList(status_list, result)
+
+    async def txRxPacket(self):
+        if self.ph.getProtocolVersion() == 1.0:
+            return COMM_NOT_AVAILABLE
+
+        await reprobeAsync(self.port, self.ph, self.data_dict)
+
+        async with self.port.transaction() as is_acquired:
+            if not is_acquired:
+                return COMM_PORT_BUSY
+
+            is_fast_read = self.isFastRead()
+
+            result = self.txPacket()
+            if result != COMM_SUCCESS:
+                return result
+
+            result = await self.rxPacket()
+
+            # fall back to Sync Read in the same cycle
+            if result != COMM_SUCCESS and is_fast_read and not self.isFastRead():
+                result = self.txPacket()
+                if result != COMM_SUCCESS:
+                    return result
+
+                result = await self.rxPacket()
+
+        return result
+
+
+class AsyncGroupBulkRead(GroupBulkRead):
+    # txPacket 与同步版本相同；多个任务共用端口时请在 port.transaction() 中调用 txPacket 与 rxPacket
+    def rxPacketPoll(self):
+        # 非阻塞接收请使用 await rxPacket()
+        return COMM_NOT_AVAILABLE
+
+    async def rxPacket(self):
+        self.last_result = False
+
+        if len(self.data_dict.keys()) == 0:
+            return COMM_NOT_AVAILABLE
+
+        if self.isFastRead():
+            data_lengths = [self.data_dict[dxl_id][PARAM_NUM_LENGTH] for dxl_id in self.param_ids]
+            data_list, result = await self.ph.fastReadRx(self.port, data_lengths)
+            return self.setFastDataList(data_list, result)
+
+        data_lengths = dict((dxl_id, self.data_dict[dxl_id][PARAM_NUM_LENGTH]) for dxl_id in self.param_ids)
+        status_list, result = await self.ph.readRxMulti(self.port, data_lengths)
+        return self.setStatusList(status_list, result)
+
+    async def txRxPacket(self):
+        await reprobeAsync(self.port, self.ph, self.data_dict)
+
+        async with self.port.transaction() as is_acquired:
+            if not is_acquired:
+                return COMM_PORT_BUSY
+
+            is_fast_read = self.isFastRead()
+
+            result = self.txPacket()
+            if result != COMM_SUCCESS:
+                return result
+
+            result = await self.rxPacket()
+
+            # fall back to Bulk Read in the same cycle
+            if result != COMM_SUCCESS and is_fast_read and not self.isFastRead():
+                result = self.txPacket()
+                if result != COMM_SUCCESS:
+                    return result
+
+                result = await self.rxPacket()
+
+        return result
+
+
+class AsyncGroupSyncWrite(GroupSyncWrite):
+    async def txPacket(self):
+        if len(self.data_dict.keys()) == 0:
+            return COMM_NOT_AVAILABLE
+
+        if self.is_param_changed is True or not self.param:
+            self.makeParam()
+
+        return await self.ph.syncWriteTxOnly(self.port, self.start_address, self.data_length, self.param,
+                                             len(self.data_dict.keys()) * (1 + self.data_length))
+
+
+class AsyncGroupBulkWrite(GroupBulkWrite):
+    async def txPacket(self):
+        if self.ph.getProtocolVersion() == 1.0 or len(self.data_list.keys()) == 0:
+            return COMM_NOT_AVAILABLE
+
+        if self.is_param_changed is True or len(self.param) == 0:
+            self.makeParam()
+
+        return await self.ph.bulkWriteTxOnly(self.port, self.param, len(self.param))
@@ -0,0 +1,386 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# asyncio 版本的 PacketHandler，需配合 AsyncPortHandler 使用
+# 数据包的构建与发送沿用同步版本，接收状态包时等待事件循环而不阻塞线程
+
+from .robotis_def import *
+from .packet_handler import PacketHandler
+from . import protocol1_packet_handler
+from . import protocol2_packet_handler
+from .status_receiver import StatusReceiver
+
+
+class AsyncPacketHandler(object):
+    def __init__(self, protocol_version):
+        self.ph = PacketHandler(protocol_version)
+
+        if self.ph.getProtocolVersion() == 1.0:
+            self.pkt_id = protocol1_packet_handler.PKT_ID
+        else:
+            self.pkt_id = protocol2_packet_handler.PKT_ID
+
+    # 不需要等待状态包的方法直接使用同步版本
+    def getProtocolVersion(self):
+        return self.ph.getProtocolVersion()
+
+    def getTxRxResult(self, result):
+        return self.ph.getTxRxResult(result)
+
+    def getRxPacketError(self, error):
+        return self.ph.getRxPacketError(error)
+
+    # 只发送指令包，状态包由 rxPacket / readRx / readRxMulti / fastReadRx 接收
+    # 多个任务共用端口时请在 port.transaction() 中调用
+    def readTx(self, port, dxl_id, address, length):
+        return self.ph.readTx(port, dxl_id, address, length)
+
+    def read1ByteTx(self, port, dxl_id, address):
+        return self.ph.read1ByteTx(port, dxl_id, address)
+
+    def read2ByteTx(self, port, dxl_id, address):
+        return self.ph.read2ByteTx(port, dxl_id, address)
+
+    def read4ByteTx(self, port, dxl_id, address):
+        return self.ph.read4ByteTx(port, dxl_id, address)
+
+    def syncReadTx(self, port, start_address, data_length, param, param_length):
+        return self.ph.syncReadTx(port, start_address, data_length, param, param_length)
+
+    def fastSyncReadTx(self, port, start_address, data_length, param, param_length):
+        return self.ph.fastSyncReadTx(port, start_address, data_length, param, param_length)
+
+    def bulkReadTx(self, port, param, param_length):
+        return self.ph.bulkReadTx(port, param, param_length)
+
+    def fastBulkReadTx(self, port, param, param_length):
+        return self.ph.fastBulkReadTx(port, param, param_length)
+
+    async def receiveStatus(self, port, receiver):
+        # 与同步版本的 receiveStatus 相同，等待数据时交还事件循环
+        while not receiver.step(port):
+            await port.waitForDataAsync()
+
+        receiver.finish(port)
+        return receiver
+
+    async def rxStatus(self, port):
+        # 需在 port.transaction() 中调用
+        receiver = await self.receiveStatus(port, StatusReceiver(self.ph.makeStatusParser()))
+        return receiver.status, receiver.result
+
+    async def txRxStatus(self, port, txpacket, dxl_id):
+        result, is_status_expected = self.ph.txRequestPacket(port, txpacket)
+        if not is_status_expected:
+            return None, result, 0
+
+        while True:
+            status, result = await self.rxStatus(port)
+            if result != COMM_SUCCESS or status.id == dxl_id:
+                break
+
+        if result != COMM_SUCCESS:
+            return None, result, 0
+
+        return status, result, status.error
+
+    async def runTxOnly(self, port, func, *args):
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return COMM_PORT_BUSY
+            return func(port, *args)
+
+    async def runTxRx(self, port, txpacket, dxl_id):
+        # 发送指令包并接收状态包，返回 通信状态, 错误
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return COMM_PORT_BUSY, 0
+            _, result, error = await self.txRxStatus(port, txpacket, dxl_id)
+
+        return result, error
+
+    async def rxPacket(self, port):
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return bytearray(), COMM_PORT_BUSY
+            status, result = await self.rxStatus(port)
+
+        if result != COMM_SUCCESS:
+            return bytearray(), result
+
+        return status.packet, result
+
+    async def txRxPacket(self, port, txpacket):
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return None, COMM_PORT_BUSY, 0
+            status, result, error = await self.txRxStatus(port, txpacket, txpacket[self.pkt_id])
+
+        if status is None:
+            return None, result, error
+
+        return status.packet, result, error
+
+    async def ping(self, port, dxl_id):
+        model_number = 0
+        error = 0
+
+        if dxl_id >= BROADCAST_ID:
+            return model_number, COMM_NOT_AVAILABLE, error
+
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return model_number, COMM_PORT_BUSY, error
+
+            status, result, error = await self.txRxStatus(port, self.ph.makePingPacket(dxl_id), dxl_id)
+            if port.health_tracker is not None:
+                port.health_tracker.reportResult(dxl_id, result)
+
+            if result == COMM_SUCCESS:
+                if self.getProtocolVersion() == 1.0:
+                    data_read, result, error = await self.readTxRx(port, dxl_id, 0, 2)  # Address 0 : Model Number
+                    if result == COMM_SUCCESS:
+                        model_number = DXL_MAKEWORD(data_read[0], data_read[1])
+                else:
+                    model_number = DXL_MAKEWORD(status.params[0], status.params[1])
+
+        return model_number, result, error
+
+    async def broadcastPing(self, port):
+        data_list = {}
+
+        if self.getProtocolVersion() == 1.0:
+            return None, COMM_NOT_AVAILABLE
+
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return data_list, COMM_PORT_BUSY
+
+            result = self.ph.txPacket(port, self.ph.makePingPacket(BROADCAST_ID))
+            if result != COMM_SUCCESS:
+                return data_list, result
+
+            # 与同步版本相同，接收窗口内等待所有设备应答
+            wait_length = self.ph.setBroadcastPingTimeout(port)
+            rxpacket = bytearray()
+            while True:
+                rxpacket += port.readPort(wait_length - len(rxpacket))
+                if port.isPacketTimeout():
+                    break
+
+                await port.waitForDataAsync()
+
+            port.releaseBus()
+
+        return self.ph.parseBroadcastPingPacket(rxpacket)
+
+    async def action(self, port, dxl_id):
+        result, _ = await self.runTxRx(port, self.ph.makeActionPacket(dxl_id), dxl_id)
+        return result
+
+    async def reboot(self, port, dxl_id):
+        if self.getProtocolVersion() == 1.0:
+            return COMM_NOT_AVAILABLE, 0
+
+        return await self.runTxRx(port, self.ph.makeRebootPacket(dxl_id), dxl_id)
+
+    async def clearMultiTurn(self, port, dxl_id):
+        if self.getProtocolVersion() == 1.0:
+            return COMM_NOT_AVAILABLE, 0
+
+        return await self.runTxRx(port, self.ph.makeClearMultiTurnPacket(dxl_id), dxl_id)
+
+    async def factoryReset(self, port, dxl_id, option):
+        if self.getProtocolVersion() == 1.0:  # Protocol 1.0 没有 option 参数
+            return await self.runTxRx(port, self.ph.makeFactoryResetPacket(dxl_id), dxl_id)
+
+        return await self.runTxRx(port, self.ph.makeFactoryResetPacket(dxl_id, option), dxl_id)
+
+    async def readRxBuffer(self, port, dxl_id, length):
+        data = EMPTY_DATA
+        error = 0
+
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return data, COMM_PORT_BUSY, error
+            while True:
+                status, result = await self.rxStatus(port)
+                if result != COMM_SUCCESS or status.id == dxl_id:
+                    break
+
+        if result == COMM_SUCCESS:
+            error = status.error
+            data = status.params[0: length]
+
+        return data, result, error
+
+    async def readTxRxBuffer(self, port, dxl_id, address, length):
+        data = EMPTY_DATA
+
+        if dxl_id >= BROADCAST_ID:
+            return data, COMM_NOT_AVAILABLE, 0
+
+        health_tracker = port.health_tracker
+        if health_tracker is not None and not health_tracker.isReachable(dxl_id):   # 已隔离的设备
+            return data, COMM_NOT_AVAILABLE, 0
+
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return data, COMM_PORT_BUSY, 0
+            status, result, error = await self.txRxStatus(port, self.ph.makeReadPacket(dxl_id, address, length),
+                                                          dxl_id)
+
+        if health_tracker is not None:
+            health_tracker.reportResult(dxl_id, result)
+
+        if result == COMM_SUCCESS:
+            data = status.params[0: length]
+
+        return data, result, error
+
+    async def readRx(self, port, dxl_id, length):
+        data, result, error = await self.readRxBuffer(port, dxl_id, length)
+        return list(data), result, error
+
+    async def readTxRx(self, port, dxl_id, address, length):
+        data, result, error = await self.readTxRxBuffer(port, dxl_id, address, length)
+        return list(data), result, error
+
+    async def read1ByteRx(self, port, dxl_id):
+        data, result, error = await self.readRxBuffer(port, dxl_id, 1)
+        data_read = data[0] if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    async def read1ByteTxRx(self, port, dxl_id, address):
+        data, result, error = await self.readTxRxBuffer(port, dxl_id, address, 1)
+        data_read = data[0] if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    async def read2ByteRx(self, port, dxl_id):
+        data, result, error = await self.readRxBuffer(port, dxl_id, 2)
+        data_read = DXL_MAKEWORD(data[0], data[1]) if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    async def read2ByteTxRx(self, port, dxl_id, address):
+        data, result, error = await self.readTxRxBuffer(port, dxl_id, address, 2)
+        data_read = DXL_MAKEWORD(data[0], data[1]) if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    async def read4ByteRx(self, port, dxl_id):
+        data, result, error = await self.readRxBuffer(port, dxl_id, 4)
+        data_read = DXL_MAKEDWORD(DXL_MAKEWORD(data[0], data[1]),
+                                  DXL_MAKEWORD(data[2], data[3])) if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    async def read4ByteTxRx(self, port, dxl_id, address):
+        data, result, error = await self.readTxRxBuffer(port, dxl_id, address, 4)
+        data_read = DXL_MAKEDWORD(DXL_MAKEWORD(data[0], data[1]),
+                                  DXL_MAKEWORD(data[2], data[3])) if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    async def writeTxOnly(self, port, dxl_id, address, length, data):
+        return await self.runTxOnly(port, self.ph.writeTxOnly, dxl_id, address, length, data)
+
+    async def writeTxRx(self, port, dxl_id, address, length, data):
+        if port.write_batch is not None and port.write_batch.isBatching():
+            return COMM_NOT_AVAILABLE, 0    # 合并后的写入没有状态包，WriteBatch 中请使用 write*TxOnly
+
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return COMM_PORT_BUSY, 0
+            _, result, error = await self.txRxStatus(port, self.ph.makeWritePacket(dxl_id, address, length, data),
+                                                     dxl_id)
+
+        return result, error
+
+    async def write1ByteTxOnly(self, port, dxl_id, address, data):
+        data_write = [data]
+        return await self.writeTxOnly(port, dxl_id, address, 1, data_write)
+
+    async def write1ByteTxRx(self, port, dxl_id, address, data):
+        data_write = [data]
+        return await self.writeTxRx(port, dxl_id, address, 1, data_write)
+
+    async def write2ByteTxOnly(self, port, dxl_id, address, data):
+        data_write = [DXL_LOBYTE(data), DXL_HIBYTE(data)]
+        return await self.writeTxOnly(port, dxl_id, address, 2, data_write)
+
+    async def write2ByteTxRx(self, port, dxl_id, address, data):
+        data_write = [DXL_LOBYTE(data), DXL_HIBYTE(data)]
+        return await self.writeTxRx(port, dxl_id, address, 2, data_write)
+
+    async def write4ByteTxOnly(self, port, dxl_id, address, data):
+        data_write = [DXL_LOBYTE(DXL_LOWORD(data)),
+                      DXL_HIBYTE(DXL_LOWORD(data)),
+                      DXL_LOBYTE(DXL_HIWORD(data)),
+                      DXL_HIBYTE(DXL_HIWORD(data))]
+        return await self.writeTxOnly(port, dxl_id, address, 4, data_write)
+
+    async def write4ByteTxRx(self, port, dxl_id, address, data):
+        data_write = [DXL_LOBYTE(DXL_LOWORD(data)),
+                      DXL_HIBYTE(DXL_LOWORD(data)),
+                      DXL_LOBYTE(DXL_HIWORD(data)),
+                      DXL_HIBYTE(DXL_HIWORD(data))]
+        return await self.writeTxRx(port, dxl_id, address, 4, data_write)
+
+    async def regWriteTxOnly(self, port, dxl_id, address, length, data):
+        return await self.runTxOnly(port, self.ph.regWriteTxOnly, dxl_id, address, length, data)
+
+    async def regWriteTxRx(self, port, dxl_id, address, length, data):
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return COMM_PORT_BUSY, 0
+            txpacket = self.ph.makeWritePacket(dxl_id, address, length, data, INST_REG_WRITE)
+            _, result, error = await self.txRxStatus(port, txpacket, dxl_id)
+
+        return result, error
+
+    async def syncWriteTxOnly(self, port, start_address, data_length, param, param_length):
+        return await self.runTxOnly(port, self.ph.syncWriteTxOnly, start_address, data_length, param, param_length)
+
+    async def bulkWriteTxOnly(self, port, param, param_length):
+        return await self.runTxOnly(port, self.ph.bulkWriteTxOnly, param, param_length)
+
+    async def readRxMulti(self, port, data_lengths):
+        """
+        Receive all status packets of Sync Read / Bulk Read in one receive window
+        :return: {dxl_id: StatusPacket}, 通信状态
+        """
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return {}, COMM_PORT_BUSY
+            receiver = await self.receiveStatus(port, StatusReceiver(self.ph.makeStatusParser(), data_lengths))
+
+        return receiver.status_list, receiver.result
+
+    async def fastReadRx(self, port, data_lengths):
+        if self.getProtocolVersion() == 1.0:
+            return {}, COMM_NOT_AVAILABLE
+
+        async with port.transaction() as is_acquired:
+            if not is_acquired:
+                return {}, COMM_PORT_BUSY
+            status, result = await self.rxStatus(port)
+
+        if result != COMM_SUCCESS:
+            return {}, result
+
+        return self.ph.parseFastReadPacket(status.packet, data_lengths)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# asyncio 版本的端口：等待数据时由事件循环监听串口文件描述符，不阻塞线程
+# 需要 Python 3.5 以上
+
+import asyncio
+
+from .port_handler import *
+
+BUS_POLL_INTERVAL = 0.0005  # 总线被其他线程占用时的重试间隔 (s)
+ASYNC_BUS_TIMEOUT = 1000.0  # 等待总线的默认超时 (ms)，同一事件循环中的任务排队使用端口
+
+
+def currentTask():
+    if hasattr(asyncio, 'current_task'):
+        return asyncio.current_task()
+    return asyncio.Task.current_task()
+
+
+class AsyncBusTransaction(object):
+    """
+    async with port.transaction() as is_acquired:
+    同一任务内可以嵌套
+    """
+    def __init__(self, port, priority=None, timeout=-1):
+        self.port = port
+        self.priority = priority
+        self.timeout = timeout
+        self.is_acquired = False
+
+    async def __aenter__(self):
+        self.is_acquired = await self.port.acquireBusAsync(self.priority, self.timeout)
+        return self.is_acquired
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.is_acquired:
+            self.port.releaseBusAsync()
+
+
+class AsyncPortHandler(PortHandler):
+    def __init__(self, port_name):
+        PortHandler.__init__(self, port_name)
+        self.setBusTimeout(ASYNC_BUS_TIMEOUT)
+
+        self.async_lock = None      # 同一事件循环中的任务互斥
+        self.async_owner = None     # 占用总线的任务
+        self.async_depth = 0
+
+    def setTxEndTiming(self, tx_end_timing):
+        # TX_END_TIMING_DRAIN 在 writePort 中阻塞等待发送完成，会阻塞事件循环，请使用 TX_END_TIMING_COMPUTED
+        if tx_end_timing == TX_END_TIMING_DRAIN:
+            return False
+        return PortHandler.setTxEndTiming(self, tx_end_timing)
+
+    def transaction(self, priority=None, timeout=-1):
+        return AsyncBusTransaction(self, priority, timeout)
+
+    async def acquireBusAsync(self, priority=None, timeout=-1):
+        """
+        :param timeout: 等待超时 (ms)，-1 时使用总线仲裁的默认超时，None 时一直等待
+        :return: 是否获得总线
+        """
+        task = currentTask()
+        if self.async_owner is task:    # 同一任务重入
+            self.async_depth += 1
+            return True
+
+        if timeout == -1:
+            timeout = self.bus_arbiter.getTimeout()
+
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout is None else loop.time() + timeout / 1000.0
+
+        if self.async_lock is None:
+            self.async_lock = asyncio.Lock()
+
+        if not self.async_lock.locked():
+            await self.async_lock.acquire()
+        else:
+            try:
+                await asyncio.wait_for(self.async_lock.acquire(),
+                                       None if deadline is None else max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                return False
+
+        # 其他线程也可能使用该端口，不阻塞事件循环地等待
+        while not self.bus_arbiter.hold(priority, 0):
+            if deadline is not None and loop.time() >= deadline:
+                self.async_lock.release()
+                return False
+            await asyncio.sleep(BUS_POLL_INTERVAL)
+
+        self.async_owner = task
+        self.async_depth = 1
+        return True
+
+    def releaseBusAsync(self):
+        self.async_depth -= 1
+        if self.async_depth > 0:
+            return
+
+        self.async_owner = None
+        self.bus_arbiter.unhold()
+        self.async_lock.release()
+
+    async def waitForDataAsync(self):
+        # 等待串口可读或超时
+        timeout = self.getTimeUntilTimeoutNs() / 1000000000.0
+        if timeout <= 0:
+            return False
+
+        loop = asyncio.get_event_loop()
+        if self.rx_fd is None:
+            await asyncio.sleep(min(timeout, BUS_POLL_INTERVAL))
+            return True
+
+        future = loop.create_future()
+
+        def onReadable():
+            if not future.done():
+                future.set_result(True)
+
+        try:
+            loop.add_reader(self.rx_fd, onReadable)
+        except NotImplementedError:     # 例如 Windows 的 ProactorEventLoop
+            await asyncio.sleep(min(timeout, BUS_POLL_INTERVAL))
+            return True
+
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(self.rx_fd)
+
+        return True
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 总线仲裁：多个线程共享同一端口时按优先级排队，同优先级先到先得
+# acquire / release: 单次通信 (txPacket 获取，rxPacket 释放)
+# hold / unhold: 多次通信组成的事务，期间单次通信的 release 不释放总线
+
+import heapq
+import itertools
+import threading
+import time
+
+BUS_PRIORITY_LOW = -10
+BUS_PRIORITY_NORMAL = 0
+BUS_PRIORITY_HIGH = 10
+
+BUS_TIMEOUT = 0.0       # 等待总线的默认超时 (ms)，0 时与旧版本相同立即返回 COMM_PORT_BUSY，None 为一直等待
+
+monotonicTime = getattr(time, 'monotonic', time.time)
+
+
+class BusArbiter(object):
+    def __init__(self, timeout=BUS_TIMEOUT):
+        self.cond = threading.Condition(threading.Lock())
+        self.owner = None       # 占用总线的线程
+        self.hold_depth = 0     # hold 嵌套层数
+        self.waiters = []       # (-priority, seq, thread)
+        self.seq = itertools.count()
+
+        self.timeout = timeout
+        self.local = threading.local()  # 线程默认优先级
+
+    def setTimeout(self, timeout):  # ms
+        self.timeout = timeout
+
+    def getTimeout(self):
+        return self.timeout
+
+    def setThreadPriority(self, priority):     # 当前线程的默认优先级
+        self.local.priority = priority
+
+    def getThreadPriority(self):
+        return getattr(self.local, 'priority', BUS_PRIORITY_NORMAL)
+
+    def isLocked(self):
+        return self.owner is not None
+
+    def isOwner(self):
+        return self.owner is threading.current_thread()
+
+    def getWaiterCount(self):
+        return len(self.waiters)
+
+    def acquire(self, priority=None, timeout=-1):
+        """
+        :param priority: 优先级，None 时使用线程默认优先级
+        :param timeout: 等待超时 (ms)，-1 时使用默认超时，0 时不等待，None 时一直等待
+        :return: 是否获得总线
+        """
+        me = threading.current_thread()
+
+        with self.cond:
+            if self.owner is me:    # 同一线程重入
+                return True
+
+            if self.owner is None and not self.waiters:
+                self.owner = me
+                return True
+
+            if timeout == -1:
+                timeout = self.timeout
+            if timeout is not None and timeout <= 0:
+                return False
+
+            if priority is None:
+                priority = self.getThreadPriority()
+
+            entry = (-priority, next(self.seq), me)
+            heapq.heappush(self.waiters, entry)
+
+            deadline = None if timeout is None else monotonicTime() + timeout / 1000.0
+            while self.owner is not None or self.waiters[0] is not entry:
+                remaining = None if deadline is None else deadline - monotonicTime()
+                if remaining is not None and remaining <= 0:
+                    self.waiters.remove(entry)
+                    heapq.heapify(self.waiters)
+                    self.cond.notify_all()
+                    return False
+
+                self.cond.wait(remaining)
+
+            heapq.heappop(self.waiters)
+            self.owner = me
+            return True
+
+    def release(self):
+        # 只有占用总线的线程可以释放，hold 期间不释放
+        with self.cond:
+            if self.owner is not threading.current_thread() or self.hold_depth > 0:
+                return
+
+            self.owner = None
+            self.cond.notify_all()
+
+    def hold(self, priority=None, timeout=-1):
+        if not self.acquire(priority, timeout):
+            return False
+
+        with self.cond:
+            self.hold_depth += 1
+        return True
+
+    def unhold(self):
+        with self.cond:
+            if self.owner is not threading.current_thread() or self.hold_depth == 0:
+                return
+
+            self.hold_depth -= 1
+            if self.hold_depth == 0:
+                self.owner = None
+                self.cond.notify_all()
+
+    def forceRelease(self):
+        # 占用总线的线程异常退出时使用
+        with self.cond:
+            self.owner = None
+            self.hold_depth = 0
+            self.cond.notify_all()
+
+    def __enter__(self):
+        self.hold(timeout=None)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.unhold()
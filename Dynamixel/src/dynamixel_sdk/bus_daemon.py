@@ -0,0 +1,525 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 本地总线守护进程：由一个进程占用端口，多个客户端进程 (控制、记录、标定 ...) 通过 Unix socket 共用总线
+# 客户端的订阅与单次读取合并为每个端口每周期一次 Sync Read / Bulk Read，状态通过 SharedStateBlock 共享
+# 请求与响应为一行一个 JSON 对象，需要 Python 3.8 以上
+
+import json
+import os
+import selectors
+import socket
+import stat
+import threading
+
+from .robotis_def import *
+from .port_handler import monotonicNs
+from .read_coalescer import mergeReadWindows, makeMergedRead, getMergedData
+from .shared_state import SharedStateBlock, SharedStateView
+
+DAEMON_SOCKET_PATH = '/tmp/dynamixel_sdk.sock'
+DAEMON_CYCLE_TIME = 10.0        # 守护进程的读取周期 (ms)
+DAEMON_SOCKET_TIMEOUT = 1.0     # BusClient 的收发超时 (s)
+DAEMON_RECV_SIZE = 4096
+DAEMON_OUTBOX_SIZE = 65536      # 客户端未取走的响应超过该长度时断开该客户端 (bytes)
+
+
+def isInteger(value, minimum, maximum):
+    # JSON 中的 true / false 不作为整数
+    return isinstance(value, int) and not isinstance(value, bool) and minimum <= value <= maximum
+
+
+class DaemonBus(object):
+    # 守护进程中的一条总线
+    def __init__(self, port, ph):
+        self.port = port
+        self.ph = ph
+
+        self.subscriptions = {}     # sub_id: [client, ids, address, length, SharedStateBlock]
+        self.reads = []             # 单次读取: [client, dxl_id, address, length]
+        self.writes = []            # 单次写入: [client, dxl_id, address, data]
+
+        self.reader = None
+        self.windows = {}           # dxl_id: [start_address, end_address]，合并后的读取区域
+
+    def updateReader(self):
+        # 合并所有订阅与单次读取的区域
+        requests = [(sub[1], sub[2], sub[3]) for sub in self.subscriptions.values()]
+        requests += [([read[1]], read[2], read[3]) for read in self.reads]
+
+        windows = mergeReadWindows(requests)
+        if windows == self.windows:
+            return
+
+        self.windows = windows
+        self.reader = makeMergedRead(self.port, self.ph, windows) if windows else None
+
+    def getReadData(self, dxl_id, address, length):
+        """
+        :return: 数据, 通信状态, 错误, 数据时刻 (ns)
+        """
+        return getMergedData(self.reader, self.windows, dxl_id, address, length)
+
+    def isValidRegion(self, address, length):
+        # Protocol 1.0 的地址与长度为 1 byte
+        limit = 0xFF if self.ph.getProtocolVersion() == 1.0 else 0xFFFF
+        return isInteger(address, 0, limit) and isInteger(length, 1, limit) and address + length <= limit + 1
+
+
+class DaemonClient(object):
+    # 非阻塞 socket：未能立即发出的响应保存在 txbuffer，可写时继续发送，读取慢的客户端不阻塞读写周期
+    def __init__(self, sock):
+        self.sock = sock
+        self.rxbuffer = bytearray()
+        self.txbuffer = bytearray()
+        self.is_closed = False      # 连接出错或响应积压过多，由守护进程断开
+
+    def send(self, response):
+        if self.is_closed:
+            return False
+
+        self.txbuffer += (json.dumps(response) + '\n').encode()
+        if len(self.txbuffer) > DAEMON_OUTBOX_SIZE:
+            self.is_closed = True
+            return False
+
+        return self.flush()
+
+    def flush(self):
+        while self.txbuffer and not self.is_closed:
+            try:
+                length = self.sock.send(self.txbuffer)
+            except (BlockingIOError, InterruptedError):     # 发送缓冲区已满，等待可写
+                return True
+            except (IOError, OSError):
+                self.is_closed = True
+                return False
+            del self.txbuffer[0: length]
+
+        return not self.is_closed
+
+
+class BusDaemon(object):
+    def __init__(self, socket_path=DAEMON_SOCKET_PATH, cycle_time=DAEMON_CYCLE_TIME):
+        self.socket_path = socket_path
+        self.cycle_time_ns = int(cycle_time * 1000000)
+
+        self.buses = {}         # port_name: DaemonBus
+        self.clients = []
+        self.sub_count = 0
+
+        self.server = None
+        self.selector = None
+        self.thread = None
+        self.is_running = False
+        self.cycle_count = 0
+
+    def addPort(self, port_name, port, ph):
+        """
+        :param port_name: 客户端用来指定总线的名称
+        :param port: 已打开的 PortHandler
+        """
+        if port_name in self.buses:
+            return False
+
+        self.buses[port_name] = DaemonBus(port, ph)
+        return True
+
+    def setCycleTime(self, cycle_time):     # ms
+        self.cycle_time_ns = int(cycle_time * 1000000)
+
+    def getCycleCount(self):
+        return self.cycle_count
+
+    def start(self):
+        # 在后台线程中运行
+        if self.is_running or not self.open():
+            return False
+
+        self.thread = threading.Thread(target=self.loop)
+        self.thread.daemon = True
+        self.thread.start()
+        return True
+
+    def stop(self):
+        self.is_running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def serve(self):
+        # 在当前线程中运行，直到 stop()
+        if self.is_running or not self.open():
+            return False
+
+        self.loop()
+        return True
+
+    def open(self):
+        if not hasattr(socket, 'AF_UNIX'):
+            return False
+
+        if os.path.exists(self.socket_path):
+            if not self.isStaleSocket():    # 其他守护进程正在使用，或不是 socket 文件
+                return False
+            os.unlink(self.socket_path)     # 上一次运行残留的 socket 文件
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.server.bind(self.socket_path)
+            self.server.listen(8)
+        except (IOError, OSError):
+            self.server.close()
+            self.server = None
+            return False
+        self.server.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server, selectors.EVENT_READ)
+
+        self.is_running = True
+        return True
+
+    def isStaleSocket(self):
+        # socket 文件存在但无法连接
+        try:
+            if not stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                return False
+        except (IOError, OSError):
+            return False
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except (IOError, OSError):
+            return True
+        finally:
+            sock.close()
+
+        return False
+
+    def close(self):
+        for client in list(self.clients):
+            self.removeClient(client)
+
+        self.selector.close()
+        self.server.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def loop(self):
+        next_cycle = monotonicNs()
+        try:
+            while self.is_running:
+                timeout = max(next_cycle - monotonicNs(), 0) / 1000000000.0
+                for key, events in self.selector.select(timeout):
+                    if key.fileobj is self.server:
+                        self.acceptClient()
+                        continue
+                    if events & selectors.EVENT_WRITE:
+                        key.data.flush()
+                    if events & selectors.EVENT_READ:
+                        self.receiveClient(key.data)
+
+                now = monotonicNs()
+                if now >= next_cycle:
+                    self.runCycle()
+                    next_cycle += self.cycle_time_ns
+                    if next_cycle < now:
+                        next_cycle = now
+
+                self.updateClients()
+        finally:
+            self.close()
+
+    def runCycle(self):
+        # 每条总线：执行单次写入，再执行合并后的组读取并发布结果
+        for bus in self.buses.values():
+            writes, bus.writes = bus.writes, []
+            for client, dxl_id, address, data in writes:
+                try:
+                    result, error = bus.ph.writeTxRx(bus.port, dxl_id, address, len(data), data)
+                except Exception:   # 单个请求失败不影响守护进程
+                    bus.port.releaseBus()
+                    result, error = COMM_TX_FAIL, 0
+                client.send({'result': result, 'error': error})
+
+            bus.updateReader()
+            if bus.reader is not None:
+                try:
+                    bus.reader.txRxPacket()
+                except Exception:   # 各设备的通信状态保持上一次的结果
+                    bus.port.releaseBus()
+
+            for client, ids, address, length, block in bus.subscriptions.values():
+                for idx, dxl_id in enumerate(ids):
+                    data, result, error, timestamp = bus.getReadData(dxl_id, address, length)
+                    block.write(idx, data, result, error, timestamp)
+
+            reads, bus.reads = bus.reads, []
+            for client, dxl_id, address, length in reads:
+                data, result, error, _ = bus.getReadData(dxl_id, address, length)
+                client.send({'result': result, 'error': error, 'data': list(data)})
+
+        self.cycle_count += 1
+
+    def acceptClient(self):
+        try:
+            sock, _ = self.server.accept()
+        except (IOError, OSError):
+            return
+
+        sock.setblocking(False)
+        client = DaemonClient(sock)
+        self.clients.append(client)
+        self.selector.register(sock, selectors.EVENT_READ, client)
+
+    def updateClients(self):
+        # 断开出错的客户端；有未发出的响应时等待可写
+        for client in list(self.clients):
+            if client.is_closed:
+                self.removeClient(client)
+                continue
+
+            events = selectors.EVENT_READ
+            if client.txbuffer:
+                events |= selectors.EVENT_WRITE
+            if self.selector.get_key(client.sock).events != events:
+                self.selector.modify(client.sock, events, client)
+
+    def removeClient(self, client):
+        for bus in self.buses.values():
+            for sub_id in [sub_id for sub_id, sub in bus.subscriptions.items() if sub[0] is client]:
+                self.removeSubscription(bus, sub_id)
+            bus.reads = [read for read in bus.reads if read[0] is not client]
+            bus.writes = [write for write in bus.writes if write[0] is not client]
+
+        self.selector.unregister(client.sock)
+        client.sock.close()
+        self.clients.remove(client)
+
+    def receiveClient(self, client):
+        try:
+            data = client.sock.recv(DAEMON_RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except (IOError, OSError):
+            data = b''
+
+        if not data:    # 客户端断开
+            self.removeClient(client)
+            return
+
+        client.rxbuffer += data
+        while True:
+            idx = client.rxbuffer.find(b'\n')
+            if idx < 0:
+                break
+
+            line = bytes(client.rxbuffer[0: idx])
+            del client.rxbuffer[0: idx + 1]
+
+            try:
+                self.handleRequest(client, json.loads(line.decode()))
+            except (ValueError, KeyError, TypeError, AttributeError):     # 格式错误的请求
+                client.send({'result': COMM_TX_ERROR})
+
+    def handleRequest(self, client, request):
+        op = request.get('op')
+
+        if op == 'ports':
+            client.send({'result': COMM_SUCCESS, 'ports': list(self.buses)})
+            return
+
+        if op == 'unsubscribe':
+            for bus in self.buses.values():
+                sub = bus.subscriptions.get(request.get('sub_id'))
+                if sub is not None and sub[0] is client:
+                    self.removeSubscription(bus, request['sub_id'])
+            client.send({'result': COMM_SUCCESS})
+            return
+
+        bus = self.buses.get(request.get('port'))
+        if bus is None:
+            client.send({'result': COMM_NOT_AVAILABLE})
+            return
+
+        if not self.isValidRequest(bus, op, request):
+            client.send({'result': COMM_TX_ERROR})
+            return
+
+        if op == 'subscribe':
+            ids = list(request['ids'])
+            try:
+                block = SharedStateBlock(len(ids), request['length'])
+            except (IOError, OSError):  # 无法创建共享内存 (/dev/shm 空间不足等)
+                client.send({'result': COMM_TX_FAIL})
+                return
+            self.sub_count += 1
+            bus.subscriptions[self.sub_count] = [client, ids, request['address'], request['length'], block]
+            client.send({'result': COMM_SUCCESS, 'sub_id': self.sub_count, 'name': block.getName()})
+
+        elif op == 'read':    # 下一个周期与其他读取合并执行后响应
+            bus.reads.append([client, request['id'], request['address'], request['length']])
+
+        elif op == 'write':   # 下一个周期执行后响应
+            bus.writes.append([client, request['id'], request['address'], request['data']])
+
+        else:
+            client.send({'result': COMM_NOT_AVAILABLE})
+
+    def isValidRequest(self, bus, op, request):
+        # 检查 ID、地址、长度与写入数据的范围
+        if op == 'subscribe':
+            ids = request.get('ids')
+            if not isinstance(ids, list) or not ids or not all(isInteger(dxl_id, 0, MAX_ID) for dxl_id in ids):
+                return False
+            return bus.isValidRegion(request.get('address'), request.get('length'))
+
+        if op == 'read':
+            if not isInteger(request.get('id'), 0, MAX_ID):
+                return False
+            return bus.isValidRegion(request.get('address'), request.get('length'))
+
+        if op == 'write':
+            data = request.get('data')
+            if not isInteger(request.get('id'), 0, MAX_ID) or not isinstance(data, list):
+                return False
+            if not all(isInteger(value, 0, 0xFF) for value in data):
+                return False
+            return bus.isValidRegion(request.get('address'), len(data))
+
+        return True
+
+    def removeSubscription(self, bus, sub_id):
+        block = bus.subscriptions.pop(sub_id)[4]
+        block.close()
+        block.unlink()
+
+
+class BusSubscription(SharedStateView):
+    # 客户端订阅：守护进程每周期更新的共享状态
+    def __init__(self, sub_id, name, ids, address, length):
+        SharedStateView.__init__(self, SharedStateBlock.attach(name, len(ids), length), ids, address, length)
+        self.sub_id = sub_id
+
+    def close(self):
+        self.block.close()
+
+
+class BusClient(object):
+    def __init__(self, socket_path=DAEMON_SOCKET_PATH):
+        self.socket_path = socket_path
+        self.sock = None
+        self.rxbuffer = bytearray()
+        self.subscriptions = []
+
+    def connect(self):
+        if not hasattr(socket, 'AF_UNIX'):
+            return False
+
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(self.socket_path)
+        except (IOError, OSError):
+            self.sock.close()
+            self.sock = None
+            return False
+
+        return True
+
+    def close(self):
+        for subscription in self.subscriptions:
+            subscription.close()
+        self.subscriptions = []
+
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def request(self, request):
+        """
+        :return: 守护进程的响应，连接失败时通信状态为 COMM_TX_FAIL / COMM_RX_FAIL
+        """
+        if self.sock is None:
+            return {'result': COMM_PORT_BUSY}
+
+        try:
+            self.sock.sendall((json.dumps(request) + '\n').encode())
+        except (IOError, OSError):
+            return {'result': COMM_TX_FAIL}
+
+        while True:
+            idx = self.rxbuffer.find(b'\n')
+            if idx >= 0:
+                line = bytes(self.rxbuffer[0: idx])
+                del self.rxbuffer[0: idx + 1]
+                return json.loads(line.decode())
+
+            try:
+                data = self.sock.recv(DAEMON_RECV_SIZE)
+            except (IOError, OSError):
+                data = b''
+            if not data:
+                return {'result': COMM_RX_FAIL}
+            self.rxbuffer += data
+
+    def getPortNames(self):
+        return self.request({'op': 'ports'}).get('ports', [])
+
+    def subscribe(self, port_name, ids, address, length):
+        """
+        Subscribe to a region read by the daemon every cycle
+        :return: BusSubscription (getData / isAvailable / getState)，失败时为 None
+        """
+        ids = list(ids)
+        response = self.request({'op': 'subscribe', 'port': port_name, 'ids': ids,
+                                 'address': address, 'length': length})
+        if response['result'] != COMM_SUCCESS:
+            return None
+
+        subscription = BusSubscription(response['sub_id'], response['name'], ids, address, length)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription not in self.subscriptions:
+            return
+
+        self.subscriptions.remove(subscription)
+        subscription.close()
+        self.request({'op': 'unsubscribe', 'sub_id': subscription.sub_id})
+
+    def read(self, port_name, dxl_id, address, length):
+        """
+        :return: 数据, 通信状态, 错误
+        """
+        response = self.request({'op': 'read', 'port': port_name, 'id': dxl_id,
+                                 'address': address, 'length': length})
+        return response.get('data', []), response['result'], response.get('error', 0)
+
+    def write(self, port_name, dxl_id, address, data):
+        """
+        :return: 通信状态, 错误
+        """
+        response = self.request({'op': 'write', 'port': port_name, 'id': dxl_id,
+                                 'address': address, 'data': list(data)})
+        return response['result'], response.get('error', 0)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 多端口复用：在单个线程中同时进行多条总线上的组通信
+# 各端口先发送指令，再用一个 selectors 循环等待所有端口的响应，周期接近最慢的单条总线
+
+import time
+
+try:
+    import selectors
+except ImportError:     # Python 2
+    selectors = None
+
+from .robotis_def import *
+
+MUX_POLL_INTERVAL = 0.0002  # 无法监听文件描述符时的轮询间隔 (s)
+
+
+class BusMultiplexer(object):
+    def __init__(self):
+        self.groups = []        # 同一端口上的组按加入顺序依次执行
+        self.results = {}       # group: 最近一次的通信状态
+
+        self.pending = {}       # port: (正在接收的 group, 是否为 Fast Read)
+        self.queues = {}        # port: 等待发送的 group 列表
+
+    def addGroup(self, group):
+        """
+        :param group: GroupSyncRead / GroupBulkRead / GroupSyncWrite / GroupBulkWrite
+        """
+        if group in self.groups:
+            return False
+
+        self.groups.append(group)
+        return True
+
+    def removeGroup(self, group):
+        if group not in self.groups:
+            return
+
+        self.groups.remove(group)
+        self.results.pop(group, None)
+
+    def clearGroups(self):
+        self.groups = []
+        self.results.clear()
+
+    def getPorts(self):
+        ports = []
+        for group in self.groups:
+            if group.port not in ports:
+                ports.append(group.port)
+        return ports
+
+    def getResult(self, group):
+        return self.results.get(group, COMM_NOT_AVAILABLE)
+
+    def txRxPacket(self):
+        """
+        Run every group once, overlapping the transactions on different ports
+        :return: 全部成功时为 COMM_SUCCESS，否则为第一个失败的组的通信状态
+        """
+        self.queues = {}
+        for group in self.groups:
+            self.queues.setdefault(group.port, []).append(group)
+
+        selector = self.makeSelector()
+        try:
+            for port in list(self.queues):
+                if not self.startNext(port):
+                    self.unregister(selector, port)
+
+            while self.pending:
+                for port in list(self.pending):
+                    if self.pollPort(port) and not self.startNext(port):
+                        self.unregister(selector, port)
+
+                if self.pending:
+                    self.wait(selector)
+        finally:
+            if selector is not None:
+                selector.close()
+
+        for group in self.groups:
+            if self.results[group] != COMM_SUCCESS:
+                return self.results[group]
+
+        return COMM_SUCCESS
+
+    def makeSelector(self):
+        if selectors is None:
+            return None
+
+        selector = selectors.DefaultSelector()
+        for port in self.queues:
+            if port.rx_fd is not None:
+                selector.register(port.rx_fd, selectors.EVENT_READ, port)
+
+        return selector
+
+    def unregister(self, selector, port):
+        # 该端口的组均已完成，不再监听
+        if selector is not None and port.rx_fd is not None:
+            selector.unregister(port.rx_fd)
+
+    def startNext(self, port):
+        # 发送该端口上的下一个组，写指令无需等待响应
+        queue = self.queues[port]
+        while queue:
+            group = queue.pop(0)
+
+            if not hasattr(group, 'rxPacketPoll'):  # GroupSyncWrite / GroupBulkWrite
+                self.results[group] = group.txPacket()
+                continue
+
+            if port.health_tracker is not None:    # 重新探测已隔离的设备
+                port.health_tracker.reprobe(port, group.ph, group.data_dict)
+
+            is_fast_read = group.isFastRead()
+            result = group.txPacket()
+            if result != COMM_SUCCESS:
+                self.results[group] = result
+                continue
+
+            self.pending[port] = (group, is_fast_read)
+            return True
+
+        return False
+
+    def pollPort(self, port):
+        # 接收已到达的数据，该端口的组完成时返回 True
+        group, is_fast_read = self.pending[port]
+
+        result = group.rxPacketPoll()
+        if result == COMM_RX_WAITING:
+            return False
+
+        # fall back to Sync Read / Bulk Read in the same cycle
+        if result != COMM_SUCCESS and is_fast_read and not group.isFastRead():
+            result = group.txPacket()
+            if result == COMM_SUCCESS:
+                self.pending[port] = (group, False)
+                return False
+
+        del self.pending[port]
+        self.results[group] = result
+        return True
+
+    def wait(self, selector):
+        # 等待任一端口可读，或最早的超时时刻
+        timeout = min(port.getTimeUntilTimeoutNs() for port in self.pending) / 1000000000.0
+        if timeout <= 0:
+            return
+
+        if selector is None or any(port.rx_fd is None for port in self.pending):
+            time.sleep(min(timeout, MUX_POLL_INTERVAL))
+            return
+
+        selector.select(timeout)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 按优先级调度同一总线上的通信
+# 每个周期先执行控制类通信，剩余时间内再执行普通类和后台类 (诊断等) 通信
+
+import threading
+import time
+
+from .port_handler import monotonicNs
+from .bus_arbiter import BUS_PRIORITY_HIGH
+
+SCHED_CLASS_CONTROL = 0     # 每个周期必须执行
+SCHED_CLASS_NORMAL = 1
+SCHED_CLASS_BACKGROUND = 2  # 仅在控制周期的空闲时间执行
+SCHED_CLASS_NUM = 3
+
+CYCLE_TIME = 2.0            # 周期 (ms), 500 Hz
+STARVATION_TIME = 1000.0    # 等待超过该时间 (ms) 视为饥饿
+DURATION_ALPHA = 0.25       # 执行时间估计的平滑系数
+
+
+class BusJob(object):
+    def __init__(self, func, sched_class, name=None, period=None):
+        self.func = func
+        self.sched_class = sched_class
+        self.name = name
+        self.period_ns = None if period is None else int(period * 1000000)   # None: 单次执行
+
+        self.submit_time_ns = monotonicNs()
+        self.next_run_ns = self.submit_time_ns
+        self.duration_ns = None     # 执行时间估计 (ns)
+        self.run_count = 0
+        self.defer_count = 0
+        self.is_cancelled = False
+
+        self.result = None
+        self.error = None           # func 抛出的异常
+        self.error_count = 0
+        self.done_event = threading.Event()
+
+    def isPeriodic(self):
+        return self.period_ns is not None
+
+    def isDone(self):
+        return self.done_event.is_set()
+
+    def wait(self, timeout=None):   # ms
+        return self.done_event.wait(None if timeout is None else timeout / 1000.0)
+
+    def getError(self):
+        return self.error
+
+    def getWaitTimeNs(self, now):
+        return now - self.next_run_ns
+
+    def run(self):
+        start = monotonicNs()
+        try:
+            self.result = self.func()
+            self.error = None
+        except Exception as e:  # 记录异常，不影响其他通信与调度线程
+            self.result = None
+            self.error = e
+            self.error_count += 1
+        duration = monotonicNs() - start
+
+        if self.duration_ns is None:
+            self.duration_ns = duration
+        else:
+            self.duration_ns += DURATION_ALPHA * (duration - self.duration_ns)
+
+        self.run_count += 1
+        if self.isPeriodic():
+            self.next_run_ns += self.period_ns
+            if self.next_run_ns < start:    # 跳过错过的周期
+                self.next_run_ns = start
+        else:
+            self.done_event.set()
+
+        return duration
+
+
+class BusScheduler(object):
+    def __init__(self, port, cycle_time=CYCLE_TIME, starvation_time=STARVATION_TIME):
+        self.port = port
+        self.cycle_time_ns = int(cycle_time * 1000000)
+        self.starvation_time_ns = int(starvation_time * 1000000)
+
+        self.lock = threading.Lock()
+        self.queues = [[] for _ in range(SCHED_CLASS_NUM)]
+
+        self.thread = None
+        self.is_running = False
+
+        self.resetStats()
+
+    def setCycleTime(self, cycle_time):     # ms
+        self.cycle_time_ns = int(cycle_time * 1000000)
+
+    def getCycleTime(self):
+        return self.cycle_time_ns / 1000000.0
+
+    def setStarvationTime(self, starvation_time):   # ms
+        self.starvation_time_ns = int(starvation_time * 1000000)
+
+    def submit(self, func, sched_class=SCHED_CLASS_BACKGROUND, name=None):
+        """
+        Queue a one-shot transaction
+        :param func: 执行通信的函数，返回值保存在 job.result
+        :return: BusJob, 可用 job.wait() 等待执行完成
+        """
+        job = BusJob(func, sched_class, name)
+        with self.lock:
+            self.queues[sched_class].append(job)
+        return job
+
+    def addPeriodic(self, func, sched_class=SCHED_CLASS_CONTROL, period=None, name=None):
+        """
+        Add a transaction executed periodically
+        :param period: 执行间隔 (ms)，None 时每个周期执行
+        """
+        job = BusJob(func, sched_class, name, 0 if period is None else period)
+        with self.lock:
+            self.queues[sched_class].append(job)
+        return job
+
+    def cancel(self, job):
+        with self.lock:
+            if job in self.queues[job.sched_class]:
+                self.queues[job.sched_class].remove(job)
+        job.is_cancelled = True
+        job.done_event.set()
+
+    def getPendingCount(self, sched_class=None):
+        if sched_class is None:
+            return sum(len(queue) for queue in self.queues)
+        return len(self.queues[sched_class])
+
+    def runCycle(self):
+        """
+        Execute one scheduling cycle
+        :return: 本周期使用的时间 (ns)
+        """
+        cycle_start = monotonicNs()
+        deadline = cycle_start + self.cycle_time_ns
+
+        # 周期内不允许其他线程插入；等待总线不超过本周期的时间
+        if not self.port.holdBus(BUS_PRIORITY_HIGH, self.cycle_time_ns / 1000000.0):
+            self.cycle_count += 1
+            self.busy_count += 1    # 未获得总线，跳过本周期
+            return monotonicNs() - cycle_start
+
+        try:
+            for sched_class in range(SCHED_CLASS_NUM):
+                with self.lock:
+                    jobs = list(self.queues[sched_class])
+
+                for job in jobs:
+                    now = monotonicNs()
+                    if job.next_run_ns > now:
+                        continue
+
+                    # 非控制类通信只在剩余时间足够时执行
+                    if sched_class != SCHED_CLASS_CONTROL and (
+                            now >= deadline or (job.duration_ns is not None and now + job.duration_ns > deadline)):
+                        job.defer_count += 1
+                        self.stats[sched_class]['deferred'] += 1
+                        continue
+
+                    self.updateWaitStats(job, now)
+                    job.run()
+                    self.stats[sched_class]['executed'] += 1
+                    if job.error is not None:
+                        self.stats[sched_class]['failed'] += 1
+
+                    if not job.isPeriodic():
+                        with self.lock:
+                            if job in self.queues[sched_class]:
+                                self.queues[sched_class].remove(job)
+        finally:
+            self.port.unholdBus()
+
+        used = monotonicNs() - cycle_start
+        self.cycle_count += 1
+        if used > self.cycle_time_ns:
+            self.overrun_count += 1
+
+        return used
+
+    def updateWaitStats(self, job, now):
+        stats = self.stats[job.sched_class]
+        wait = job.getWaitTimeNs(now)
+        if wait > stats['max_wait_ns']:
+            stats['max_wait_ns'] = wait
+        if wait > self.starvation_time_ns:
+            stats['starved'] += 1
+
+    def resetStats(self):
+        self.cycle_count = 0
+        self.overrun_count = 0      # 超出周期时间的次数
+        self.busy_count = 0         # 未获得总线而跳过的周期数
+        self.stats = [{'executed': 0, 'failed': 0, 'deferred': 0, 'starved': 0, 'max_wait_ns': 0}
+                      for _ in range(SCHED_CLASS_NUM)]
+
+    def getStats(self, sched_class):
+        """
+        :return: executed: 已执行次数, failed: 其中抛出异常的次数, deferred: 因时间不足推迟的次数,
+                 starved: 等待超过 starvation_time 后才执行的次数, max_wait_ns: 最长等待时间,
+                 waiting: 当前等待超过 starvation_time 的通信数, pending: 当前排队的通信数
+        """
+        now = monotonicNs()
+        stats = dict(self.stats[sched_class])
+        with self.lock:
+            queue = list(self.queues[sched_class])
+        stats['pending'] = len(queue)
+        stats['waiting'] = sum(1 for job in queue if job.getWaitTimeNs(now) > self.starvation_time_ns)
+        return stats
+
+    def start(self):
+        # 在后台线程中按周期执行
+        if self.is_running:
+            return False
+
+        self.is_running = True
+        self.thread = threading.Thread(target=self.loop)
+        self.thread.daemon = True
+        self.thread.start()
+        return True
+
+    def stop(self):
+        self.is_running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def loop(self):
+        next_cycle = monotonicNs()
+        while self.is_running:
+            self.runCycle()
+
+            next_cycle += self.cycle_time_ns
+            now = monotonicNs()
+            if next_cycle > now:
+                time.sleep((next_cycle - now) / 1000000000.0)
+            else:
+                next_cycle = now
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 每条总线一个进程：端口的组读写在独立的工作进程中执行，解析与校验不受 GIL 限制
+# 设备状态与目标指令通过 SharedStateBlock 交换，需要 Python 3.8 以上
+
+import multiprocessing
+import struct
+import time
+
+from .robotis_def import *
+from .port_handler import PortHandler, DEFAULT_BAUDRATE, monotonicNs
+from .packet_handler import PacketHandler
+from .group_sync_read import GroupSyncRead
+from .group_bulk_read import GroupBulkRead, PARAM_NUM_DATA
+from .group_sync_write import GroupSyncWrite
+from .health_tracker import HealthTracker
+from .shared_state import SharedStateBlock, SharedStateView
+
+WORKER_CYCLE_TIME = 5.0         # 工作进程的读写周期 (ms)
+WORKER_START_TIMEOUT = 5000     # 等待工作进程打开端口的超时 (ms)
+WORKER_STATUS_FORMAT = '<Q'     # 状态槽位的数据：已完成的周期数
+WORKER_STATUS_LENGTH = struct.calcsize(WORKER_STATUS_FORMAT)
+
+
+def runBusWorker(config, state_name, command_name, ready_event, stop_event):
+    # 工作进程入口
+    ids = config['ids']
+    status_slot = len(ids)
+
+    state = SharedStateBlock.attach(state_name, len(ids) + 1, max(config['read_length'], WORKER_STATUS_LENGTH))
+    command = None
+    if command_name is not None:
+        command = SharedStateBlock.attach(command_name, len(ids), config['write_length'])
+
+    port = PortHandler(config['port_name'])
+    try:
+        is_open = port.setBaudRate(config['baudrate'])     # 打开端口并设置波特率
+    except (IOError, OSError):
+        is_open = False
+
+    if not is_open:
+        state.write(status_slot, b'', COMM_TX_FAIL)
+        ready_event.set()
+        state.close()
+        if command is not None:
+            command.close()
+        return
+
+    try:
+        runCycles(config, port, state, command, ready_event, stop_event)
+    except Exception:   # 端口断开等异常：在状态槽位记录 COMM_TX_FAIL 后退出，保留已完成的周期数
+        _, data, _, _, _ = state.read(status_slot)
+        state.write(status_slot, data, COMM_TX_FAIL)
+    finally:
+        ready_event.set()
+        port.closePort()
+        state.close()
+        if command is not None:
+            command.close()
+
+
+def runCycles(config, port, state, command, ready_event, stop_event):
+    # 工作进程的读写周期，直到 stop_event 被设置
+    ids = config['ids']
+    status_slot = len(ids)
+
+    port.setEventDrivenRx(True)
+    port.setHealthTracker(HealthTracker())
+    ph = PacketHandler(config['protocol_version'])
+
+    # Protocol 1.0 不支持 Sync Read，改用 Bulk Read
+    if ph.getProtocolVersion() == 1.0:
+        reader = GroupBulkRead(port, ph)
+        for dxl_id in ids:
+            reader.addParam(dxl_id, config['read_address'], config['read_length'])
+    else:
+        reader = GroupSyncRead(port, ph, config['read_address'], config['read_length'])
+        for dxl_id in ids:
+            reader.addParam(dxl_id)
+
+    writer = None
+    command_seq = [0] * len(ids)
+    if command is not None:
+        writer = GroupSyncWrite(port, ph, config['write_address'], config['write_length'])
+
+    cycle_count = 0
+    state.write(status_slot, struct.pack(WORKER_STATUS_FORMAT, cycle_count), COMM_SUCCESS)
+    ready_event.set()
+
+    cycle_time_ns = int(config['cycle_time'] * 1000000)
+    next_cycle = monotonicNs()
+    while not stop_event.is_set():
+        # 只发送更新过的目标指令
+        if writer is not None:
+            is_changed = False
+            for idx, dxl_id in enumerate(ids):
+                if command.getSeq(idx) == command_seq[idx]:
+                    continue
+
+                seq, data, result, _, _ = command.read(idx)
+                if result != COMM_SUCCESS:
+                    continue
+
+                command_seq[idx] = seq
+                if not writer.changeParam(dxl_id, bytearray(data)):
+                    writer.addParam(dxl_id, bytearray(data))
+                is_changed = True
+
+            if is_changed:
+                writer.txPacket()
+
+        result = reader.txRxPacket()
+
+        for idx, dxl_id in enumerate(ids):
+            rx_result, error, timestamp = reader.getRxResult(dxl_id)
+            data = reader.data_dict[dxl_id]
+            if ph.getProtocolVersion() == 1.0:
+                data = data[PARAM_NUM_DATA]
+            state.write(idx, data, rx_result, error, timestamp)
+
+        cycle_count += 1
+        state.write(status_slot, struct.pack(WORKER_STATUS_FORMAT, cycle_count), result)
+
+        next_cycle += cycle_time_ns
+        now = monotonicNs()
+        if next_cycle > now:
+            time.sleep((next_cycle - now) / 1000000000.0)
+        else:
+            next_cycle = now
+
+
+
+
+class BusWorker(object):
+    def __init__(self, port_name, protocol_version, ids, read_address, read_length,
+                 write_address=None, write_length=0, baudrate=DEFAULT_BAUDRATE, cycle_time=WORKER_CYCLE_TIME):
+        """
+        :param ids: 该总线上的设备 ID
+        :param read_address, read_length: 每个周期读取的区域
+        :param write_address, write_length: 目标指令写入的区域，write_length 为 0 时不写入
+        :param cycle_time: 读写周期 (ms)
+        """
+        self.config = {
+            'port_name': port_name,
+            'protocol_version': protocol_version,
+            'baudrate': baudrate,
+            'ids': list(ids),
+            'read_address': read_address,
+            'read_length': read_length,
+            'write_address': write_address,
+            'write_length': write_length,
+            'cycle_time': cycle_time,
+        }
+        self.slots = dict((dxl_id, idx) for idx, dxl_id in enumerate(self.config['ids']))
+
+        self.state = None       # 工作进程写入：设备状态与周期计数
+        self.view = None
+        self.command = None     # 主进程写入：目标指令
+        self.process = None
+        self.stop_event = None
+
+    def start(self, timeout=WORKER_START_TIMEOUT):
+        """
+        :param timeout: 等待工作进程打开端口的超时 (ms)
+        :return: 工作进程是否成功打开端口
+        """
+        if self.process is not None:
+            return False
+
+        ids = self.config['ids']
+        self.state = SharedStateBlock(len(ids) + 1, max(self.config['read_length'], WORKER_STATUS_LENGTH))
+        self.view = SharedStateView(self.state, ids, self.config['read_address'], self.config['read_length'])
+        if self.config['write_length'] > 0:
+            self.command = SharedStateBlock(len(ids), self.config['write_length'])
+
+        ready_event = multiprocessing.Event()
+        self.stop_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=runBusWorker,
+            args=(self.config, self.state.getName(), None if self.command is None else self.command.getName(),
+                  ready_event, self.stop_event))
+        self.process.daemon = True
+        self.process.start()
+
+        if not ready_event.wait(timeout / 1000.0) or self.getLastResult() != COMM_SUCCESS:
+            self.stop()
+            return False
+
+        return True
+
+    def stop(self):
+        if self.process is None:
+            return
+
+        self.stop_event.set()
+        self.process.join()
+        self.process = None
+
+        for block in (self.state, self.command):
+            if block is not None:
+                block.close()
+                block.unlink()
+        self.state = None
+        self.view = None
+        self.command = None
+
+    def isAlive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def getStateBlockName(self):
+        return None if self.state is None else self.state.getName()
+
+    def getCycleCount(self):
+        _, data, _, _, _ = self.state.read(len(self.slots))
+        if len(data) < WORKER_STATUS_LENGTH:
+            return 0
+        return struct.unpack_from(WORKER_STATUS_FORMAT, data)[0]
+
+    def getLastResult(self):
+        # 最近一个周期组读取的通信状态
+        return self.state.read(len(self.slots))[2]
+
+    def getState(self, dxl_id):
+        """
+        :return: 数据, 通信状态, 错误, 数据时刻 (ns)
+        """
+        if self.view is None:
+            return b'', COMM_NOT_AVAILABLE, 0, 0
+        return self.view.getState(dxl_id)
+
+    def isAvailable(self, dxl_id, address, data_length):
+        return self.view is not None and self.view.isAvailable(dxl_id, address, data_length)
+
+    def getData(self, dxl_id, address, data_length):
+        if self.view is None:
+            return 0
+        return self.view.getData(dxl_id, address, data_length)
+
+    def setCommand(self, dxl_id, data):
+        """
+        :param data: 目标指令 (长度为 write_length 的字节列表)，下一个周期由工作进程发送
+        """
+        if self.command is None or dxl_id not in self.slots or len(data) != self.config['write_length']:
+            return False
+
+        return self.command.write(self.slots[dxl_id], bytearray(data))
@@ -20,21 +20,30 @@
 # Author: Ryu Woon Jung (Leon)
 
 from .robotis_def import *
+from .group_read_base import *
 
 PARAM_NUM_DATA = 0
 PARAM_NUM_ADDRESS = 1
 PARAM_NUM_LENGTH = 2
 
 
-class GroupBulkRead:
-    def __init__(self, port, ph):
+class GroupBulkRead(GroupReadBase):
+    def __init__(self, port, ph, fast_read=False):
         self.port = port
         self.ph = ph
 
+        self.fast_read = fast_read      # use Fast Bulk Read (0x9A)
+        self.fast_read_supported = None     # None: not verified yet
+        self.fast_fallback = False      # Fast 读取失败后改用普通读取，找出未应答的设备
+        self.fast_failed_ids = []       # Fast 读取失败时参与通信的设备
+
         self.last_result = False
         self.is_param_changed = False
         self.param = []
+        self.param_ids = []     # 实际参与通信的设备 (不含已隔离设备)
+        self.health_version = None
         self.data_dict = {}
+        self.rx_record = {}     # dxl_id: [result, error, timestamp]
 
         self.clearParam()
 
@@ -43,8 +52,9 @@ class GroupBulkRead:
             return
 
         self.param = []
+        self.param_ids = self.getActiveIds()
 
-        for dxl_id in self.data_dict:
+        for dxl_id in self.param_ids:
             if self.ph.getProtocolVersion() == 1.0:
                 self.param.append(self.data_dict[dxl_id][2])  # LEN
                 self.param.append(dxl_id)  # ID
@@ -71,24 +81,35 @@ class GroupBulkRead:
             return
 
         del self.data_dict[dxl_id]
+        self.rx_record.pop(dxl_id, None)
 
         self.is_param_changed = True
 
     def clearParam(self):
         self.data_dict.clear()
+        self.rx_record.clear()
         return
 
+    def isFastRead(self):
+        return self.ph.getProtocolVersion() != 1.0 and self.fast_read and self.fast_read_supported is not False \
+            and not self.fast_fallback
+
     def txPacket(self):
         if len(self.data_dict.keys()) == 0:
             return COMM_NOT_AVAILABLE
 
-        if self.is_param_changed is True or not self.param:
+        if self.is_param_changed is True or not self.param or self.isHealthChanged():
             self.makeParam()
 
+        if not self.param:  # 所有设备均已隔离
+            return COMM_NOT_AVAILABLE
+
         if self.ph.getProtocolVersion() == 1.0:
-            return self.ph.bulkReadTx(self.port, self.param, len(self.data_dict.keys()) * 3)
+            return self.ph.bulkReadTx(self.port, self.param, len(self.param_ids) * 3)
+        elif self.isFastRead():
+            return self.ph.fastBulkReadTx(self.port, self.param, len(self.param_ids) * 5)
         else:
-            return self.ph.bulkReadTx(self.port, self.param, len(self.data_dict.keys()) * 5)
+            return self.ph.bulkReadTx(self.port, self.param, len(self.param_ids) * 5)
 
     def rxPacket(self):
         self.last_result = False
@@ -98,26 +119,72 @@ class GroupBulkRead:
         if len(self.data_dict.keys()) == 0:
             return COMM_NOT_AVAILABLE
 
-        for dxl_id in self.data_dict:
-            self.data_dict[dxl_id][PARAM_NUM_DATA], result, _ = self.ph.readRx(self.port, dxl_id,
-                                                                               self.data_dict[dxl_id][PARAM_NUM_LENGTH])
-            if result != COMM_SUCCESS:
+        if self.isFastRead():
+            return self.fastRxPacket()
+
+        data_lengths = dict((dxl_id, self.data_dict[dxl_id][PARAM_NUM_LENGTH]) for dxl_id in self.param_ids)
+        status_list, result = self.ph.readRxMulti(self.port, data_lengths)
+        return self.setStatusList(status_list, result)
+
+    def rxPacketPoll(self):
+        """
+        Non-blocking rxPacket
+        :return: 通信状态，响应尚未接收完成时为 COMM_RX_WAITING，期间可执行其他计算后再次调用
+        """
+        self.last_result = False
+
+        if len(self.data_dict.keys()) == 0:
+            return COMM_NOT_AVAILABLE
+
+        if self.isFastRead():
+            data_lengths = [self.data_dict[dxl_id][PARAM_NUM_LENGTH] for dxl_id in self.param_ids]
+            data_list, result = self.ph.fastReadRxPoll(self.port, data_lengths)
+            if result == COMM_RX_WAITING:
                 return result
+            return self.setFastDataList(data_list, result)
 
-        if result == COMM_SUCCESS:
-            self.last_result = True
+        data_lengths = dict((dxl_id, self.data_dict[dxl_id][PARAM_NUM_LENGTH]) for dxl_id in self.param_ids)
+        status_list, result = self.ph.readRxMultiPoll(self.port, data_lengths)
+        if result == COMM_RX_WAITING:
+            return result
+        return self.setStatusList(status_list, result)
 
-        return result
+    def fastRxPacket(self):
+        # 响应顺序与 param 中的 ID 顺序一致
+        data_lengths = [self.data_dict[dxl_id][PARAM_NUM_LENGTH] for dxl_id in self.param_ids]
+        data_list, result = self.ph.fastReadRx(self.port, data_lengths)
+        return self.setFastDataList(data_list, result)
 
     def txRxPacket(self):
+        if self.port.health_tracker is not None:   # 重新探测已隔离的设备
+            self.port.health_tracker.reprobe(self.port, self.ph, self.data_dict)
+
+        is_fast_read = self.isFastRead()
+
         result = self.txPacket()
         if result != COMM_SUCCESS:
             return result
 
-        return self.rxPacket()
+        result = self.rxPacket()
+
+        # fall back to Bulk Read in the same cycle
+        if result != COMM_SUCCESS and is_fast_read and not self.isFastRead():
+            result = self.txPacket()
+            if result != COMM_SUCCESS:
+                return result
+
+            result = self.rxPacket()
+
+        return result
+
+    def getDataLength(self, dxl_id):
+        return self.data_dict[dxl_id][PARAM_NUM_LENGTH]
+
+    def setData(self, dxl_id, data):
+        self.data_dict[dxl_id][PARAM_NUM_DATA] = data
 
     def isAvailable(self, dxl_id, address, data_length):
-        if self.last_result is False or dxl_id not in self.data_dict:
+        if dxl_id not in self.data_dict or not self.isFresh(dxl_id):
             return False
 
         start_addr = self.data_dict[dxl_id][PARAM_NUM_ADDRESS]
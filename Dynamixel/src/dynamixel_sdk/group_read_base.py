@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+# Author: Ryu Woon Jung (Leon)
+
+from .robotis_def import *
+from .port_handler import monotonicNs
+
+RX_RECORD_RESULT = 0
+RX_RECORD_ERROR = 1
+RX_RECORD_TIME = 2
+
+
+class GroupReadBase(object):
+    """
+    GroupSyncRead / GroupBulkRead 的共同部分：逐设备接收结果、健康状态与 Fast 读取回退
+    子类需提供 getDataLength(dxl_id) 与 setData(dxl_id, data)
+    """
+
+    def setFastRead(self, enable):
+        self.fast_read = enable
+        self.fast_read_supported = None
+        self.fast_fallback = False
+
+    def getActiveIds(self):
+        health_tracker = self.port.health_tracker
+        if health_tracker is None:
+            return list(self.data_dict)
+
+        self.health_version = health_tracker.version
+        return health_tracker.filterIds(self.data_dict)
+
+    def isHealthChanged(self):
+        health_tracker = self.port.health_tracker
+        return health_tracker is not None and health_tracker.version != self.health_version
+
+    def setStatusList(self, status_list, result):
+        # 保存 readRxMulti 的接收结果
+        for dxl_id in self.data_dict:
+            if dxl_id in status_list:
+                status = status_list[dxl_id]
+                self.setData(dxl_id, list(status.params[0: self.getDataLength(dxl_id)]))   # 复制为 list，不引用接收缓冲区
+                self.rx_record[dxl_id] = [COMM_SUCCESS, status.error, status.timestamp]
+            elif dxl_id in self.param_ids:
+                self.updateRxFailure(dxl_id, result)
+            else:
+                self.updateRxFailure(dxl_id, COMM_NOT_AVAILABLE)
+
+        self.reportHealth()
+
+        if self.fast_fallback:
+            self.updateFastFallback(result)
+
+        if result == COMM_SUCCESS:
+            self.last_result = True
+
+        return result
+
+    def setFastDataList(self, data_list, result):
+        # 保存 fastReadRx 的接收结果
+        if result != COMM_SUCCESS:
+            # 无法确定是哪个设备未应答，下一次改用普通读取，由其结果计入健康状态
+            self.fast_fallback = True
+            self.fast_failed_ids = list(self.param_ids)
+            for dxl_id in self.data_dict:
+                self.updateRxFailure(dxl_id, result)
+            return result
+
+        self.fast_read_supported = True
+
+        rx_time = monotonicNs()
+        for dxl_id in self.data_dict:
+            if dxl_id in data_list and dxl_id in self.param_ids:
+                self.setData(dxl_id, list(data_list[dxl_id][0]))
+                self.rx_record[dxl_id] = [COMM_SUCCESS, data_list[dxl_id][1], rx_time]
+            elif dxl_id in self.param_ids:  # 数据包中缺少该设备的数据
+                self.updateRxFailure(dxl_id, COMM_RX_TIMEOUT)
+                result = COMM_RX_CORRUPT
+            else:
+                self.updateRxFailure(dxl_id, COMM_NOT_AVAILABLE)
+
+        self.reportHealth()
+
+        if result == COMM_SUCCESS:
+            self.last_result = True
+
+        return result
+
+    def updateFastFallback(self, result):
+        # 改用普通读取后，所有设备均应答时恢复 Fast 读取
+        if result != COMM_SUCCESS:
+            self.fast_failed_ids = []   # 有设备未应答，Fast 读取失败可能由该设备引起
+            return
+
+        if self.param_ids == self.fast_failed_ids:
+            # 同样的设备应答普通读取却不应答 Fast 读取：不支持 (或固件已停止支持) Fast 读取，调用 setFastRead() 重新探测
+            self.fast_read_supported = False
+        self.fast_fallback = False
+
+    def reportHealth(self):
+        health_tracker = self.port.health_tracker
+        if health_tracker is None:
+            return
+
+        for dxl_id in self.param_ids:
+            health_tracker.reportResult(dxl_id, self.rx_record[dxl_id][RX_RECORD_RESULT])
+
+    def updateRxFailure(self, dxl_id, result):
+        # 保留上一次成功接收的错误字节与时刻
+        record = self.rx_record.setdefault(dxl_id, [result, 0, 0])
+        record[RX_RECORD_RESULT] = result
+
+    def isFresh(self, dxl_id):
+        # 最近一次通信中是否收到该设备的数据
+        return dxl_id in self.rx_record and self.rx_record[dxl_id][RX_RECORD_RESULT] == COMM_SUCCESS
+
+    def getFreshIds(self):
+        return [dxl_id for dxl_id in self.data_dict if self.isFresh(dxl_id)]
+
+    def getRxResult(self, dxl_id):
+        """
+        :return: 最近一次通信状态, 最近一次收到的错误字节, 最近一次收到数据的时刻 (ns)
+        """
+        if dxl_id not in self.rx_record:
+            return COMM_NOT_AVAILABLE, 0, 0
+
+        return tuple(self.rx_record[dxl_id])
@@ -20,19 +20,28 @@
 # Author: Ryu Woon Jung (Leon)
 
 from .robotis_def import *
+from .group_read_base import *
 
 
-class GroupSyncRead:
-    def __init__(self, port, ph, start_address, data_length):
+class GroupSyncRead(GroupReadBase):
+    def __init__(self, port, ph, start_address, data_length, fast_read=False):
         self.port = port
         self.ph = ph
         self.start_address = start_address
         self.data_length = data_length
 
+        self.fast_read = fast_read      # use Fast Sync Read (0x8A)
+        self.fast_read_supported = None     # None: not verified yet
+        self.fast_fallback = False      # Fast 读取失败后改用普通读取，找出未应答的设备
+        self.fast_failed_ids = []       # Fast 读取失败时参与通信的设备
+
         self.last_result = False
         self.is_param_changed = False
         self.param = []
+        self.param_ids = []     # 实际参与通信的设备 (不含已隔离设备)
+        self.health_version = None
         self.data_dict = {}
+        self.rx_record = {}     # dxl_id: [result, error, timestamp]
 
         self.clearParam()
 
@@ -44,8 +53,9 @@ class GroupSyncRead:
             return
 
         self.param = []
+        self.param_ids = self.getActiveIds()
 
-        for dxl_id in self.data_dict:
+        for dxl_id in self.param_ids:
             self.param.append(dxl_id)
 
     def addParam(self, dxl_id):
@@ -68,6 +78,7 @@ class GroupSyncRead:
             return
 
         del self.data_dict[dxl_id]
+        self.rx_record.pop(dxl_id, None)
 
         self.is_param_changed = True
 
@@ -76,16 +87,27 @@ class GroupSyncRead:
             return
 
         self.data_dict.clear()
+        self.rx_record.clear()
+
+    def isFastRead(self):
+        return self.fast_read and self.fast_read_supported is not False and not self.fast_fallback
 
     def txPacket(self):
         if self.ph.getProtocolVersion() == 1.0 or len(self.data_dict.keys()) == 0:
             return COMM_NOT_AVAILABLE
 
-        if self.is_param_changed is True or not self.param:
+        if self.is_param_changed is True or not self.param or self.isHealthChanged():
             self.makeParam()
 
+        if not self.param:  # 所有设备均已隔离
+            return COMM_NOT_AVAILABLE
+
+        if self.isFastRead():
+            return self.ph.fastSyncReadTx(self.port, self.start_address, self.data_length, self.param,
+                                          len(self.param) * 1)
+
         return self.ph.syncReadTx(self.port, self.start_address, self.data_length, self.param,
-                                  len(self.data_dict.keys()) * 1)
+                                  len(self.param) * 1)
 
     def rxPacket(self):
         self.last_result = False
@@ -98,28 +120,70 @@ class GroupSyncRead:
         if len(self.data_dict.keys()) == 0:
             return COMM_NOT_AVAILABLE
 
-        for dxl_id in self.data_dict:
-            self.data_dict[dxl_id], result, _ = self.ph.readRx(self.port, dxl_id, self.data_length)
-            if result != COMM_SUCCESS:
+        if self.isFastRead():
+            return self.fastRxPacket()
+
+        status_list, result = self.ph.readRxMulti(self.port, dict.fromkeys(self.param_ids, self.data_length))
+        return self.setStatusList(status_list, result)
+
+    def rxPacketPoll(self):
+        """
+        Non-blocking rxPacket
+        :return: 通信状态，响应尚未接收完成时为 COMM_RX_WAITING，期间可执行其他计算后再次调用
+        """
+        self.last_result = False
+
+        if self.ph.getProtocolVersion() == 1.0 or len(self.data_dict.keys()) == 0:
+            return COMM_NOT_AVAILABLE
+
+        if self.isFastRead():
+            data_list, result = self.ph.fastReadRxPoll(self.port, [self.data_length] * len(self.param))
+            if result == COMM_RX_WAITING:
                 return result
+            return self.setFastDataList(data_list, result)
 
-        if result == COMM_SUCCESS:
-            self.last_result = True
+        status_list, result = self.ph.readRxMultiPoll(self.port, dict.fromkeys(self.param_ids, self.data_length))
+        if result == COMM_RX_WAITING:
+            return result
+        return self.setStatusList(status_list, result)
 
-        return result
+    def fastRxPacket(self):
+        data_list, result = self.ph.fastReadRx(self.port, [self.data_length] * len(self.param))
+        return self.setFastDataList(data_list, result)
 
     def txRxPacket(self):
         if self.ph.getProtocolVersion() == 1.0:
             return COMM_NOT_AVAILABLE
 
+        if self.port.health_tracker is not None:   # 重新探测已隔离的设备
+            self.port.health_tracker.reprobe(self.port, self.ph, self.data_dict)
+
+        is_fast_read = self.isFastRead()
+
         result = self.txPacket()
         if result != COMM_SUCCESS:
             return result
 
-        return self.rxPacket()
+        result = self.rxPacket()
+
+        # fall back to Sync Read in the same cycle
+        if result != COMM_SUCCESS and is_fast_read and not self.isFastRead():
+            result = self.txPacket()
+            if result != COMM_SUCCESS:
+                return result
+
+            result = self.rxPacket()
+
+        return result
+
+    def getDataLength(self, dxl_id):
+        return self.data_length
+
+    def setData(self, dxl_id, data):
+        self.data_dict[dxl_id] = data
 
     def isAvailable(self, dxl_id, address, data_length):
-        if self.ph.getProtocolVersion() == 1.0 or self.last_result is False or dxl_id not in self.data_dict:
+        if self.ph.getProtocolVersion() == 1.0 or dxl_id not in self.data_dict or not self.isFresh(dxl_id):
             return False
 
         if (address < self.start_address) or (self.start_address + self.data_length - data_length < address):
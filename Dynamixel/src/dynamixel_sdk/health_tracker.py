@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 设备健康状态跟踪：连续超时的设备被隔离，不再参与组通信，按较低频率用 ping 重新探测
+
+from .robotis_def import *
+from .port_handler import monotonicNs
+
+MAX_CONSECUTIVE_TIMEOUTS = 3    # 连续超时多少次后隔离
+REPROBE_INTERVAL = 500          # 重新探测间隔 (ms)
+
+
+class HealthTracker(object):
+    def __init__(self, max_timeouts=MAX_CONSECUTIVE_TIMEOUTS, reprobe_interval=REPROBE_INTERVAL):
+        self.max_timeouts = max_timeouts
+        self.reprobe_interval_ns = int(reprobe_interval * 1000000)
+
+        self.timeout_count = {}     # dxl_id: 连续超时次数
+        self.quarantine = {}        # dxl_id: 下一次探测的时刻 (ns)
+        self.version = 0            # 隔离列表变化时递增，供组通信重新生成参数
+
+    def setMaxTimeouts(self, max_timeouts):
+        self.max_timeouts = max_timeouts
+
+    def getMaxTimeouts(self):
+        return self.max_timeouts
+
+    def setReprobeInterval(self, reprobe_interval):    # ms
+        self.reprobe_interval_ns = int(reprobe_interval * 1000000)
+
+    def getReprobeInterval(self):
+        return self.reprobe_interval_ns / 1000000.0
+
+    def reset(self):
+        self.timeout_count.clear()
+        if self.quarantine:
+            self.quarantine.clear()
+            self.version += 1
+
+    def reportResult(self, dxl_id, result):
+        if result == COMM_SUCCESS:
+            self.timeout_count[dxl_id] = 0
+            self.release(dxl_id)
+
+        elif result == COMM_RX_TIMEOUT:
+            count = self.timeout_count.get(dxl_id, 0) + 1
+            self.timeout_count[dxl_id] = count
+
+            if dxl_id in self.quarantine or count >= self.max_timeouts:
+                if dxl_id not in self.quarantine:
+                    self.version += 1
+                self.quarantine[dxl_id] = monotonicNs() + self.reprobe_interval_ns
+
+    def release(self, dxl_id):
+        if dxl_id in self.quarantine:
+            del self.quarantine[dxl_id]
+            self.version += 1
+
+    def getTimeoutCount(self, dxl_id):
+        return self.timeout_count.get(dxl_id, 0)
+
+    def isQuarantined(self, dxl_id):
+        return dxl_id in self.quarantine
+
+    def getQuarantinedIds(self):
+        return list(self.quarantine)
+
+    def isProbeDue(self, dxl_id):
+        return dxl_id in self.quarantine and monotonicNs() >= self.quarantine[dxl_id]
+
+    def isReachable(self, dxl_id):
+        # 未隔离，或已到重新探测的时刻
+        return dxl_id not in self.quarantine or monotonicNs() >= self.quarantine[dxl_id]
+
+    def filterIds(self, ids):
+        if not self.quarantine:
+            return list(ids)
+
+        return [dxl_id for dxl_id in ids if dxl_id not in self.quarantine]
+
+    def getProbeIds(self, ids=None):
+        # 已到重新探测时刻的隔离设备
+        now = monotonicNs()
+        return [dxl_id for dxl_id in self.quarantine if (ids is None or dxl_id in ids) and now >= self.quarantine[dxl_id]]
+
+    def reportProbe(self, dxl_id, result):
+        # ping 的结果已由 PacketHandler 通过 reportResult 记录，这里只推迟下一次探测
+        if result != COMM_SUCCESS and dxl_id in self.quarantine:
+            self.quarantine[dxl_id] = monotonicNs() + self.reprobe_interval_ns
+
+    def reprobe(self, port, ph, ids=None):
+        """
+        Ping quarantined devices whose probe interval has elapsed
+        :param ids: 仅探测其中的设备，None 时探测全部
+        :return: 恢复通信的设备 ID 列表
+        """
+        recovered = []
+        for dxl_id in self.getProbeIds(ids):
+            _, result, _ = ph.ping(port, dxl_id)
+            self.reportProbe(dxl_id, result)
+            if result == COMM_SUCCESS:
+                recovered.append(dxl_id)
+
+        return recovered
@@ -19,33 +19,92 @@
 
 # Author: Ryu Woon Jung (Leon)
 
+import os       # 加载操作系统接口库
 import time     # 加载时间库
 import serial   # 加载串口库
 import sys      # 加载系统库
 import platform     # 加载操作系统库
+import select       # 加载 IO 多路复用库
+import struct       # 加载结构体打包库
 
-LATENCY_TIMER = 16  # 延迟计时器
+from .robotis_def import *
+from .bus_arbiter import BusArbiter
+
+try:
+    import fcntl    # 仅 POSIX 平台
+    import termios
+except ImportError:
+    fcntl = None
+    termios = None
+
+LATENCY_TIMER = 16  # 延迟计时器 (ms)
+LOW_LATENCY_TIMER = 1   # 低延迟模式下的延迟计时器 (ms)
 DEFAULT_BAUDRATE = 1000000  # 默认波特率
+CUSTOM_BAUDRATE_TOLERANCE = 0.03    # 自定义波特率允许的最大偏差
+
+# 超时计时起点
+TX_END_TIMING_NONE = 0      # 从 writePort 返回时开始计时
+TX_END_TIMING_DRAIN = 1     # 等待发送缓冲区清空 (tcdrain) 后开始计时
+TX_END_TIMING_COMPUTED = 2  # 根据待发送字节数计算发送完成时刻
+
+# Linux termios2 (asm-generic)，用于设置任意波特率
+TERMIOS2_FORMAT = 'IIIIB19sII'  # c_iflag c_oflag c_cflag c_lflag c_line c_cc[19] c_ispeed c_ospeed
+TCGETS2 = 0x802C542A
+TCSETS2 = 0x402C542B
+BOTHER = 0o010000
+CBAUD = 0o010017
+
+# 单调时钟 (纳秒)，不受系统时间调整影响
+if hasattr(time, 'monotonic_ns'):
+    monotonicNs = time.monotonic_ns
+else:
+    def monotonicNs():
+        return int(getattr(time, 'monotonic', time.time)() * 1000000000)
 
 
 class PortHandler(object):      # 类
     def __init__(self, port_name):  # 成员变量
         self.is_open = False        # 是否打开标志
         self.baudrate = DEFAULT_BAUDRATE    # 波特率
-        self.packet_start_time = 0.0    # 开始时间
-        self.packet_timeout = 0.0       # 超时
+        self.actual_baudrate = DEFAULT_BAUDRATE     # 实际生效的波特率
+        self.packet_start_time_ns = 0   # 开始时间 (ns)
+        self.packet_deadline_ns = 0     # 超时时刻 (ns)
+        self.packet_timeout = 0.0       # 超时 (ms)
         self.tx_time_per_byte = 0.0
+        self.tx_end_timing = TX_END_TIMING_NONE
+        self.tx_end_time_ns = 0         # 最近一次发送完成的时刻 (ns)
+        self.latency_timer = LATENCY_TIMER  # USB 适配器延迟计时器 (ms)
+
+        self.is_low_latency = False     # 低延迟模式标志
+        self.low_latency_timer = LOW_LATENCY_TIMER
+        self.saved_latency_timer = None
 
-        self.is_using = False       # 是否正在是否标志
+        self.bus_arbiter = BusArbiter()  # 总线仲裁，取代 is_using 标志
         self.port_name = port_name  # 串口端口号
         self.ser = None
 
+        self.is_event_driven_rx = False  # 事件驱动接收标志
+        self.rx_fd = None
+        self.rx_poller = None
+
+        self.health_tracker = None  # 设备健康状态跟踪 (HealthTracker)
+
+        self.rtt_estimator = None   # 往返时间估计 (RttEstimator)
+        self.rtt_key = None         # 当前等待的状态包对应的估计项
+        self.rtt_rx_length = 0      # 当前等待的状态包长度
+
+        self.rx_poll_state = None   # 未完成的非阻塞接收 (StatusReceiver)
+
+        self.write_batch = None     # 合并写入 (WriteBatch)
+
     def openPort(self):     # 打开端口
         return self.setBaudRate(self.baudrate)
 
     def closePort(self):    # 关闭端口
         self.ser.close()
         self.is_open = False
+        self.rx_fd = None
+        self.rx_poller = None
 
     def clearPort(self):    # 清空端口
         self.ser.flush()
@@ -59,10 +118,8 @@ class PortHandler(object):      # 类
     def setBaudRate(self, baudrate):    # 设置波特率
         baud = self.getCFlagBaud(baudrate)
 
-        if baud <= 0:   # 期望波特率小于0 返回错误
-            # self.setupPort(38400)
-            # self.baudrate = baudrate
-            return False  # TODO: setCustomBaudrate(baudrate)
+        if baud <= 0:   # 非标准波特率，使用自定义波特率
+            return self.setCustomBaudrate(baudrate)
         else:
             self.baudrate = baudrate        # 设置目标波特率
             return self.setupPort(baud)     # 设置串口
@@ -70,6 +127,9 @@ class PortHandler(object):      # 类
     def getBaudRate(self):          # 获取当前波特率
         return self.baudrate
 
+    def getActualBaudRate(self):    # 获取实际生效的波特率
+        return self.actual_baudrate
+
     def getBytesAvailable(self):
         return self.ser.in_waiting
 
@@ -77,35 +137,193 @@ class PortHandler(object):      # 类
         if (sys.version_info > (3, 0)):
             return self.ser.read(length)
         else:
-            return [ord(ch) for ch in self.ser.read(length)]
+            return bytearray(self.ser.read(length))
 
     def writePort(self, packet):
-        return self.ser.write(packet)
+        self.rx_poll_state = None   # 新的发送开始时丢弃未完成的非阻塞接收
+        length = self.ser.write(packet)
+
+        if self.tx_end_timing == TX_END_TIMING_DRAIN:
+            self.ser.flush()    # 阻塞至数据全部发出
+            self.tx_end_time_ns = monotonicNs()
+        elif self.tx_end_timing == TX_END_TIMING_COMPUTED:
+            self.tx_end_time_ns = self.getTxEndTimeNs(length)
+
+        return length
+
+    def getTxEndTimeNs(self, length):
+        # 之前未发完的数据排在前面
+        now = monotonicNs()
+        byte_time_ns = self.tx_time_per_byte * 1000000
+        tx_end_time_ns = max(now, self.tx_end_time_ns) + int(length * byte_time_ns)
+
+        try:
+            pending = self.ser.out_waiting  # 驱动中尚未发送的字节数
+        except (AttributeError, IOError, OSError, NotImplementedError):
+            return tx_end_time_ns
+
+        return max(tx_end_time_ns, now + int(pending * byte_time_ns))
+
+    def setTxEndTiming(self, tx_end_timing):
+        self.tx_end_timing = tx_end_timing
+        self.tx_end_time_ns = 0
+        return True
+
+    def getTxEndTiming(self):
+        return self.tx_end_timing
+
+    @property
+    def packet_start_time(self):    # 兼容旧接口：开始时间 (ms)，与 getCurrentTime() 使用同一时钟
+        return self.packet_start_time_ns / 1000000.0
+
+    @property
+    def is_using(self):     # 兼容旧接口
+        return self.bus_arbiter.isLocked()
+
+    @is_using.setter
+    def is_using(self, is_using):
+        if is_using:
+            self.bus_arbiter.acquire(timeout=0)
+        else:   # 与旧接口相同，任何线程都可以释放总线
+            self.bus_arbiter.forceRelease()
+
+    def acquireBus(self, priority=None, timeout=-1):
+        return self.bus_arbiter.acquire(priority, timeout)
+
+    def releaseBus(self):
+        self.bus_arbiter.release()
+
+    def holdBus(self, priority=None, timeout=-1):    # 多次通信期间持续占用总线
+        return self.bus_arbiter.hold(priority, timeout)
+
+    def unholdBus(self):
+        self.bus_arbiter.unhold()
+
+    def setBusPriority(self, priority):     # 当前线程的优先级
+        self.bus_arbiter.setThreadPriority(priority)
+
+    def setBusTimeout(self, timeout):       # 等待总线的超时 (ms)，默认 0 不等待，None 为一直等待
+        self.bus_arbiter.setTimeout(timeout)
+
+    def setHealthTracker(self, health_tracker):
+        self.health_tracker = health_tracker
+
+    def getHealthTracker(self):
+        return self.health_tracker
+
+    def setRttEstimator(self, rtt_estimator):
+        self.rtt_estimator = rtt_estimator
+
+    def getRttEstimator(self):
+        return self.rtt_estimator
+
+    def beginRxPoll(self, make_receiver):
+        # 继续上一次未完成的非阻塞接收，或开始新的接收
+        if self.rx_poll_state is None:
+            self.rx_poll_state = make_receiver()
+        return self.rx_poll_state
+
+    def endRxPoll(self):
+        self.rx_poll_state = None
+
+    def isRxPolling(self):
+        return self.rx_poll_state is not None
+
+    def setEventDrivenRx(self, enable):
+        # 事件驱动接收：等待串口文件描述符可读，而不是循环轮询
+        if enable and self.is_open and self.rx_fd is None:
+            return False
+
+        self.is_event_driven_rx = enable
+        return True
+
+    def isEventDrivenRx(self):
+        return self.is_event_driven_rx and self.rx_fd is not None
+
+    def waitForData(self):
+        # block until the port is readable or the packet timeout expires
+        if not self.is_event_driven_rx or self.rx_fd is None:
+            return
+
+        remaining_ns = self.getTimeUntilTimeoutNs()
+        if remaining_ns <= 0:
+            return
+
+        if self.rx_poller is not None:
+            self.rx_poller.poll(remaining_ns // 1000000 + 1)
+        else:
+            select.select([self.rx_fd], [], [], remaining_ns / 1000000000.0)
 
     def setPacketTimeout(self, packet_length):
-        self.packet_start_time = self.getCurrentTime()
-        self.packet_timeout = (self.tx_time_per_byte * packet_length) + (LATENCY_TIMER * 2.0) + 2.0
+        self.setPacketTimeoutMillis((self.tx_time_per_byte * packet_length) + (self.latency_timer * 2.0) + 2.0)
+
+    def setPacketTimeoutFor(self, key, packet_length):
+        # key: 单个设备时为 ID，组通信时由 PacketHandler 决定
+        self.setPacketTimeout(packet_length)
+
+        rtt_estimator = self.rtt_estimator
+        if rtt_estimator is None:
+            return
+
+        self.rtt_key = key
+        self.rtt_rx_length = packet_length
+
+        timeout_ns = rtt_estimator.getTimeoutNs(key)
+        if timeout_ns is not None:
+            # 不超过固定公式计算的超时
+            timeout_ns += int(self.tx_time_per_byte * packet_length * 1000000)
+            if timeout_ns < self.packet_deadline_ns - self.packet_start_time_ns:
+                self.packet_deadline_ns = self.packet_start_time_ns + timeout_ns
+                self.packet_timeout = timeout_ns / 1000000.0
+
+    def updateRtt(self, result, rx_time_ns=None):
+        # 状态包接收完成 (或超时) 后更新往返时间估计
+        rtt_estimator = self.rtt_estimator
+        if rtt_estimator is None or self.rtt_key is None:
+            return
+
+        if result == COMM_SUCCESS:
+            rx_time_ns = monotonicNs() if rx_time_ns is None else rx_time_ns
+            rtt_estimator.addSample(self.rtt_key, rx_time_ns - self.packet_start_time_ns
+                                    - int(self.tx_time_per_byte * self.rtt_rx_length * 1000000))
+        elif result == COMM_RX_TIMEOUT:
+            rtt_estimator.onTimeout(self.rtt_key)
+
+        self.rtt_key = None
 
     def setPacketTimeoutMillis(self, msec):
-        self.packet_start_time = self.getCurrentTime()
-        self.packet_timeout = msec
+        self.setPacketTimeoutNs(int(msec * 1000000))
+
+    def setPacketTimeoutNs(self, nsec):
+        self.rtt_key = None
+        self.packet_start_time_ns = monotonicNs()
+        if self.tx_end_timing != TX_END_TIMING_NONE:  # 从发送完成时刻开始计时
+            self.packet_start_time_ns = max(self.packet_start_time_ns, self.tx_end_time_ns)
+        self.packet_deadline_ns = self.packet_start_time_ns + nsec
+        self.packet_timeout = nsec / 1000000.0
 
     def isPacketTimeout(self):
-        if self.getTimeSinceStart() > self.packet_timeout:
+        if monotonicNs() > self.packet_deadline_ns:
+            self.packet_deadline_ns = 0
             self.packet_timeout = 0
             return True
 
         return False
 
-    def getCurrentTime(self):       # 获取当前时间
-        return round(time.time() * 1000000000) / 1000000.0
+    def getCurrentTime(self):       # 获取当前时间 (ms)
+        return monotonicNs() / 1000000.0
 
-    def getTimeSinceStart(self):    # 计算通信时间
-        time_since = self.getCurrentTime() - self.packet_start_time
-        if time_since < 0.0:
-            self.packet_start_time = self.getCurrentTime()
+    def getCurrentTimeNs(self):     # 获取当前时间 (ns)
+        return monotonicNs()
 
-        return time_since
+    def getTimeSinceStart(self):    # 计算通信时间 (ms)
+        return self.getTimeSinceStartNs() / 1000000.0
+
+    def getTimeSinceStartNs(self):
+        return monotonicNs() - self.packet_start_time_ns
+
+    def getTimeUntilTimeoutNs(self):    # 距离超时的剩余时间 (ns)
+        return self.packet_deadline_ns - monotonicNs()
 
     def setupPort(self, cflag_baud):
         if self.is_open:        # 判断端口是否打开
@@ -114,7 +332,7 @@ class PortHandler(object):      # 类
         # 串口对象实例化，设置串口属性
         self.ser = serial.Serial(
             port=self.port_name,        # 串口端口号
-            baudrate=self.baudrate,     # 波特率
+            baudrate=cflag_baud,        # 波特率
             # parity = serial.PARITY_ODD,   # 奇偶校验
             # stopbits = serial.STOPBITS_TWO,   # 停止位
             bytesize=serial.EIGHTBITS,      # 数据位
@@ -125,7 +343,187 @@ class PortHandler(object):      # 类
 
         self.ser.reset_input_buffer()   # 重置输入缓冲区
 
-        self.tx_time_per_byte = (1000.0 / self.baudrate) * 10.0     # 计算发送速率 单位时间的字节数
+        self.setupRxWait()
+
+        if self.is_low_latency:
+            self.applyLowLatency()
+
+        self.updateActualBaudRate()
+
+        return True
+
+    def setCustomBaudrate(self, baudrate):
+        # 通过 termios2 (BOTHER) 设置任意波特率，仅支持 Linux
+        if platform.system() != 'Linux' or fcntl is None:
+            return False
+
+        was_open = self.is_open
+        previous_baudrate = self.baudrate
+
+        self.baudrate = baudrate
+        self.setupPort(38400)
+
+        if self.writeTermios2Speed(baudrate):
+            # 读回驱动实际设置的波特率并校验
+            self.updateActualBaudRate()
+            if abs(self.actual_baudrate - baudrate) <= baudrate * CUSTOM_BAUDRATE_TOLERANCE:
+                return True
+
+        # 设置失败时恢复原来的波特率，否则端口停留在 38400 而超时按新波特率计算
+        self.baudrate = previous_baudrate
+        if was_open and previous_baudrate != baudrate:
+            self.setBaudRate(previous_baudrate)
+        else:
+            self.closePort()
+
+        return False
+
+    def writeTermios2Speed(self, baudrate):
+        try:
+            buf = bytearray(struct.calcsize(TERMIOS2_FORMAT))
+            fcntl.ioctl(self.rx_fd, TCGETS2, buf)
+            iflag, oflag, cflag, lflag, line, cc, ispeed, ospeed = struct.unpack(TERMIOS2_FORMAT, buf)
+
+            cflag = (cflag & ~CBAUD) | BOTHER
+            struct.pack_into(TERMIOS2_FORMAT, buf, 0, iflag, oflag, cflag, lflag, line, cc, baudrate, baudrate)
+            fcntl.ioctl(self.rx_fd, TCSETS2, buf)
+        except (IOError, OSError, TypeError):
+            return False
+
+        return True
+
+    def readTermios2Speed(self):
+        if platform.system() != 'Linux' or fcntl is None or self.rx_fd is None:
+            return None
+
+        try:
+            buf = bytearray(struct.calcsize(TERMIOS2_FORMAT))
+            fcntl.ioctl(self.rx_fd, TCGETS2, buf)
+        except (IOError, OSError, TypeError):
+            return None
+
+        ospeed = struct.unpack(TERMIOS2_FORMAT, buf)[7]
+        if ospeed <= 0:
+            return None
+
+        return ospeed
+
+    def updateActualBaudRate(self):
+        actual_baudrate = self.readTermios2Speed()
+        if actual_baudrate is None:
+            actual_baudrate = self.baudrate
+
+        self.actual_baudrate = actual_baudrate
+        self.tx_time_per_byte = (1000.0 / self.actual_baudrate) * 10.0     # 计算发送速率 单位时间的字节数
+
+    def setupRxWait(self):
+        # 获取串口文件描述符，用于事件驱动接收 (Windows 不支持)
+        self.rx_fd = None
+        self.rx_poller = None
+
+        try:
+            self.rx_fd = self.ser.fileno()
+        except (AttributeError, NotImplementedError, ValueError, serial.SerialException):
+            self.is_event_driven_rx = False
+            return
+
+        if hasattr(select, 'poll'):
+            self.rx_poller = select.poll()
+            self.rx_poller.register(self.rx_fd, select.POLLIN)
+
+    def getLatencyTimer(self):      # 获取延迟计时器 (ms)
+        return self.latency_timer
+
+    def setLatencyTimer(self, msec):
+        # 手动指定适配器延迟，用于无法通过 sysfs 读取的平台
+        self.latency_timer = msec
+
+    def setLowLatency(self, enable, latency_timer=LOW_LATENCY_TIMER):
+        # 低延迟模式 (仅 Linux)：设置 USB 适配器 latency_timer 与 ASYNC_LOW_LATENCY
+        if platform.system() != 'Linux':
+            return False
+
+        self.is_low_latency = enable
+        self.low_latency_timer = latency_timer
+
+        if not self.is_open:
+            return True
+
+        if enable:
+            return self.applyLowLatency()
+
+        return self.restoreLatency()
+
+    def isLowLatency(self):
+        return self.is_low_latency
+
+    def applyLowLatency(self):
+        if self.saved_latency_timer is None:
+            self.saved_latency_timer = self.readSysfsLatencyTimer()
+
+        is_set = self.writeSysfsLatencyTimer(self.low_latency_timer)
+
+        if hasattr(self.ser, 'set_low_latency_mode'):
+            try:
+                self.ser.set_low_latency_mode(True)
+                is_set = True
+            except ValueError:
+                pass
+
+        self.updateLatencyTimer()
+        return is_set
+
+    def restoreLatency(self):
+        if self.saved_latency_timer is not None:
+            self.writeSysfsLatencyTimer(self.saved_latency_timer)
+            self.saved_latency_timer = None
+
+        if hasattr(self.ser, 'set_low_latency_mode'):
+            try:
+                self.ser.set_low_latency_mode(False)
+            except ValueError:
+                pass
+
+        self.updateLatencyTimer()
+        return True
+
+    def updateLatencyTimer(self):
+        # 以实际读到的延迟值计算超时，读取失败时保持当前值
+        latency_timer = self.readSysfsLatencyTimer()
+        if latency_timer is not None:
+            self.latency_timer = latency_timer
+
+    def getSysfsLatencyTimerPath(self):
+        tty_name = os.path.basename(os.path.realpath(self.port_name))
+
+        for path in ['/sys/bus/usb-serial/devices/%s/latency_timer' % tty_name,
+                     '/sys/class/tty/%s/device/latency_timer' % tty_name]:
+            if os.path.exists(path):
+                return path
+
+        return None
+
+    def readSysfsLatencyTimer(self):
+        path = self.getSysfsLatencyTimerPath()
+        if path is None:
+            return None
+
+        try:
+            with open(path, 'r') as f:
+                return int(f.read().strip())
+        except (IOError, OSError, ValueError):
+            return None
+
+    def writeSysfsLatencyTimer(self, msec):
+        path = self.getSysfsLatencyTimerPath()
+        if path is None or not os.access(path, os.W_OK):
+            return False
+
+        try:
+            with open(path, 'w') as f:
+                f.write('%d' % msec)
+        except (IOError, OSError):
+            return False
 
         return True
 
@@ -20,10 +20,16 @@
 # Author: Ryu Woon Jung (Leon)
 
 from .robotis_def import *
+from .port_handler import monotonicNs
+from .status_packet import StatusPacket
+from .status_receiver import StatusReceiver, receiveStatus, pollStatus
 
 TXPACKET_MAX_LEN = 250
 RXPACKET_MAX_LEN = 250
 
+MIN_STATUS_LENGTH = 6  # HEADER0 HEADER1 ID LENGTH ERROR CHKSUM
+PACKET_HEADER = b'\xff\xff'
+
 # for Protocol 1.0 Packet
 PKT_HEADER0 = 0
 PKT_HEADER1 = 1
@@ -43,6 +49,117 @@ ERRBIT_OVERLOAD = 32  # The current load cannot be controlled by the set torque.
 ERRBIT_INSTRUCTION = 64  # Undefined instruction or delivering the action command without the reg_write command.
 
 
+class Protocol1StatusParser(object):
+    """
+    Incremental Protocol 1.0 status packet parser
+    """
+    def __init__(self):
+        self.rxbuffer = bytearray()
+        self.start = 0      # read cursor
+        self.wait_length = MIN_STATUS_LENGTH
+        self.rx_time = 0    # time of the latest data (ns)
+        self.corrupt_count = 0
+
+    def reset(self):
+        del self.rxbuffer[:]
+        self.start = 0
+        self.wait_length = MIN_STATUS_LENGTH
+
+    def addData(self, data, timestamp=None):
+        if not data:
+            return
+
+        self.rxbuffer += data
+        self.rx_time = monotonicNs() if timestamp is None else timestamp
+
+    def feed(self, data, timestamp=None):
+        self.addData(data, timestamp)
+
+        packets = []
+        while True:
+            status, result = self.parsePacket()
+            if result == COMM_SUCCESS:
+                packets.append(status)
+            elif result == COMM_RX_WAITING:
+                return packets
+
+    def getRxLength(self):
+        return len(self.rxbuffer) - self.start
+
+    def getRxData(self):
+        return self.rxbuffer[self.start:]
+
+    def getBytesNeeded(self):
+        return max(self.wait_length - self.getRxLength(), 0)
+
+    def consume(self, length):
+        self.start += length
+        self.wait_length = MIN_STATUS_LENGTH
+        self.compact()
+
+    def compact(self):
+        if self.start == len(self.rxbuffer):
+            del self.rxbuffer[:]
+            self.start = 0
+        elif self.start > RXPACKET_MAX_LEN:
+            del self.rxbuffer[0: self.start]
+            self.start = 0
+
+    def parsePacket(self):
+        """
+        Parse the next status packet from the buffered data
+        :return: (StatusPacket, COMM_SUCCESS) / (None, COMM_RX_CORRUPT) / (None, COMM_RX_WAITING)
+        """
+        rxbuffer = self.rxbuffer
+
+        while True:
+            rx_length = len(rxbuffer) - self.start
+            if rx_length < self.wait_length:
+                return None, COMM_RX_WAITING
+
+            # find packet header
+            idx = rxbuffer.find(PACKET_HEADER, self.start)
+            if idx < 0:
+                idx = max(self.start, len(rxbuffer) - 1)
+
+            if idx != self.start:
+                # skip unnecessary packets
+                self.start = idx
+                self.compact()  # also when no header arrives for a long time (line noise)
+                continue
+
+            start = self.start
+            if (rxbuffer[start + PKT_ID] > 0xFD) or (rxbuffer[start + PKT_LENGTH] > RXPACKET_MAX_LEN) or (
+                    rxbuffer[start + PKT_LENGTH] < 2) or (rxbuffer[start + PKT_ERROR] > 0x7F):
+                # unavailable ID or unavailable Length or unavailable Error
+                # skip the first byte in the packet
+                self.consume(1)
+                continue
+
+            # re-calculate the exact length of the rx packet
+            self.wait_length = rxbuffer[start + PKT_LENGTH] + PKT_LENGTH + 1
+            if rx_length < self.wait_length:
+                return None, COMM_RX_WAITING
+
+            wait_length = self.wait_length
+
+            # calculate checksum
+            checksum = ~sum(rxbuffer[start + 2: start + wait_length - 1]) & 0xFF  # except header, checksum
+
+            # verify checksum
+            if rxbuffer[start + wait_length - 1] != checksum:
+                self.corrupt_count += 1
+                self.consume(1)
+                return None, COMM_RX_CORRUPT
+
+            packet = rxbuffer[start: start + wait_length]
+            self.consume(wait_length)
+
+            params = byteView(packet)[PKT_PARAMETER0: wait_length - 1]
+
+            return StatusPacket(packet[PKT_ID], packet[PKT_ERROR], params, packet, self.rx_time), COMM_SUCCESS
+
+
 class Protocol1PacketHandler(object):
     def getProtocolVersion(self):
         return 1.0
@@ -93,17 +210,69 @@ class Protocol1PacketHandler(object):
 
         return ""
 
+    def makeStatusParser(self):
+        return Protocol1StatusParser()
+
+    def makePingPacket(self, dxl_id):
+        txpacket = bytearray(6)
+
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH] = 2
+        txpacket[PKT_INSTRUCTION] = INST_PING
+
+        return txpacket
+
+    def makeReadPacket(self, dxl_id, address, length):
+        txpacket = bytearray(8)
+
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH] = 4
+        txpacket[PKT_INSTRUCTION] = INST_READ
+        txpacket[PKT_PARAMETER0 + 0] = address
+        txpacket[PKT_PARAMETER0 + 1] = length
+
+        return txpacket
+
+    def makeWritePacket(self, dxl_id, address, length, data, instruction=INST_WRITE):
+        txpacket = bytearray(length + 7)
+
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH] = length + 3
+        txpacket[PKT_INSTRUCTION] = instruction
+        txpacket[PKT_PARAMETER0] = address
+
+        txpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length] = data[0: length]
+
+        return txpacket
+
+    def makeActionPacket(self, dxl_id):
+        txpacket = bytearray(6)
+
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH] = 2
+        txpacket[PKT_INSTRUCTION] = INST_ACTION
+
+        return txpacket
+
+    def makeFactoryResetPacket(self, dxl_id):
+        txpacket = bytearray(6)
+
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH] = 2
+        txpacket[PKT_INSTRUCTION] = INST_FACTORY_RESET
+
+        return txpacket
+
     def txPacket(self, port, txpacket):
         checksum = 0
         total_packet_length = txpacket[PKT_LENGTH] + 4  # 4: HEADER0 HEADER1 ID LENGTH
 
-        if port.is_using:
+        if not port.acquireBus():
             return COMM_PORT_BUSY
-        port.is_using = True
 
         # check max packet length
         if total_packet_length > TXPACKET_MAX_LEN:
-            port.is_using = False
+            port.releaseBus()
             return COMM_TX_ERROR
 
         # make packet header
@@ -122,94 +291,31 @@ class Protocol1PacketHandler(object):
         port.clearPort()
         written_packet_length = port.writePort(txpacket)
         if total_packet_length != written_packet_length:
-            port.is_using = False
+            port.releaseBus()
             return COMM_TX_FAIL
 
         return COMM_SUCCESS
 
     def rxPacket(self, port):
-        rxpacket = []
-
-        result = COMM_TX_FAIL
-        checksum = 0
-        rx_length = 0
-        wait_length = 6  # minimum length (HEADER0 HEADER1 ID LENGTH ERROR CHKSUM)
-
-        while True:
-            rxpacket.extend(port.readPort(wait_length - rx_length))
-            rx_length = len(rxpacket)
-            if rx_length >= wait_length:
-                # find packet header
-                for idx in range(0, (rx_length - 1)):
-                    if (rxpacket[idx] == 0xFF) and (rxpacket[idx + 1] == 0xFF):
-                        break
-
-                if idx == 0:  # found at the beginning of the packet
-                    if (rxpacket[PKT_ID] > 0xFD) or (rxpacket[PKT_LENGTH] > RXPACKET_MAX_LEN) or (
-                            rxpacket[PKT_ERROR] > 0x7F):
-                        # unavailable ID or unavailable Length or unavailable Error
-                        # remove the first byte in the packet
-                        del rxpacket[0]
-                        rx_length -= 1
-                        continue
-
-                    # re-calculate the exact length of the rx packet
-                    if wait_length != (rxpacket[PKT_LENGTH] + PKT_LENGTH + 1):
-                        wait_length = rxpacket[PKT_LENGTH] + PKT_LENGTH + 1
-                        continue
-
-                    if rx_length < wait_length:
-                        # check timeout
-                        if port.isPacketTimeout():
-                            if rx_length == 0:
-                                result = COMM_RX_TIMEOUT
-                            else:
-                                result = COMM_RX_CORRUPT
-                            break
-                        else:
-                            continue
-
-                    # calculate checksum
-                    for i in range(2, wait_length - 1):  # except header, checksum
-                        checksum += rxpacket[i]
-                    checksum = ~checksum & 0xFF
-
-                    # verify checksum
-                    if rxpacket[wait_length - 1] == checksum:
-                        result = COMM_SUCCESS
-                    else:
-                        result = COMM_RX_CORRUPT
-                    break
-
-                else:
-                    # remove unnecessary packets
-                    del rxpacket[0: idx]
-                    rx_length -= idx
-
-            else:
-                # check timeout
-                if port.isPacketTimeout():
-                    if rx_length == 0:
-                        result = COMM_RX_TIMEOUT
-                    else:
-                        result = COMM_RX_CORRUPT
-                    break
-
-        port.is_using = False
+        receiver = receiveStatus(port, StatusReceiver(Protocol1StatusParser()))
 
         #print "[RxPacket] %r" % rxpacket
 
-        return rxpacket, result
+        if receiver.result == COMM_SUCCESS:
+            return receiver.status.packet, receiver.result
 
-    # NOT for BulkRead
-    def txRxPacket(self, port, txpacket):
-        rxpacket = None
-        error = 0
+        return receiver.parser.getRxData(), receiver.result
 
+    # NOT for BulkRead
+    def txRequestPacket(self, port, txpacket):
+        """
+        Transmit an instruction packet and set the timeout of its status packet
+        :return: result, whether a status packet is expected
+        """
         # tx packet
         result = self.txPacket(port, txpacket)
         if result != COMM_SUCCESS:
-            return rxpacket, result, error
+            return result, False
 
         # (Instruction == BulkRead) == this function is not available.
         if txpacket[PKT_INSTRUCTION] == INST_BULK_READ:
@@ -217,14 +323,24 @@ class Protocol1PacketHandler(object):
 
         # (ID == Broadcast ID) == no need to wait for status packet or not available
         if (txpacket[PKT_ID] == BROADCAST_ID):
-            port.is_using = False
-            return rxpacket, result, error
+            port.releaseBus()
+            return result, False
 
         # set packet timeout
         if txpacket[PKT_INSTRUCTION] == INST_READ:
-            port.setPacketTimeout(txpacket[PKT_PARAMETER0 + 1] + 6)
+            port.setPacketTimeoutFor(txpacket[PKT_ID], txpacket[PKT_PARAMETER0 + 1] + 6)
         else:
-            port.setPacketTimeout(6)  # HEADER0 HEADER1 ID LENGTH ERROR CHECKSUM
+            port.setPacketTimeoutFor(txpacket[PKT_ID], 6)  # HEADER0 HEADER1 ID LENGTH ERROR CHECKSUM
+
+        return result, True
+
+    def txRxPacket(self, port, txpacket):
+        rxpacket = None
+        error = 0
+
+        result, is_status_expected = self.txRequestPacket(port, txpacket)
+        if not is_status_expected:
+            return rxpacket, result, error
 
         # rx packet
         while True:
@@ -241,16 +357,14 @@ class Protocol1PacketHandler(object):
         model_number = 0
         error = 0
 
-        txpacket = [0] * 6
-
         if dxl_id >= BROADCAST_ID:
             return model_number, COMM_NOT_AVAILABLE, error
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = 2
-        txpacket[PKT_INSTRUCTION] = INST_PING
+        txpacket = self.makePingPacket(dxl_id)
 
         rxpacket, result, error = self.txRxPacket(port, txpacket)
+        if port.health_tracker is not None:
+            port.health_tracker.reportResult(dxl_id, result)
 
         if result == COMM_SUCCESS:
             data_read, result, error = self.readTxRx(port, dxl_id, 0, 2)  # Address 0 : Model Number
@@ -264,13 +378,7 @@ class Protocol1PacketHandler(object):
         return data_list, COMM_NOT_AVAILABLE
 
     def action(self, port, dxl_id):
-        txpacket = [0] * 6
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = 2
-        txpacket[PKT_INSTRUCTION] = INST_ACTION
-
-        _, result, _ = self.txRxPacket(port, txpacket)
+        _, result, _ = self.txRxPacket(port, self.makeActionPacket(dxl_id))
 
         return result
 
@@ -278,43 +386,30 @@ class Protocol1PacketHandler(object):
         return COMM_NOT_AVAILABLE, 0
 
     def factoryReset(self, port, dxl_id):
-        txpacket = [0] * 6
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = 2
-        txpacket[PKT_INSTRUCTION] = INST_FACTORY_RESET
-
-        _, result, error = self.txRxPacket(port, txpacket)
+        _, result, error = self.txRxPacket(port, self.makeFactoryResetPacket(dxl_id))
 
         return result, error
 
     def readTx(self, port, dxl_id, address, length):
-
-        txpacket = [0] * 8
-
         if dxl_id >= BROADCAST_ID:
             return COMM_NOT_AVAILABLE
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = 4
-        txpacket[PKT_INSTRUCTION] = INST_READ
-        txpacket[PKT_PARAMETER0 + 0] = address
-        txpacket[PKT_PARAMETER0 + 1] = length
+        txpacket = self.makeReadPacket(dxl_id, address, length)
 
         result = self.txPacket(port, txpacket)
 
         # set packet timeout
         if result == COMM_SUCCESS:
-            port.setPacketTimeout(length + 6)
+            port.setPacketTimeoutFor(dxl_id, length + 6)
 
         return result
 
-    def readRx(self, port, dxl_id, length):
+    def readRxBuffer(self, port, dxl_id, length):
         result = COMM_TX_FAIL
         error = 0
 
         rxpacket = None
-        data = []
+        data = EMPTY_DATA
 
         while True:
             rxpacket, result = self.rxPacket(port)
@@ -325,41 +420,50 @@ class Protocol1PacketHandler(object):
         if result == COMM_SUCCESS and rxpacket[PKT_ID] == dxl_id:
             error = rxpacket[PKT_ERROR]
 
-            data.extend(rxpacket[PKT_PARAMETER0: PKT_PARAMETER0 + length])
+            data = byteView(rxpacket)[PKT_PARAMETER0: PKT_PARAMETER0 + length]
 
         return data, result, error
 
-    def readTxRx(self, port, dxl_id, address, length):
-        txpacket = [0] * 8
-        data = []
+    def readTxRxBuffer(self, port, dxl_id, address, length):
+        data = EMPTY_DATA
 
         if dxl_id >= BROADCAST_ID:
             return data, COMM_NOT_AVAILABLE, 0
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = 4
-        txpacket[PKT_INSTRUCTION] = INST_READ
-        txpacket[PKT_PARAMETER0 + 0] = address
-        txpacket[PKT_PARAMETER0 + 1] = length
+        health_tracker = port.health_tracker
+        if health_tracker is not None and not health_tracker.isReachable(dxl_id):   # 已隔离的设备
+            return data, COMM_NOT_AVAILABLE, 0
+
+        txpacket = self.makeReadPacket(dxl_id, address, length)
 
         rxpacket, result, error = self.txRxPacket(port, txpacket)
+        if health_tracker is not None:
+            health_tracker.reportResult(dxl_id, result)
         if result == COMM_SUCCESS:
             error = rxpacket[PKT_ERROR]
 
-            data.extend(rxpacket[PKT_PARAMETER0: PKT_PARAMETER0 + length])
+            data = byteView(rxpacket)[PKT_PARAMETER0: PKT_PARAMETER0 + length]
 
         return data, result, error
 
+    def readRx(self, port, dxl_id, length):
+        data, result, error = self.readRxBuffer(port, dxl_id, length)
+        return list(data), result, error
+
+    def readTxRx(self, port, dxl_id, address, length):
+        data, result, error = self.readTxRxBuffer(port, dxl_id, address, length)
+        return list(data), result, error
+
     def read1ByteTx(self, port, dxl_id, address):
         return self.readTx(port, dxl_id, address, 1)
 
     def read1ByteRx(self, port, dxl_id):
-        data, result, error = self.readRx(port, dxl_id, 1)
+        data, result, error = self.readRxBuffer(port, dxl_id, 1)
         data_read = data[0] if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
     def read1ByteTxRx(self, port, dxl_id, address):
-        data, result, error = self.readTxRx(port, dxl_id, address, 1)
+        data, result, error = self.readTxRxBuffer(port, dxl_id, address, 1)
         data_read = data[0] if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
@@ -367,12 +471,12 @@ class Protocol1PacketHandler(object):
         return self.readTx(port, dxl_id, address, 2)
 
     def read2ByteRx(self, port, dxl_id):
-        data, result, error = self.readRx(port, dxl_id, 2)
+        data, result, error = self.readRxBuffer(port, dxl_id, 2)
         data_read = DXL_MAKEWORD(data[0], data[1]) if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
     def read2ByteTxRx(self, port, dxl_id, address):
-        data, result, error = self.readTxRx(port, dxl_id, address, 2)
+        data, result, error = self.readTxRxBuffer(port, dxl_id, address, 2)
         data_read = DXL_MAKEWORD(data[0], data[1]) if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
@@ -380,41 +484,34 @@ class Protocol1PacketHandler(object):
         return self.readTx(port, dxl_id, address, 4)
 
     def read4ByteRx(self, port, dxl_id):
-        data, result, error = self.readRx(port, dxl_id, 4)
+        data, result, error = self.readRxBuffer(port, dxl_id, 4)
         data_read = DXL_MAKEDWORD(DXL_MAKEWORD(data[0], data[1]),
                                   DXL_MAKEWORD(data[2], data[3])) if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
     def read4ByteTxRx(self, port, dxl_id, address):
-        data, result, error = self.readTxRx(port, dxl_id, address, 4)
+        data, result, error = self.readTxRxBuffer(port, dxl_id, address, 4)
         data_read = DXL_MAKEDWORD(DXL_MAKEWORD(data[0], data[1]),
                                   DXL_MAKEWORD(data[2], data[3])) if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
     def writeTxOnly(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 7)
+        if port.write_batch is not None and port.write_batch.addWrite(self, dxl_id, address, length, data):
+            return COMM_SUCCESS     # 由 WriteBatch 合并发送
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = length + 3
-        txpacket[PKT_INSTRUCTION] = INST_WRITE
-        txpacket[PKT_PARAMETER0] = address
-
-        txpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length] = data[0: length]
+        txpacket = self.makeWritePacket(dxl_id, address, length, data)
 
         result = self.txPacket(port, txpacket)
-        port.is_using = False
+        port.releaseBus()
 
         return result
 
     def writeTxRx(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 7)
+        if port.write_batch is not None and port.write_batch.isBatching():
+            return COMM_NOT_AVAILABLE, 0    # 合并后的写入没有状态包，WriteBatch 中请使用 write*TxOnly
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = length + 3
-        txpacket[PKT_INSTRUCTION] = INST_WRITE
-        txpacket[PKT_PARAMETER0] = address
+        txpacket = self.makeWritePacket(dxl_id, address, length, data)
 
-        txpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length] = data[0: length]
         rxpacket, result, error = self.txRxPacket(port, txpacket)
 
         return result, error
@@ -450,29 +547,15 @@ class Protocol1PacketHandler(object):
         return self.writeTxRx(port, dxl_id, address, 4, data_write)
 
     def regWriteTxOnly(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 7)
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = length + 3
-        txpacket[PKT_INSTRUCTION] = INST_REG_WRITE
-        txpacket[PKT_PARAMETER0] = address
-
-        txpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length] = data[0: length]
+        txpacket = self.makeWritePacket(dxl_id, address, length, data, INST_REG_WRITE)
 
         result = self.txPacket(port, txpacket)
-        port.is_using = False
+        port.releaseBus()
 
         return result
 
     def regWriteTxRx(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 7)
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH] = length + 3
-        txpacket[PKT_INSTRUCTION] = INST_REG_WRITE
-        txpacket[PKT_PARAMETER0] = address
-
-        txpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length] = data[0: length]
+        txpacket = self.makeWritePacket(dxl_id, address, length, data, INST_REG_WRITE)
 
         _, result, error = self.txRxPacket(port, txpacket)
 
@@ -481,8 +564,73 @@ class Protocol1PacketHandler(object):
     def syncReadTx(self, port, start_address, data_length, param, param_length):
         return COMM_NOT_AVAILABLE
 
+    def fastSyncReadTx(self, port, start_address, data_length, param, param_length):
+        return COMM_NOT_AVAILABLE
+
+    def fastReadRx(self, port, data_lengths):
+        return {}, COMM_NOT_AVAILABLE
+
+    def readRxMulti(self, port, data_lengths):
+        """
+        Receive all status packets of Sync Read / Bulk Read in one receive window
+        :param port: 端口
+        :param data_lengths: {dxl_id: data_length}
+        :return: {dxl_id: StatusPacket}, 通信状态 (所有设备均应答时为 COMM_SUCCESS)
+        """
+        # 同一个解析器连续解析多个数据包，单个设备失败不影响其他设备
+        receiver = receiveStatus(port, StatusReceiver(Protocol1StatusParser(), data_lengths))
+        return receiver.status_list, receiver.result
+
+    def rxStatusPoll(self, port, dxl_id=None):
+        """
+        Non-blocking receive of one status packet
+        :param dxl_id: 跳过其他设备的状态包，None 时不过滤
+        :return: StatusPacket, 通信状态 (数据尚未接收完成时为 COMM_RX_WAITING)
+        """
+        receiver = pollStatus(port, lambda: StatusReceiver(Protocol1StatusParser(), dxl_id=dxl_id))
+        if not receiver.is_done:    # 暂无新数据，下次调用时继续
+            return None, COMM_RX_WAITING
+
+        return receiver.status, receiver.result
+
+    def rxPacketPoll(self, port):
+        """
+        Non-blocking rxPacket, call repeatedly until the result is not COMM_RX_WAITING
+        :return: 数据包, 通信状态
+        """
+        status, result = self.rxStatusPoll(port)
+        if result == COMM_SUCCESS:
+            return status.packet, result
+
+        return bytearray(), result
+
+    def readRxPoll(self, port, dxl_id, length):
+        """
+        Non-blocking readRx
+        :return: 数据, 通信状态 (数据尚未接收完成时为 COMM_RX_WAITING), 错误
+        """
+        status, result = self.rxStatusPoll(port, dxl_id)
+        if result != COMM_SUCCESS:
+            return [], result, 0
+
+        return list(status.params[0: length]), result, status.error
+
+    def readRxMultiPoll(self, port, data_lengths):
+        """
+        Non-blocking readRxMulti
+        :return: {dxl_id: StatusPacket} (已收到的部分), 通信状态 (数据尚未接收完成时为 COMM_RX_WAITING)
+        """
+        receiver = pollStatus(port, lambda: StatusReceiver(Protocol1StatusParser(), data_lengths))
+        if not receiver.is_done:    # 暂无新数据，下次调用时继续
+            return receiver.status_list, COMM_RX_WAITING
+
+        return receiver.status_list, receiver.result
+
+    def fastReadRxPoll(self, port, data_lengths):
+        return {}, COMM_NOT_AVAILABLE
+
     def syncWriteTxOnly(self, port, start_address, data_length, param, param_length):
-        txpacket = [0] * (param_length + 8)
+        txpacket = bytearray(param_length + 8)
         # 8: HEADER0 HEADER1 ID LEN INST START_ADDR DATA_LEN ... CHKSUM
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -498,7 +646,7 @@ class Protocol1PacketHandler(object):
         return result
 
     def bulkReadTx(self, port, param, param_length):
-        txpacket = [0] * (param_length + 7)
+        txpacket = bytearray(param_length + 7)
         # 7: HEADER0 HEADER1 ID LEN INST 0x00 ... CHKSUM
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -515,9 +663,12 @@ class Protocol1PacketHandler(object):
             while i < param_length:
                 wait_length += param[i] + 7
                 i += 3
-            port.setPacketTimeout(wait_length)
+            port.setPacketTimeoutFor((INST_BULK_READ, tuple(param[0: param_length])), wait_length)
 
         return result
 
+    def fastBulkReadTx(self, port, param, param_length):
+        return COMM_NOT_AVAILABLE
+
     def bulkWriteTxOnly(self, port, param, param_length):
         return COMM_NOT_AVAILABLE
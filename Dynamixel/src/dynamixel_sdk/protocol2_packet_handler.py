@@ -20,10 +20,17 @@
 # Author: Ryu Woon Jung (Leon)
 
 from .robotis_def import *  # 加载变量库
+from .crc16 import *
+from .port_handler import monotonicNs
+from .status_packet import StatusPacket
+from .status_receiver import StatusReceiver, receiveStatus, pollStatus
 
 TXPACKET_MAX_LEN = 1 * 1024 # 发送最大长度
 RXPACKET_MAX_LEN = 1 * 1024 # 接收最大长度
 
+MIN_STATUS_LENGTH = 11  # HEADER0 HEADER1 HEADER2 RESERVED ID LENGTH_L LENGTH_H INST ERROR CRC16_L CRC16_H
+BROADCAST_PING_STATUS_LENGTH = 14   # Ping 状态包长度
+
 # for Protocol 2.0 Packet   2.0 数据包格式
 PKT_HEADER0 = 0     # 帧头 3 byte
 PKT_HEADER1 = 1
@@ -36,6 +43,10 @@ PKT_INSTRUCTION = 7 # 指令
 PKT_ERROR = 8       #
 PKT_PARAMETER0 = 8  # 参数
 
+PACKET_HEADER = b'\xff\xff\xfd'     # 帧头
+STUFFING_PATTERN = b'\xff\xff\xfd'  # 需要字节填充的序列
+UNSTUFFING_PATTERN = b'\xff\xff\xfd\xfd'   # 已填充的序列
+
 # Protocol 2.0 Error bit    错误位
 ERRNUM_RESULT_FAIL = 1  # Failed to process the instruction packet.     指令包处理错误
 ERRNUM_INSTRUCTION = 2  # Instruction error     指令错误
@@ -48,6 +59,186 @@ ERRNUM_ACCESS = 7  # Access error               操作错误
 ERRBIT_ALERT = 128  # When the device has a problem, this bit is set to 1. Check "Device Status Check" value.
 
 
+def addStuffing(packet):
+    packet_length_in = DXL_MAKEWORD(packet[PKT_LENGTH_L], packet[PKT_LENGTH_H]) # 获取数据长度
+    body_end = PKT_INSTRUCTION + packet_length_in - 2   # except CRC
+
+    data = packet if isinstance(packet, bytearray) else bytearray(packet)
+
+    # 先查找 FF FF FD，绝大多数数据包无需填充，直接返回
+    idx = data.find(STUFFING_PATTERN, PKT_INSTRUCTION - 2, body_end)
+    if idx < 0:
+        return packet
+
+    # FF FF FD -> FF FF FD FD
+    packet_length_out = packet_length_in
+    chunks = []
+    pos = 0
+    while idx >= 0:
+        chunks.append(data[pos: idx + 3])
+        chunks.append(b'\xfd')
+        packet_length_out += 1
+        pos = idx + 3
+        idx = data.find(STUFFING_PATTERN, pos, body_end)
+    chunks.append(data[pos: body_end + 2])  # 剩余数据与 CRC
+
+    packet[0: body_end + 2] = bytearray().join(chunks)  # 原地更新数据包
+
+    packet[PKT_LENGTH_L] = DXL_LOBYTE(packet_length_out)    # 更新数据包中的数据长度位
+    packet[PKT_LENGTH_H] = DXL_HIBYTE(packet_length_out)
+
+    return packet   # 返回数据包
+
+def removeStuffing(packet):
+    packet_length_in = DXL_MAKEWORD(packet[PKT_LENGTH_L], packet[PKT_LENGTH_H])
+    body_end = PKT_INSTRUCTION + packet_length_in - 2   # except CRC
+
+    data = packet if isinstance(packet, bytearray) else bytearray(packet)
+
+    idx = data.find(UNSTUFFING_PATTERN, PKT_INSTRUCTION - 2, body_end)
+    if idx < 0:
+        return packet
+
+    # FF FF FD FD -> FF FF FD
+    packet_length_out = packet_length_in
+    chunks = []
+    pos = 0
+    while idx >= 0:
+        chunks.append(data[pos: idx + 3])
+        packet_length_out -= 1
+        pos = idx + 4
+        idx = data.find(UNSTUFFING_PATTERN, pos, body_end)
+    chunks.append(data[pos: body_end + 2])
+
+    packet[0: body_end + 2] = bytearray().join(chunks)
+
+    packet[PKT_LENGTH_L] = DXL_LOBYTE(packet_length_out)
+    packet[PKT_LENGTH_H] = DXL_HIBYTE(packet_length_out)
+
+    return packet
+
+
+class Protocol2StatusParser(object):
+    """
+    Incremental Protocol 2.0 status packet parser
+    可输入任意长度的数据片段，逐个解析出完整且校验通过的状态包
+    """
+    def __init__(self):
+        self.rxbuffer = bytearray()     # 接收缓冲区
+        self.start = 0      # 读游标，丢弃的数据只移动游标不删除
+        self.wait_length = MIN_STATUS_LENGTH
+        self.rx_time = 0    # 最近一次接收数据的时刻 (ns)
+        self.corrupt_count = 0  # 校验失败的数据包数
+
+    def reset(self):
+        del self.rxbuffer[:]
+        self.start = 0
+        self.wait_length = MIN_STATUS_LENGTH
+
+    def addData(self, data, timestamp=None):
+        if not data:
+            return
+
+        self.rxbuffer += data
+        self.rx_time = monotonicNs() if timestamp is None else timestamp
+
+    def feed(self, data, timestamp=None):
+        # 输入数据，返回所有已完成且校验通过的状态包
+        self.addData(data, timestamp)
+
+        packets = []
+        while True:
+            status, result = self.parsePacket()
+            if result == COMM_SUCCESS:
+                packets.append(status)
+            elif result == COMM_RX_WAITING:
+                return packets
+
+    def getRxLength(self):      # 尚未解析的数据长度
+        return len(self.rxbuffer) - self.start
+
+    def getRxData(self):
+        return self.rxbuffer[self.start:]
+
+    def getBytesNeeded(self):   # 完成当前数据包还需的字节数
+        return max(self.wait_length - self.getRxLength(), 0)
+
+    def findPacketHeader(self):     # 从游标处寻找帧头 FF FF FD
+        rxbuffer = self.rxbuffer
+        idx = rxbuffer.find(PACKET_HEADER, self.start)
+        while 0 <= idx < len(rxbuffer) - 3 and rxbuffer[idx + 3] == 0xFD:  # FF FF FD FD 为填充数据
+            idx = rxbuffer.find(PACKET_HEADER, idx + 1)
+
+        if idx < 0:     # 未找到时保留末尾可能属于帧头的字节
+            idx = max(self.start, len(rxbuffer) - 3)
+
+        return idx
+
+    def consume(self, length):
+        self.start += length
+        self.wait_length = MIN_STATUS_LENGTH
+        self.compact()
+
+    def compact(self):
+        if self.start == len(self.rxbuffer):
+            del self.rxbuffer[:]
+            self.start = 0
+        elif self.start > RXPACKET_MAX_LEN:     # 压缩缓冲区，避免持续增长
+            del self.rxbuffer[0: self.start]
+            self.start = 0
+
+    def parsePacket(self):
+        """
+        Parse the next status packet from the buffered data
+        :return: (StatusPacket, COMM_SUCCESS) / (None, COMM_RX_CORRUPT) / (None, COMM_RX_WAITING)
+        """
+        rxbuffer = self.rxbuffer
+
+        while True:
+            rx_length = len(rxbuffer) - self.start
+            if rx_length < self.wait_length:
+                return None, COMM_RX_WAITING
+
+            idx = self.findPacketHeader()
+            if idx != self.start:
+                # skip unnecessary data    跳过非重要的数据
+                self.start = idx
+                self.compact()  # 长时间没有帧头 (线路噪声) 时也压缩缓冲区
+                continue
+
+            start = self.start
+            packet_length = DXL_MAKEWORD(rxbuffer[start + PKT_LENGTH_L], rxbuffer[start + PKT_LENGTH_H])
+
+            if (rxbuffer[start + PKT_RESERVED] != 0x00) or (
+                    rxbuffer[start + PKT_ID] > 0xFC and rxbuffer[start + PKT_ID] != BROADCAST_ID) or (
+                    packet_length > RXPACKET_MAX_LEN) or (packet_length < 4) or (
+                    rxbuffer[start + PKT_INSTRUCTION] != INST_STATUS):
+                # skip the first byte   跳过首个字节
+                self.consume(1)
+                continue
+
+            self.wait_length = packet_length + PKT_LENGTH_H + 1
+            if rx_length < self.wait_length:
+                return None, COMM_RX_WAITING
+
+            wait_length = self.wait_length
+
+            # 校验 CRC
+            crc = DXL_MAKEWORD(rxbuffer[start + wait_length - 2], rxbuffer[start + wait_length - 1])
+            if updateCRC(0, rxbuffer, wait_length - 2, start) != crc:
+                self.corrupt_count += 1
+                self.consume(1)
+                return None, COMM_RX_CORRUPT
+
+            packet = removeStuffing(rxbuffer[start: start + wait_length])
+            self.consume(wait_length)
+
+            packet_length = DXL_MAKEWORD(packet[PKT_LENGTH_L], packet[PKT_LENGTH_H])
+            params = byteView(packet)[PKT_PARAMETER0 + 1: PKT_INSTRUCTION + packet_length - 2]
+
+            return StatusPacket(packet[PKT_ID], packet[PKT_ERROR], params, packet, self.rx_time), COMM_SUCCESS
+
+
 class Protocol2PacketHandler(object):
     def getProtocolVersion(self):   # 获取协议版本号
         return 2.0
@@ -113,110 +304,104 @@ class Protocol2PacketHandler(object):
         :param data_blk_size:   数据大小
         :return:    校验和
         """
-        crc_table = [0x0000,
-                     0x8005, 0x800F, 0x000A, 0x801B, 0x001E, 0x0014, 0x8011,
-                     0x8033, 0x0036, 0x003C, 0x8039, 0x0028, 0x802D, 0x8027,
-                     0x0022, 0x8063, 0x0066, 0x006C, 0x8069, 0x0078, 0x807D,
-                     0x8077, 0x0072, 0x0050, 0x8055, 0x805F, 0x005A, 0x804B,
-                     0x004E, 0x0044, 0x8041, 0x80C3, 0x00C6, 0x00CC, 0x80C9,
-                     0x00D8, 0x80DD, 0x80D7, 0x00D2, 0x00F0, 0x80F5, 0x80FF,
-                     0x00FA, 0x80EB, 0x00EE, 0x00E4, 0x80E1, 0x00A0, 0x80A5,
-                     0x80AF, 0x00AA, 0x80BB, 0x00BE, 0x00B4, 0x80B1, 0x8093,
-                     0x0096, 0x009C, 0x8099, 0x0088, 0x808D, 0x8087, 0x0082,
-                     0x8183, 0x0186, 0x018C, 0x8189, 0x0198, 0x819D, 0x8197,
-                     0x0192, 0x01B0, 0x81B5, 0x81BF, 0x01BA, 0x81AB, 0x01AE,
-                     0x01A4, 0x81A1, 0x01E0, 0x81E5, 0x81EF, 0x01EA, 0x81FB,
-                     0x01FE, 0x01F4, 0x81F1, 0x81D3, 0x01D6, 0x01DC, 0x81D9,
-                     0x01C8, 0x81CD, 0x81C7, 0x01C2, 0x0140, 0x8145, 0x814F,
-                     0x014A, 0x815B, 0x015E, 0x0154, 0x8151, 0x8173, 0x0176,
-                     0x017C, 0x8179, 0x0168, 0x816D, 0x8167, 0x0162, 0x8123,
-                     0x0126, 0x012C, 0x8129, 0x0138, 0x813D, 0x8137, 0x0132,
-                     0x0110, 0x8115, 0x811F, 0x011A, 0x810B, 0x010E, 0x0104,
-                     0x8101, 0x8303, 0x0306, 0x030C, 0x8309, 0x0318, 0x831D,
-                     0x8317, 0x0312, 0x0330, 0x8335, 0x833F, 0x033A, 0x832B,
-                     0x032E, 0x0324, 0x8321, 0x0360, 0x8365, 0x836F, 0x036A,
-                     0x837B, 0x037E, 0x0374, 0x8371, 0x8353, 0x0356, 0x035C,
-                     0x8359, 0x0348, 0x834D, 0x8347, 0x0342, 0x03C0, 0x83C5,
-                     0x83CF, 0x03CA, 0x83DB, 0x03DE, 0x03D4, 0x83D1, 0x83F3,
-                     0x03F6, 0x03FC, 0x83F9, 0x03E8, 0x83ED, 0x83E7, 0x03E2,
-                     0x83A3, 0x03A6, 0x03AC, 0x83A9, 0x03B8, 0x83BD, 0x83B7,
-                     0x03B2, 0x0390, 0x8395, 0x839F, 0x039A, 0x838B, 0x038E,
-                     0x0384, 0x8381, 0x0280, 0x8285, 0x828F, 0x028A, 0x829B,
-                     0x029E, 0x0294, 0x8291, 0x82B3, 0x02B6, 0x02BC, 0x82B9,
-                     0x02A8, 0x82AD, 0x82A7, 0x02A2, 0x82E3, 0x02E6, 0x02EC,
-                     0x82E9, 0x02F8, 0x82FD, 0x82F7, 0x02F2, 0x02D0, 0x82D5,
-                     0x82DF, 0x02DA, 0x82CB, 0x02CE, 0x02C4, 0x82C1, 0x8243,
-                     0x0246, 0x024C, 0x8249, 0x0258, 0x825D, 0x8257, 0x0252,
-                     0x0270, 0x8275, 0x827F, 0x027A, 0x826B, 0x026E, 0x0264,
-                     0x8261, 0x0220, 0x8225, 0x822F, 0x022A, 0x823B, 0x023E,
-                     0x0234, 0x8231, 0x8213, 0x0216, 0x021C, 0x8219, 0x0208,
-                     0x820D, 0x8207, 0x0202]
-
-        for j in range(0, data_blk_size):   # 计算 CRC 校验和
-            i = ((crc_accum >> 8) ^ data_blk_ptr[j]) & 0xFF
-            crc_accum = ((crc_accum << 8) ^ crc_table[i]) & 0xFFFF
-
-        return crc_accum    # 返回校验和
+        return updateCRC(crc_accum, data_blk_ptr, data_blk_size)    # 返回校验和
 
     def addStuffing(self, packet):
-        packet_length_in = DXL_MAKEWORD(packet[PKT_LENGTH_L], packet[PKT_LENGTH_H]) # 获取数据长度
-        packet_length_out = packet_length_in
+        return addStuffing(packet)
+
+    def removeStuffing(self, packet):
+        return removeStuffing(packet)
+
+    def makeStatusParser(self):
+        return Protocol2StatusParser()
+
+    def makePingPacket(self, dxl_id):
+        txpacket = bytearray(10)
+
+        txpacket[PKT_ID] = dxl_id   # 设置设备 ID
+        txpacket[PKT_LENGTH_L] = 3  # No parameter   INST+CRC = 3
+        txpacket[PKT_LENGTH_H] = 0
+        txpacket[PKT_INSTRUCTION] = INST_PING   # ping 指令
 
-        temp = [0] * TXPACKET_MAX_LEN   # 生成大小为 TXPACKET_MAX_LEN，值为0 列表
+        return txpacket
 
-        # FF FF FD XX ID LEN_L LEN_H    将数据长度高位前数据传入 temp
-        temp[PKT_HEADER0: PKT_HEADER0 + PKT_LENGTH_H + 1] = packet[PKT_HEADER0: PKT_HEADER0 + PKT_LENGTH_H + 1]
+    def makeReadPacket(self, dxl_id, address, length):
+        txpacket = bytearray(14)
 
-        index = PKT_INSTRUCTION     # 指令码位置
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH_L] = 7  # INST+CRC+Parameter 1+2+4
+        txpacket[PKT_LENGTH_H] = 0
+        txpacket[PKT_INSTRUCTION] = INST_READ
+        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(address)  # 地址低位
+        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(address)  # 地址高位
+        txpacket[PKT_PARAMETER0 + 2] = DXL_LOBYTE(length)   # 长度低位
+        txpacket[PKT_PARAMETER0 + 3] = DXL_HIBYTE(length)   # 长度高位
 
-        # 从指令码位置开始写入指令与参数
-        for i in range(0, packet_length_in - 2):  # except CRC
-            temp[index] = packet[i + PKT_INSTRUCTION]
-            index = index + 1
-            # 此处 \ 可用于语句换行
-            if packet[i + PKT_INSTRUCTION] == 0xFD \
-                    and packet[i + PKT_INSTRUCTION - 1] == 0xFF \
-                    and packet[i + PKT_INSTRUCTION - 2] == 0xFF:
-                # FF FF FD
-                temp[index] = 0xFD
-                index = index + 1
-                packet_length_out = packet_length_out + 1
+        return txpacket
 
-        temp[index] = packet[PKT_INSTRUCTION + packet_length_in - 2]        # CRC
-        temp[index + 1] = packet[PKT_INSTRUCTION + packet_length_in - 1]
-        index = index + 2
+    def makeWritePacket(self, dxl_id, address, length, data, instruction=INST_WRITE):
+        txpacket = bytearray(length + 12)
 
-        if packet_length_in != packet_length_out:   # 长度不一致时
-            packet = [0] * index
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
+        txpacket[PKT_LENGTH_H] = DXL_HIBYTE(length + 5)
+        txpacket[PKT_INSTRUCTION] = instruction
+        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(address)
+        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(address)
 
-        packet[0: index] = temp[0: index]   # 通信数据包更新
+        txpacket[PKT_PARAMETER0 + 2: PKT_PARAMETER0 + 2 + length] = data[0: length] # 写入数据
 
-        packet[PKT_LENGTH_L] = DXL_LOBYTE(packet_length_out)    # 更新数据包中的数据长度位
-        packet[PKT_LENGTH_H] = DXL_HIBYTE(packet_length_out)
+        return txpacket
 
-        return packet   # 返回数据包
+    def makeActionPacket(self, dxl_id):
+        txpacket = bytearray(10)
 
-    def removeStuffing(self, packet):
-        packet_length_in = DXL_MAKEWORD(packet[PKT_LENGTH_L], packet[PKT_LENGTH_H])
-        packet_length_out = packet_length_in
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH_L] = 3
+        txpacket[PKT_LENGTH_H] = 0
+        txpacket[PKT_INSTRUCTION] = INST_ACTION
 
-        index = PKT_INSTRUCTION
-        for i in range(0, (packet_length_in - 2)):  # except CRC
-            if (packet[i + PKT_INSTRUCTION] == 0xFD) and (packet[i + PKT_INSTRUCTION + 1] == 0xFD) and (
-                    packet[i + PKT_INSTRUCTION - 1] == 0xFF) and (packet[i + PKT_INSTRUCTION - 2] == 0xFF):
-                # FF FF FD FD
-                packet_length_out = packet_length_out - 1
-            else:
-                packet[index] = packet[i + PKT_INSTRUCTION]
-                index += 1
+        return txpacket
 
-        packet[index] = packet[PKT_INSTRUCTION + packet_length_in - 2]
-        packet[index + 1] = packet[PKT_INSTRUCTION + packet_length_in - 1]
+    def makeRebootPacket(self, dxl_id):
+        txpacket = bytearray(10)
 
-        packet[PKT_LENGTH_L] = DXL_LOBYTE(packet_length_out)
-        packet[PKT_LENGTH_H] = DXL_HIBYTE(packet_length_out)
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH_L] = 3
+        txpacket[PKT_LENGTH_H] = 0
+        txpacket[PKT_INSTRUCTION] = INST_REBOOT
 
-        return packet
+        return txpacket
+
+    def makeClearMultiTurnPacket(self, dxl_id):
+        txpacket = bytearray(15)
+
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH_L] = 8
+        txpacket[PKT_LENGTH_H] = 0
+        txpacket[PKT_INSTRUCTION] = INST_CLEAR
+        txpacket[PKT_PARAMETER0 + 0] = 0x01
+        txpacket[PKT_PARAMETER0 + 1] = 0x44
+        txpacket[PKT_PARAMETER0 + 2] = 0x58
+        txpacket[PKT_PARAMETER0 + 3] = 0x4C
+        txpacket[PKT_PARAMETER0 + 4] = 0x22
+
+        return txpacket
+
+    def makeFactoryResetPacket(self, dxl_id, option):
+        txpacket = bytearray(11)
+
+        txpacket[PKT_ID] = dxl_id
+        txpacket[PKT_LENGTH_L] = 4
+        txpacket[PKT_LENGTH_H] = 0
+        txpacket[PKT_INSTRUCTION] = INST_FACTORY_RESET
+        # 回复出厂值参数
+        # 0xFF resetall
+        # 0x01 重置期望ID
+        # 0x02 重置期望 ID 与波特率
+        txpacket[PKT_PARAMETER0] = option
+
+        return txpacket
 
     def txPacket(self, port, txpacket):     # 发送数据包
         """
@@ -224,9 +409,8 @@ class Protocol2PacketHandler(object):
         :param txpacket: 发送数据包
         :return: 通信状态
         """
-        if port.is_using:   # 端口被占用
+        if not port.acquireBus():   # 等待总线空闲
             return COMM_PORT_BUSY
-        port.is_using = True
 
         # byte stuffing for header  帧头字节填充
         self.addStuffing(txpacket)
@@ -236,7 +420,7 @@ class Protocol2PacketHandler(object):
         # 7: HEADER0 HEADER1 HEADER2 RESERVED ID LENGTH_L LENGTH_H
 
         if total_packet_length > TXPACKET_MAX_LEN:  # 超出最大长度
-            port.is_using = False
+            port.releaseBus()
             return COMM_TX_ERROR    # 返回发送数据错误
 
         # make packet header    帧头
@@ -255,107 +439,59 @@ class Protocol2PacketHandler(object):
         port.clearPort()    # 清空缓存
         written_packet_length = port.writePort(txpacket)    # 将数据写入端口，返回数据长度
         if total_packet_length != written_packet_length:    # 发送长度与数据长度校验
-            port.is_using = False
+            port.releaseBus()
             return COMM_TX_FAIL  # 返回发送指令包失败
 
         return COMM_SUCCESS
 
     def rxPacket(self, port):   # 接收数据包
-        rxpacket = []   # 接收列表
+        receiver = receiveStatus(port, StatusReceiver(Protocol2StatusParser()))
 
-        result = COMM_TX_FAIL
-        rx_length = 0
-        # 最小数据长度
-        wait_length = 11  # minimum length (HEADER0 HEADER1 HEADER2 RESERVED ID LENGTH_L LENGTH_H INST ERROR CRC16_L CRC16_H)
-
-        while True:
-            rxpacket.extend(port.readPort(wait_length - rx_length))     # entend 函数扩充数据包
-            rx_length = len(rxpacket)
-            if rx_length >= wait_length:
-                # find packet header
-                for idx in range(0, (rx_length - 3)):   # 寻找帧头
-                    if (rxpacket[idx] == 0xFF) and (rxpacket[idx + 1] == 0xFF) and (rxpacket[idx + 2] == 0xFD) and (
-                            rxpacket[idx + 3] != 0xFD):
-                        break
-
-                if idx == 0:
-                    if (rxpacket[PKT_RESERVED] != 0x00) or (rxpacket[PKT_ID] > 0xFC) or (
-                            DXL_MAKEWORD(rxpacket[PKT_LENGTH_L], rxpacket[PKT_LENGTH_H]) > RXPACKET_MAX_LEN) or (
-                            rxpacket[PKT_INSTRUCTION] != 0x55):
-                        # remove the first byte in the packet   移除首个字节
-                        del rxpacket[0]
-                        rx_length -= 1
-                        continue
-
-                    if wait_length != (DXL_MAKEWORD(rxpacket[PKT_LENGTH_L], rxpacket[PKT_LENGTH_H]) + PKT_LENGTH_H + 1):
-                        wait_length = DXL_MAKEWORD(rxpacket[PKT_LENGTH_L], rxpacket[PKT_LENGTH_H]) + PKT_LENGTH_H + 1
-                        continue
-
-                    if rx_length < wait_length:     # 接收长度小于目标长度
-                        if port.isPacketTimeout():
-                            if rx_length == 0:
-                                result = COMM_RX_TIMEOUT    # 超时
-                            else:
-                                result = COMM_RX_CORRUPT
-                            break
-                        else:
-                            continue
-
-                    crc = DXL_MAKEWORD(rxpacket[wait_length - 2], rxpacket[wait_length - 1])    # 读取 CRC 校验码
-
-                    if self.updateCRC(0, rxpacket, wait_length - 2) == crc:     # 校验数据包
-                        result = COMM_SUCCESS
-                    else:
-                        result = COMM_RX_CORRUPT    # 接收状态包错误
-                    break
-
-                else:
-                    # remove unnecessary packets    移除非重要的数据包
-                    del rxpacket[0: idx]
-                    rx_length -= idx
-
-            else:
-                if port.isPacketTimeout():  # 超时
-                    if rx_length == 0:
-                        result = COMM_RX_TIMEOUT
-                    else:
-                        result = COMM_RX_CORRUPT
-                    break
-
-        port.is_using = False
-
-        if result == COMM_SUCCESS:
-            rxpacket = self.removeStuffing(rxpacket)
+        if receiver.result == COMM_SUCCESS:
+            return receiver.status.packet, receiver.result
 
-        return rxpacket, result
+        return receiver.parser.getRxData(), receiver.result
 
     # NOT for BulkRead / SyncRead instruction
-    def txRxPacket(self, port, txpacket):
-        rxpacket = None
-        error = 0
-
+    def txRequestPacket(self, port, txpacket):
+        """
+        Transmit an instruction packet and set the timeout of its status packet
+        :return: 通信状态, 是否需要接收状态包
+        """
         # tx packet 发送部分
         result = self.txPacket(port, txpacket)
         if result != COMM_SUCCESS:
-            return rxpacket, result, error
+            return result, False
 
         # (Instruction == BulkRead or SyncRead) == this function is not available.  不支持 Bulk 和 Sync
-        if txpacket[PKT_INSTRUCTION] == INST_BULK_READ or txpacket[PKT_INSTRUCTION] == INST_SYNC_READ:
+        if txpacket[PKT_INSTRUCTION] in (INST_BULK_READ, INST_SYNC_READ, INST_FAST_SYNC_READ, INST_FAST_BULK_READ):
             result = COMM_NOT_AVAILABLE
 
         # (ID == Broadcast ID) == no need to wait for status packet or not available.
         # (Instruction == action) == no need to wait for status packet
         if txpacket[PKT_ID] == BROADCAST_ID or txpacket[PKT_INSTRUCTION] == INST_ACTION:
-            port.is_using = False
-            return rxpacket, result, error
+            port.releaseBus()
+            return result, False
 
         # set packet timeout
         if txpacket[PKT_INSTRUCTION] == INST_READ:
-            port.setPacketTimeout(DXL_MAKEWORD(txpacket[PKT_PARAMETER0 + 2], txpacket[PKT_PARAMETER0 + 3]) + 11)
+            port.setPacketTimeoutFor(txpacket[PKT_ID],
+                                     DXL_MAKEWORD(txpacket[PKT_PARAMETER0 + 2], txpacket[PKT_PARAMETER0 + 3]) + 11)
         else:
-            port.setPacketTimeout(11)
+            port.setPacketTimeoutFor(txpacket[PKT_ID], 11)
             # HEADER0 HEADER1 HEADER2 RESERVED ID LENGTH_L LENGTH_H INST ERROR CRC16_L CRC16_H
 
+        return result, True
+
+    # NOT for BulkRead / SyncRead instruction
+    def txRxPacket(self, port, txpacket):
+        rxpacket = None
+        error = 0
+
+        result, is_status_expected = self.txRequestPacket(port, txpacket)
+        if not is_status_expected:
+            return rxpacket, result, error
+
         # rx packet 接收部分
         while True:
             rxpacket, result = self.rxPacket(port)
@@ -377,17 +513,14 @@ class Protocol2PacketHandler(object):
         model_number = 0
         error = 0
 
-        txpacket = [0] * 10
-
         if dxl_id >= BROADCAST_ID:  # 设备 ID 大于广播 ID 错误
             return model_number, COMM_NOT_AVAILABLE, error
 
-        txpacket[PKT_ID] = dxl_id   # 设置设备 ID
-        txpacket[PKT_LENGTH_L] = 3  # No parameter   INST+CRC = 3
-        txpacket[PKT_LENGTH_H] = 0
-        txpacket[PKT_INSTRUCTION] = INST_PING   # ping 指令
+        txpacket = self.makePingPacket(dxl_id)
 
         rxpacket, result, error = self.txRxPacket(port, txpacket)   # 发送数据包
+        if port.health_tracker is not None:
+            port.health_tracker.reportResult(dxl_id, result)
         if result == COMM_SUCCESS:
             model_number = DXL_MAKEWORD(rxpacket[PKT_PARAMETER0 + 1], rxpacket[PKT_PARAMETER0 + 2]) # 解码
 
@@ -401,29 +534,14 @@ class Protocol2PacketHandler(object):
         """
         data_list = {}
 
-        STATUS_LENGTH = 14  # 状态包长度
-
         rx_length = 0
-        wait_length = STATUS_LENGTH * MAX_ID
-
-        txpacket = [0] * 10 # 发送数据长度
-        rxpacket = []
-
-        tx_time_per_byte = (1000.0 / port.getBaudRate()) *10.0; # 单位时间发送速度
-
-        txpacket[PKT_ID] = BROADCAST_ID
-        txpacket[PKT_LENGTH_L] = 3
-        txpacket[PKT_LENGTH_H] = 0
-        txpacket[PKT_INSTRUCTION] = INST_PING
+        rxpacket = bytearray()
 
-        result = self.txPacket(port, txpacket)
+        result = self.txPacket(port, self.makePingPacket(BROADCAST_ID))
         if result != COMM_SUCCESS:  # 发送失败
-            port.is_using = False
             return data_list, result
 
-        # set rx timeout    设置接收超时
-        #port.setPacketTimeout(wait_length * 1)
-        port.setPacketTimeoutMillis((wait_length * tx_time_per_byte) + (3.0 * MAX_ID) + 16.0);
+        wait_length = self.setBroadcastPingTimeout(port)
 
         while True:
             rxpacket += port.readPort(wait_length - rx_length)
@@ -432,61 +550,61 @@ class Protocol2PacketHandler(object):
             if port.isPacketTimeout():  # or rx_length >= wait_length
                 break
 
-        port.is_using = False
+            port.waitForData()
 
-        if rx_length == 0:  # 接收超时
-            return data_list, COMM_RX_TIMEOUT
-
-        while True:
-            if rx_length < STATUS_LENGTH:   # 状态包错误
-                return data_list, COMM_RX_CORRUPT
+        port.releaseBus()
 
-            # find packet header    寻找帧头
-            for idx in range(0, rx_length - 2):
-                if rxpacket[idx] == 0xFF and rxpacket[idx + 1] == 0xFF and rxpacket[idx + 2] == 0xFD:
-                    break
+        return self.parseBroadcastPingPacket(rxpacket)
 
-            if idx == 0:  # found at the beginning of the packet
-                # verify CRC16
-                crc = DXL_MAKEWORD(rxpacket[STATUS_LENGTH - 2], rxpacket[STATUS_LENGTH - 1])
+    def setBroadcastPingTimeout(self, port):
+        """
+        Wait for the status packets of all IDs
+        :return: 最大接收长度
+        """
+        wait_length = BROADCAST_PING_STATUS_LENGTH * MAX_ID
 
-                if self.updateCRC(0, rxpacket, STATUS_LENGTH - 2) == crc:
-                    result = COMM_SUCCESS
+        tx_time_per_byte = (1000.0 / port.getBaudRate()) *10.0; # 单位时间发送速度
 
-                    data_list[rxpacket[PKT_ID]] = [
-                        DXL_MAKEWORD(rxpacket[PKT_PARAMETER0 + 1], rxpacket[PKT_PARAMETER0 + 2]),
-                        rxpacket[PKT_PARAMETER0 + 3]]
+        # set rx timeout    设置接收超时
+        #port.setPacketTimeout(wait_length * 1)
+        port.setPacketTimeoutMillis((wait_length * tx_time_per_byte) + (3.0 * MAX_ID) + port.getLatencyTimer())
 
-                    del rxpacket[0: STATUS_LENGTH]
-                    rx_length = rx_length - STATUS_LENGTH
+        return wait_length
 
-                    if rx_length == 0:
-                        return data_list, result
+    def parseBroadcastPingPacket(self, rxpacket):
+        """
+        :return: {dxl_id: [model_number, firmware_version]}, 通信状态
+        """
+        data_list = {}
+        STATUS_LENGTH = BROADCAST_PING_STATUS_LENGTH  # 状态包长度
 
-                else:
-                    result = COMM_RX_CORRUPT
+        rx_length = len(rxpacket)
+        if rx_length == 0:  # 接收超时
+            return data_list, COMM_RX_TIMEOUT
 
-                    # remove header (0xFF 0xFF 0xFD)
-                    del rxpacket[0: 3]
-                    rx_length = rx_length - 3
+        # 状态包首尾相接时批量校验 CRC，否则逐包解析
+        if rx_length % STATUS_LENGTH == 0:
+            packets = [rxpacket[idx: idx + STATUS_LENGTH] for idx in range(0, rx_length, STATUS_LENGTH)]
+            if all(packet.startswith(b'\xff\xff\xfd') for packet in packets) and all(verifyCRCBatch(packets)):
+                for packet in packets:
+                    data_list[packet[PKT_ID]] = [
+                        DXL_MAKEWORD(packet[PKT_PARAMETER0 + 1], packet[PKT_PARAMETER0 + 2]),
+                        packet[PKT_PARAMETER0 + 3]]
 
-            else:
-                # remove unnecessary packets
-                del rxpacket[0: idx]
-                rx_length = rx_length - idx
+                return data_list, COMM_SUCCESS
 
-        # FIXME: unreachable code
-        return data_list, result
+        parser = Protocol2StatusParser()
+        for status in parser.feed(rxpacket):
+            if len(status.params) >= 3:
+                data_list[status.id] = [DXL_MAKEWORD(status.params[0], status.params[1]), status.params[2]]
 
-    def action(self, port, dxl_id):
-        txpacket = [0] * 10
+        if not data_list or parser.getRxLength() != 0:  # 存在不完整或校验失败的数据
+            return data_list, COMM_RX_CORRUPT
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = 3
-        txpacket[PKT_LENGTH_H] = 0
-        txpacket[PKT_INSTRUCTION] = INST_ACTION
+        return data_list, COMM_SUCCESS
 
-        _, result, _ = self.txRxPacket(port, txpacket)
+    def action(self, port, dxl_id):
+        _, result, _ = self.txRxPacket(port, self.makeActionPacket(dxl_id))
         return result
 
     def reboot(self, port, dxl_id):
@@ -496,46 +614,15 @@ class Protocol2PacketHandler(object):
         :param dxl_id: 设备 ID
         :return: 返回执行结果，错误
         """
-        txpacket = [0] * 10
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = 3
-        txpacket[PKT_LENGTH_H] = 0
-        txpacket[PKT_INSTRUCTION] = INST_REBOOT
-
-        _, result, error = self.txRxPacket(port, txpacket)
+        _, result, error = self.txRxPacket(port, self.makeRebootPacket(dxl_id))
         return result, error
 
     def clearMultiTurn(self, port, dxl_id):     # 重置多圈旋转信息
-        txpacket = [0] * 15
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = 8
-        txpacket[PKT_LENGTH_H] = 0
-        txpacket[PKT_INSTRUCTION] = INST_CLEAR
-        txpacket[PKT_PARAMETER0 + 0] = 0x01
-        txpacket[PKT_PARAMETER0 + 1] = 0x44
-        txpacket[PKT_PARAMETER0 + 2] = 0x58
-        txpacket[PKT_PARAMETER0 + 3] = 0x4C
-        txpacket[PKT_PARAMETER0 + 4] = 0x22
-
-        _, result, error = self.txRxPacket(port, txpacket)
+        _, result, error = self.txRxPacket(port, self.makeClearMultiTurnPacket(dxl_id))
         return result, error
 
     def factoryReset(self, port, dxl_id, option):
-        txpacket = [0] * 11
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = 4
-        txpacket[PKT_LENGTH_H] = 0
-        txpacket[PKT_INSTRUCTION] = INST_FACTORY_RESET
-        # 回复出厂值参数
-        # 0xFF resetall
-        # 0x01 重置期望ID
-        # 0x02 重置期望 ID 与波特率
-        txpacket[PKT_PARAMETER0] = option
-
-        _, result, error = self.txRxPacket(port, txpacket)
+        _, result, error = self.txRxPacket(port, self.makeFactoryResetPacket(dxl_id, option))
         return result, error
 
     def readTx(self, port, dxl_id, address, length):
@@ -547,34 +634,25 @@ class Protocol2PacketHandler(object):
         :param length: 数据长度
         :return: 通信状态
         """
-        txpacket = [0] * 14
-
         if dxl_id >= BROADCAST_ID:
             return COMM_NOT_AVAILABLE
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = 7  # INST+CRC+Parameter 1+2+4
-        txpacket[PKT_LENGTH_H] = 0
-        txpacket[PKT_INSTRUCTION] = INST_READ
-        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(address)  # 地址低位
-        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(address)  # 地址高位
-        txpacket[PKT_PARAMETER0 + 2] = DXL_LOBYTE(length)   # 长度低位
-        txpacket[PKT_PARAMETER0 + 3] = DXL_HIBYTE(length)   # 长度高位
+        txpacket = self.makeReadPacket(dxl_id, address, length)
 
         result = self.txPacket(port, txpacket)
 
         # set packet timeout
         if result == COMM_SUCCESS:
-            port.setPacketTimeout(length + 11)
+            port.setPacketTimeoutFor(dxl_id, length + 11)
 
         return result
 
-    def readRx(self, port, dxl_id, length):
+    def readRxBuffer(self, port, dxl_id, length):
         result = COMM_TX_FAIL
         error = 0
 
         rxpacket = None
-        data = []
+        data = EMPTY_DATA
 
         while True:
             rxpacket, result = self.rxPacket(port)
@@ -585,46 +663,52 @@ class Protocol2PacketHandler(object):
         if result == COMM_SUCCESS and rxpacket[PKT_ID] == dxl_id:
             error = rxpacket[PKT_ERROR]
 
-            data.extend(rxpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length]) # 获取读取结果
+            data = byteView(rxpacket)[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length] # 获取读取结果
 
         return data, result, error
 
-    def readTxRx(self, port, dxl_id, address, length):
+    def readTxRxBuffer(self, port, dxl_id, address, length):
         error = 0
 
-        txpacket = [0] * 14
-        data = []
+        data = EMPTY_DATA
 
         if dxl_id >= BROADCAST_ID:
             return data, COMM_NOT_AVAILABLE, error
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = 7
-        txpacket[PKT_LENGTH_H] = 0
-        txpacket[PKT_INSTRUCTION] = INST_READ
-        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(address)
-        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(address)
-        txpacket[PKT_PARAMETER0 + 2] = DXL_LOBYTE(length)
-        txpacket[PKT_PARAMETER0 + 3] = DXL_HIBYTE(length)
+        health_tracker = port.health_tracker
+        if health_tracker is not None and not health_tracker.isReachable(dxl_id):   # 已隔离的设备
+            return data, COMM_NOT_AVAILABLE, error
+
+        txpacket = self.makeReadPacket(dxl_id, address, length)
 
         rxpacket, result, error = self.txRxPacket(port, txpacket)
+        if health_tracker is not None:
+            health_tracker.reportResult(dxl_id, result)
         if result == COMM_SUCCESS:
             error = rxpacket[PKT_ERROR]
 
-            data.extend(rxpacket[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length])
+            data = byteView(rxpacket)[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + length]
 
         return data, result, error
 
+    def readRx(self, port, dxl_id, length):
+        data, result, error = self.readRxBuffer(port, dxl_id, length)
+        return list(data), result, error
+
+    def readTxRx(self, port, dxl_id, address, length):
+        data, result, error = self.readTxRxBuffer(port, dxl_id, address, length)
+        return list(data), result, error
+
     def read1ByteTx(self, port, dxl_id, address):
         return self.readTx(port, dxl_id, address, 1)
 
     def read1ByteRx(self, port, dxl_id):
-        data, result, error = self.readRx(port, dxl_id, 1)
+        data, result, error = self.readRxBuffer(port, dxl_id, 1)
         data_read = data[0] if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
     def read1ByteTxRx(self, port, dxl_id, address):
-        data, result, error = self.readTxRx(port, dxl_id, address, 1)
+        data, result, error = self.readTxRxBuffer(port, dxl_id, address, 1)
         data_read = data[0] if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
@@ -632,12 +716,12 @@ class Protocol2PacketHandler(object):
         return self.readTx(port, dxl_id, address, 2)
 
     def read2ByteRx(self, port, dxl_id):
-        data, result, error = self.readRx(port, dxl_id, 2)
+        data, result, error = self.readRxBuffer(port, dxl_id, 2)
         data_read = DXL_MAKEWORD(data[0], data[1]) if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
     def read2ByteTxRx(self, port, dxl_id, address):
-        data, result, error = self.readTxRx(port, dxl_id, address, 2)
+        data, result, error = self.readTxRxBuffer(port, dxl_id, address, 2)
         data_read = DXL_MAKEWORD(data[0], data[1]) if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
@@ -645,45 +729,34 @@ class Protocol2PacketHandler(object):
         return self.readTx(port, dxl_id, address, 4)
 
     def read4ByteRx(self, port, dxl_id):
-        data, result, error = self.readRx(port, dxl_id, 4)
+        data, result, error = self.readRxBuffer(port, dxl_id, 4)
         data_read = DXL_MAKEDWORD(DXL_MAKEWORD(data[0], data[1]),
                                   DXL_MAKEWORD(data[2], data[3])) if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
     def read4ByteTxRx(self, port, dxl_id, address):
-        data, result, error = self.readTxRx(port, dxl_id, address, 4)
+        data, result, error = self.readTxRxBuffer(port, dxl_id, address, 4)
         data_read = DXL_MAKEDWORD(DXL_MAKEWORD(data[0], data[1]),
                                   DXL_MAKEWORD(data[2], data[3])) if (result == COMM_SUCCESS) else 0
         return data_read, result, error
 
     def writeTxOnly(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 12)
+        if port.write_batch is not None and port.write_batch.addWrite(self, dxl_id, address, length, data):
+            return COMM_SUCCESS     # 由 WriteBatch 合并发送
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
-        txpacket[PKT_LENGTH_H] = DXL_HIBYTE(length + 5)
-        txpacket[PKT_INSTRUCTION] = INST_WRITE
-        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(address)
-        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(address)
-
-        txpacket[PKT_PARAMETER0 + 2: PKT_PARAMETER0 + 2 + length] = data[0: length] # 写入数据
+        txpacket = self.makeWritePacket(dxl_id, address, length, data)
 
         result = self.txPacket(port, txpacket)
-        port.is_using = False
+        port.releaseBus()
 
         return result
 
     def writeTxRx(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 12)
+        if port.write_batch is not None and port.write_batch.isBatching():
+            return COMM_NOT_AVAILABLE, 0    # 合并后的写入没有状态包，WriteBatch 中请使用 write*TxOnly
 
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
-        txpacket[PKT_LENGTH_H] = DXL_HIBYTE(length + 5)
-        txpacket[PKT_INSTRUCTION] = INST_WRITE
-        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(address)
-        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(address)
+        txpacket = self.makeWritePacket(dxl_id, address, length, data)
 
-        txpacket[PKT_PARAMETER0 + 2: PKT_PARAMETER0 + 2 + length] = data[0: length]
         rxpacket, result, error = self.txRxPacket(port, txpacket)
 
         return result, error
@@ -719,40 +792,22 @@ class Protocol2PacketHandler(object):
         return self.writeTxRx(port, dxl_id, address, 4, data_write)
 
     def regWriteTxOnly(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 12)
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
-        txpacket[PKT_LENGTH_H] = DXL_HIBYTE(length + 5)
-        txpacket[PKT_INSTRUCTION] = INST_REG_WRITE
-        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(address)
-        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(address)
-
-        txpacket[PKT_PARAMETER0 + 2: PKT_PARAMETER0 + 2 + length] = data[0: length]
+        txpacket = self.makeWritePacket(dxl_id, address, length, data, INST_REG_WRITE)
 
         result = self.txPacket(port, txpacket)
-        port.is_using = False
+        port.releaseBus()
 
         return result
 
     def regWriteTxRx(self, port, dxl_id, address, length, data):
-        txpacket = [0] * (length + 12)
-
-        txpacket[PKT_ID] = dxl_id
-        txpacket[PKT_LENGTH_L] = DXL_LOBYTE(length + 5)
-        txpacket[PKT_LENGTH_H] = DXL_HIBYTE(length + 5)
-        txpacket[PKT_INSTRUCTION] = INST_REG_WRITE
-        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(address)
-        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(address)
-
-        txpacket[PKT_PARAMETER0 + 2: PKT_PARAMETER0 + 2 + length] = data[0: length]
+        txpacket = self.makeWritePacket(dxl_id, address, length, data, INST_REG_WRITE)
 
         _, result, error = self.txRxPacket(port, txpacket)
 
         return result, error
 
     def syncReadTx(self, port, start_address, data_length, param, param_length):
-        txpacket = [0] * (param_length + 14)
+        txpacket = bytearray(param_length + 14)
         # 14: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST START_ADDR_L START_ADDR_H DATA_LEN_L DATA_LEN_H CRC16_L CRC16_H
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -770,12 +825,132 @@ class Protocol2PacketHandler(object):
 
         result = self.txPacket(port, txpacket)
         if result == COMM_SUCCESS:
-            port.setPacketTimeout((11 + data_length) * param_length)
+            port.setPacketTimeoutFor((INST_SYNC_READ, tuple(param[0: param_length])),
+                                     (11 + data_length) * param_length)
+
+        return result
+
+    def fastSyncReadTx(self, port, start_address, data_length, param, param_length):
+        txpacket = bytearray(param_length + 14)
+        # 14: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST START_ADDR_L START_ADDR_H DATA_LEN_L DATA_LEN_H CRC16_L CRC16_H
+
+        txpacket[PKT_ID] = BROADCAST_ID
+        txpacket[PKT_LENGTH_L] = DXL_LOBYTE(param_length + 7)
+        txpacket[PKT_LENGTH_H] = DXL_HIBYTE(param_length + 7)
+        txpacket[PKT_INSTRUCTION] = INST_FAST_SYNC_READ
+        txpacket[PKT_PARAMETER0 + 0] = DXL_LOBYTE(start_address)
+        txpacket[PKT_PARAMETER0 + 1] = DXL_HIBYTE(start_address)
+        txpacket[PKT_PARAMETER0 + 2] = DXL_LOBYTE(data_length)
+        txpacket[PKT_PARAMETER0 + 3] = DXL_HIBYTE(data_length)
+
+        txpacket[PKT_PARAMETER0 + 4: PKT_PARAMETER0 + 4 + param_length] = param[0: param_length]
+
+        result = self.txPacket(port, txpacket)
+        if result == COMM_SUCCESS:
+            # 8: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST, 4: ERR ID CRC16_L CRC16_H per device
+            port.setPacketTimeoutFor((INST_FAST_SYNC_READ, tuple(param[0: param_length])),
+                                     8 + (data_length + 4) * param_length)
 
         return result
 
+    def fastReadRx(self, port, data_lengths):
+        """
+        Receive the combined status packet of Fast Sync Read / Fast Bulk Read
+        :param port: 端口
+        :param data_lengths: 按请求顺序排列的各设备数据长度
+        :return: {dxl_id: [data, error]}, 通信状态
+        """
+        rxpacket, result = self.rxPacket(port)
+        if result != COMM_SUCCESS:
+            return {}, result
+
+        return self.parseFastReadPacket(rxpacket, data_lengths)
+
+    def parseFastReadPacket(self, rxpacket, data_lengths):
+        data_list = {}
+
+        # ERR ID DATA... CRC16_L CRC16_H 依次排列，最后一个 CRC 为整个数据包的 CRC
+        packet_length = DXL_MAKEWORD(rxpacket[PKT_LENGTH_L], rxpacket[PKT_LENGTH_H])
+        if rxpacket[PKT_ID] != BROADCAST_ID or packet_length != 1 + sum(data_lengths) + 4 * len(data_lengths):
+            return data_list, COMM_RX_CORRUPT
+
+        rxdata = byteView(rxpacket)
+        idx = PKT_ERROR
+        for length in data_lengths:
+            data_list[rxpacket[idx + 1]] = [rxdata[idx + 2: idx + 2 + length], rxpacket[idx]]
+            idx += length + 4
+
+        return data_list, COMM_SUCCESS
+
+    def readRxMulti(self, port, data_lengths):
+        """
+        Receive all status packets of Sync Read / Bulk Read in one receive window
+        :param port: 端口
+        :param data_lengths: {dxl_id: data_length}
+        :return: {dxl_id: StatusPacket}, 通信状态 (所有设备均应答时为 COMM_SUCCESS)
+        """
+        # 同一个解析器连续解析多个数据包，单个设备失败不影响其他设备
+        receiver = receiveStatus(port, StatusReceiver(Protocol2StatusParser(), data_lengths))
+        return receiver.status_list, receiver.result
+
+    def rxStatusPoll(self, port, dxl_id=None):
+        """
+        Non-blocking receive of one status packet
+        :param dxl_id: 跳过其他设备的状态包，None 时不过滤
+        :return: StatusPacket, 通信状态 (数据尚未接收完成时为 COMM_RX_WAITING)
+        """
+        receiver = pollStatus(port, lambda: StatusReceiver(Protocol2StatusParser(), dxl_id=dxl_id))
+        if not receiver.is_done:    # 暂无新数据，下次调用时继续
+            return None, COMM_RX_WAITING
+
+        return receiver.status, receiver.result
+
+    def rxPacketPoll(self, port):
+        """
+        Non-blocking rxPacket, call repeatedly until the result is not COMM_RX_WAITING
+        :return: 数据包, 通信状态
+        """
+        status, result = self.rxStatusPoll(port)
+        if result == COMM_SUCCESS:
+            return status.packet, result
+
+        return bytearray(), result
+
+    def readRxPoll(self, port, dxl_id, length):
+        """
+        Non-blocking readRx
+        :return: 数据, 通信状态 (数据尚未接收完成时为 COMM_RX_WAITING), 错误
+        """
+        status, result = self.rxStatusPoll(port, dxl_id)
+        if result != COMM_SUCCESS:
+            return [], result, 0
+
+        return list(status.params[0: length]), result, status.error
+
+    def readRxMultiPoll(self, port, data_lengths):
+        """
+        Non-blocking readRxMulti
+        :return: {dxl_id: StatusPacket} (已收到的部分), 通信状态 (数据尚未接收完成时为 COMM_RX_WAITING)
+        """
+        receiver = pollStatus(port, lambda: StatusReceiver(Protocol2StatusParser(), data_lengths))
+        if not receiver.is_done:    # 暂无新数据，下次调用时继续
+            return receiver.status_list, COMM_RX_WAITING
+
+        return receiver.status_list, receiver.result
+
+    def fastReadRxPoll(self, port, data_lengths):
+        """
+        Non-blocking fastReadRx
+        :return: {dxl_id: [data, error]}, 通信状态 (数据尚未接收完成时为 COMM_RX_WAITING)
+        """
+        status, result = self.rxStatusPoll(port)
+        if result != COMM_SUCCESS:
+            return {}, result
+
+        return self.parseFastReadPacket(status.packet, data_lengths)
+
     def syncWriteTxOnly(self, port, start_address, data_length, param, param_length):
-        txpacket = [0] * (param_length + 14)
+        txpacket = bytearray(param_length + 14)
         # 14: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST START_ADDR_L START_ADDR_H DATA_LEN_L DATA_LEN_H CRC16_L CRC16_H
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -796,7 +971,7 @@ class Protocol2PacketHandler(object):
         return result
 
     def bulkReadTx(self, port, param, param_length):
-        txpacket = [0] * (param_length + 10)
+        txpacket = bytearray(param_length + 10)
         # 10: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST CRC16_L CRC16_H
 
         txpacket[PKT_ID] = BROADCAST_ID
@@ -813,12 +988,35 @@ class Protocol2PacketHandler(object):
             while i < param_length:
                 wait_length += DXL_MAKEWORD(param[i + 3], param[i + 4]) + 10
                 i += 5
-            port.setPacketTimeout(wait_length)
+            port.setPacketTimeoutFor((INST_BULK_READ, tuple(param[0: param_length])), wait_length)
+
+        return result
+
+    def fastBulkReadTx(self, port, param, param_length):
+        txpacket = bytearray(param_length + 10)
+        # 10: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST CRC16_L CRC16_H
+
+        txpacket[PKT_ID] = BROADCAST_ID
+        txpacket[PKT_LENGTH_L] = DXL_LOBYTE(param_length + 3)  # 3: INST CRC16_L CRC16_H
+        txpacket[PKT_LENGTH_H] = DXL_HIBYTE(param_length + 3)  # 3: INST CRC16_L CRC16_H
+        txpacket[PKT_INSTRUCTION] = INST_FAST_BULK_READ
+
+        txpacket[PKT_PARAMETER0: PKT_PARAMETER0 + param_length] = param[0: param_length]
+
+        result = self.txPacket(port, txpacket)
+        if result == COMM_SUCCESS:
+            # 8: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST, 4: ERR ID CRC16_L CRC16_H per device
+            wait_length = 8
+            i = 0
+            while i < param_length:
+                wait_length += DXL_MAKEWORD(param[i + 3], param[i + 4]) + 4
+                i += 5
+            port.setPacketTimeoutFor((INST_FAST_BULK_READ, tuple(param[0: param_length])), wait_length)
 
         return result
 
     def bulkWriteTxOnly(self, port, param, param_length):
-        txpacket = [0] * (param_length + 10)
+        txpacket = bytearray(param_length + 10)
         # 10: HEADER0 HEADER1 HEADER2 RESERVED ID LEN_L LEN_H INST CRC16_L CRC16_H
 
         txpacket[PKT_ID] = BROADCAST_ID
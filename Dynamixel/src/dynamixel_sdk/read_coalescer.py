@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 合并读取：多个线程在同一时间窗口内的单次读取合并为一次 Sync Read / Bulk Read
+# 窗口内的第一个请求负责在窗口结束时执行读取，其余请求等待结果
+
+import threading
+import time
+
+from .robotis_def import *
+from .group_sync_read import GroupSyncRead
+from .group_bulk_read import GroupBulkRead, PARAM_NUM_DATA
+
+COALESCE_WINDOW = 1.0       # 合并窗口 (ms)
+
+
+def mergeReadWindows(requests):
+    """
+    :param requests: [(ids, address, length), ...]
+    :return: {dxl_id: [start_address, end_address]}，每个设备覆盖全部请求的最小区域
+    """
+    windows = {}
+    for ids, address, length in requests:
+        for dxl_id in ids:
+            window = windows.setdefault(dxl_id, [address, address + length])
+            window[0] = min(window[0], address)
+            window[1] = max(window[1], address + length)
+
+    return windows
+
+
+def makeMergedRead(port, ph, windows):
+    # 所有设备区域相同时使用 Sync Read，否则使用 Bulk Read (Protocol 1.0 只支持 Bulk Read)
+    bounds = set(tuple(window) for window in windows.values())
+    if ph.getProtocolVersion() != 1.0 and len(bounds) == 1:
+        start, end = bounds.pop()
+        group = GroupSyncRead(port, ph, start, end - start)
+        for dxl_id in windows:
+            group.addParam(dxl_id)
+    else:
+        group = GroupBulkRead(port, ph)
+        for dxl_id, (start, end) in windows.items():
+            group.addParam(dxl_id, start, end - start)
+
+    return group
+
+
+def getMergedData(group, windows, dxl_id, address, length):
+    """
+    :return: 数据, 通信状态, 错误, 数据时刻 (ns)
+    """
+    if group is None or dxl_id not in windows:
+        return bytearray(), COMM_NOT_AVAILABLE, 0, 0
+
+    result, error, timestamp = group.getRxResult(dxl_id)
+    data = group.data_dict[dxl_id]
+    if isinstance(group, GroupBulkRead):
+        data = data[PARAM_NUM_DATA]
+
+    offset = address - windows[dxl_id][0]
+    data = bytearray(data[offset: offset + length])
+    if len(data) < length and result == COMM_SUCCESS:
+        result = COMM_RX_CORRUPT
+
+    return data, result, error, timestamp
+
+
+class ReadFuture(object):
+    def __init__(self, dxl_id, address, length):
+        self.dxl_id = dxl_id
+        self.address = address
+        self.length = length
+
+        self.data = []
+        self.result = COMM_NOT_AVAILABLE
+        self.error = 0
+        self.done_event = threading.Event()
+
+    def setResult(self, data, result, error):
+        self.data = list(data)
+        self.result = result
+        self.error = error
+        self.done_event.set()
+
+    def isDone(self):
+        return self.done_event.is_set()
+
+    def wait(self, timeout=None):   # ms
+        """
+        :return: 数据, 通信状态, 错误
+        """
+        if not self.done_event.wait(None if timeout is None else timeout / 1000.0):
+            return [], COMM_RX_TIMEOUT, 0
+
+        return self.data, self.result, self.error
+
+
+class ReadCoalescer(object):
+    def __init__(self, port, ph, window=COALESCE_WINDOW):
+        self.port = port
+        self.ph = ph
+        self.window = window
+
+        self.lock = threading.Lock()
+        self.pending = []       # 当前窗口内的 ReadFuture
+
+        self.flush_count = 0    # 实际执行的读取次数
+        self.request_count = 0
+
+    def setWindow(self, window):    # ms, 0 时不等待其他请求
+        self.window = window
+
+    def getWindow(self):
+        return self.window
+
+    def enqueue(self, dxl_id, address, length):
+        # 返回 ReadFuture, 是否为窗口内的第一个请求
+        future = ReadFuture(dxl_id, address, length)
+        with self.lock:
+            self.pending.append(future)
+            self.request_count += 1
+            return future, len(self.pending) == 1
+
+    def submit(self, dxl_id, address, length):
+        """
+        Queue a read without blocking
+        :return: ReadFuture, 用 future.wait() 获取 (数据, 通信状态, 错误)
+        """
+        future, is_leader = self.enqueue(dxl_id, address, length)
+        if is_leader:
+            timer = threading.Timer(self.window / 1000.0, self.flush)
+            timer.daemon = True
+            timer.start()
+        return future
+
+    def read(self, dxl_id, address, length):
+        """
+        :return: 数据, 通信状态, 错误 (与 readTxRx 相同)
+        """
+        future, is_leader = self.enqueue(dxl_id, address, length)
+        if is_leader:
+            if self.window > 0:
+                time.sleep(self.window / 1000.0)
+            self.flush()
+
+        return future.wait()
+
+    def read1Byte(self, dxl_id, address):
+        data, result, error = self.read(dxl_id, address, 1)
+        data_read = data[0] if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    def read2Byte(self, dxl_id, address):
+        data, result, error = self.read(dxl_id, address, 2)
+        data_read = DXL_MAKEWORD(data[0], data[1]) if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    def read4Byte(self, dxl_id, address):
+        data, result, error = self.read(dxl_id, address, 4)
+        data_read = DXL_MAKEDWORD(DXL_MAKEWORD(data[0], data[1]),
+                                  DXL_MAKEWORD(data[2], data[3])) if (result == COMM_SUCCESS) else 0
+        return data_read, result, error
+
+    def flush(self):
+        # 执行当前窗口内的全部读取
+        with self.lock:
+            futures, self.pending = self.pending, []
+
+        if not futures:
+            return
+
+        self.flush_count += 1
+
+        try:
+            self.readFutures(futures)
+        except Exception:
+            # 读取过程中出现异常时其他线程不再等待
+            for future in futures:
+                if not future.isDone():
+                    future.setResult([], COMM_TX_FAIL, 0)
+            raise
+
+    def readFutures(self, futures):
+        # 只有一个设备的一个请求时使用普通读取
+        if len(futures) == 1:
+            future = futures[0]
+            data, result, error = self.ph.readTxRx(self.port, future.dxl_id, future.address, future.length)
+            future.setResult(data, result, error)
+            return
+
+        windows = mergeReadWindows([([future.dxl_id], future.address, future.length) for future in futures])
+        group = makeMergedRead(self.port, self.ph, windows)
+        group.txRxPacket()
+
+        for future in futures:
+            data, result, error, _ = getMergedData(group, windows, future.dxl_id, future.address, future.length)
+            future.setResult(data, result, error if result == COMM_SUCCESS else 0)
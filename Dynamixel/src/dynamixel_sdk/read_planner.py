@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 读取规划：根据需要读取的 (ID, 地址, 长度) 计算各种读取方式的总线字节数与时间，
+# 选择最快的方式执行，并缓存到请求或波特率变化为止
+
+from .robotis_def import *
+from .group_sync_read import GroupSyncRead
+from .group_bulk_read import GroupBulkRead
+from .read_coalescer import mergeReadWindows, getMergedData
+
+READ_PLAN_PER_ID = 0        # 每个设备一次 Read
+READ_PLAN_SYNC = 1          # Sync Read，所有设备读取合并后的同一区域
+READ_PLAN_BULK = 2          # Bulk Read，每个设备读取各自的区域
+READ_PLAN_FAST_SYNC = 3     # Fast Sync Read
+READ_PLAN_FAST_BULK = 4     # Fast Bulk Read
+
+# 数据包固定部分的长度 (不含参数)
+P1_PACKET_OVERHEAD = 6      # FF FF ID LEN INST/ERR CHKSUM
+P2_PACKET_OVERHEAD = 10     # FF FF FD 00 ID LEN_L LEN_H INST CRC_L CRC_H
+P2_STATUS_OVERHEAD = 11     # 状态包多一个 ERR
+
+TRANSACTION_OVERHEAD = 0.5  # 每次通信的固定开销 (ms)：USB 延迟、处理时间
+STATUS_DELAY = 0.0          # 每个状态包的返回延迟 (ms)，对应设备的 Return Delay Time
+
+
+class ReadPlanner(object):
+    def __init__(self, port, ph, fast_read=False):
+        self.port = port
+        self.ph = ph
+        self.fast_read = fast_read      # 是否考虑 Fast Sync Read / Fast Bulk Read
+
+        self.fields = []        # (dxl_id, address, length)
+        self.is_param_changed = False
+
+        self.transaction_overhead = TRANSACTION_OVERHEAD
+        self.status_delay = STATUS_DELAY
+
+        self.plan = None        # 当前方式
+        self.plan_key = None    # 方式依赖的条件，变化时重新规划
+        self.group = None
+        self.windows = {}       # dxl_id: [start_address, end_address]
+        self.data_dict = {}     # dxl_id: [data, result, error] (READ_PLAN_PER_ID)
+        self.fast_unsupported = set()   # 执行失败后不再考虑的 Fast 方式
+
+    def addParam(self, dxl_id, address, length):
+        if (dxl_id, address, length) in self.fields:
+            return False
+
+        self.fields.append((dxl_id, address, length))
+        self.is_param_changed = True
+        return True
+
+    def removeParam(self, dxl_id, address=None, length=None):
+        # address 为 None 时删除该设备的全部请求
+        fields = [field for field in self.fields if not (
+            field[0] == dxl_id and (address is None or (field[1] == address and field[2] == length)))]
+        if len(fields) != len(self.fields):
+            self.fields = fields
+            self.is_param_changed = True
+
+    def clearParam(self):
+        self.fields = []
+        self.is_param_changed = True
+
+    def setFastRead(self, enable):
+        self.fast_read = enable
+        self.fast_unsupported.clear()
+        self.plan_key = None
+
+    def setTransactionOverhead(self, overhead):     # ms
+        self.transaction_overhead = overhead
+        self.plan_key = None
+
+    def setStatusDelay(self, delay):    # ms
+        self.status_delay = delay
+        self.plan_key = None
+
+    def getPlan(self):
+        return self.plan
+
+    def getStrategies(self):
+        if self.ph.getProtocolVersion() == 1.0:
+            return [READ_PLAN_PER_ID, READ_PLAN_BULK]   # Protocol 1.0 不支持 Sync Read 与 Fast 指令
+
+        strategies = [READ_PLAN_PER_ID, READ_PLAN_SYNC, READ_PLAN_BULK]
+        if self.fast_read:
+            strategies += [strategy for strategy in (READ_PLAN_FAST_SYNC, READ_PLAN_FAST_BULK)
+                           if strategy not in self.fast_unsupported]
+        return strategies
+
+    def getPlanWindows(self, strategy, windows):
+        # Sync Read 类读取所有设备共同的最小区域
+        if strategy in (READ_PLAN_SYNC, READ_PLAN_FAST_SYNC):
+            start = min(window[0] for window in windows.values())
+            end = max(window[1] for window in windows.values())
+            return dict((dxl_id, [start, end]) for dxl_id in windows)
+
+        return windows
+
+    def estimateBytes(self, strategy, windows=None):
+        """
+        :return: 发送字节数, 接收字节数, 通信次数, 状态包数
+        """
+        if windows is None:
+            windows = mergeReadWindows([([dxl_id], address, length) for dxl_id, address, length in self.fields])
+
+        windows = self.getPlanWindows(strategy, windows)
+        spans = [end - start for start, end in windows.values()]
+        count = len(spans)
+
+        if self.ph.getProtocolVersion() == 1.0:
+            if strategy == READ_PLAN_PER_ID:
+                return (P1_PACKET_OVERHEAD + 2) * count, sum(P1_PACKET_OVERHEAD + span for span in spans), count, count
+            # Bulk Read: 0x00 + (LEN ID ADDR) * n
+            return P1_PACKET_OVERHEAD + 1 + 3 * count, sum(P1_PACKET_OVERHEAD + span for span in spans), 1, count
+
+        if strategy == READ_PLAN_PER_ID:
+            return (P2_PACKET_OVERHEAD + 4) * count, sum(P2_STATUS_OVERHEAD + span for span in spans), count, count
+
+        if strategy in (READ_PLAN_SYNC, READ_PLAN_FAST_SYNC):
+            tx_bytes = P2_PACKET_OVERHEAD + 4 + count   # ADDR_L ADDR_H LEN_L LEN_H + ID * n
+        else:
+            tx_bytes = P2_PACKET_OVERHEAD + 5 * count   # (ID ADDR_L ADDR_H LEN_L LEN_H) * n
+
+        if strategy in (READ_PLAN_FAST_SYNC, READ_PLAN_FAST_BULK):
+            # 一个状态包：FF FF FD 00 ID LEN_L LEN_H INST + (ERR ID DATA CRC_L CRC_H) * n
+            return tx_bytes, 8 + sum(span + 4 for span in spans), 1, 1
+
+        return tx_bytes, sum(P2_STATUS_OVERHEAD + span for span in spans), 1, count
+
+    def estimateTime(self, strategy, windows=None):
+        # ms
+        tx_bytes, rx_bytes, transactions, status_packets = self.estimateBytes(strategy, windows)
+        return (tx_bytes + rx_bytes) * self.port.tx_time_per_byte + \
+            transactions * self.transaction_overhead + status_packets * self.status_delay
+
+    def estimateCosts(self):
+        """
+        :return: {方式: (总线字节数, 预计时间 (ms))}
+        """
+        if not self.fields:
+            return {}
+
+        windows = mergeReadWindows([([dxl_id], address, length) for dxl_id, address, length in self.fields])
+        costs = {}
+        for strategy in self.getStrategies():
+            tx_bytes, rx_bytes, _, _ = self.estimateBytes(strategy, windows)
+            costs[strategy] = (tx_bytes + rx_bytes, self.estimateTime(strategy, windows))
+        return costs
+
+    def makePlan(self):
+        self.is_param_changed = False
+        self.plan_key = (self.port.tx_time_per_byte, tuple(self.fast_unsupported))
+        self.group = None
+        self.data_dict = {}
+
+        if not self.fields:
+            self.plan = None
+            self.windows = {}
+            return
+
+        costs = self.estimateCosts()
+        self.plan = min(costs, key=lambda strategy: (costs[strategy][1], costs[strategy][0]))
+
+        windows = mergeReadWindows([([dxl_id], address, length) for dxl_id, address, length in self.fields])
+        self.windows = self.getPlanWindows(self.plan, windows)
+
+        if self.plan in (READ_PLAN_SYNC, READ_PLAN_FAST_SYNC):
+            start, end = next(iter(self.windows.values()))
+            self.group = GroupSyncRead(self.port, self.ph, start, end - start, self.plan == READ_PLAN_FAST_SYNC)
+            for dxl_id in self.windows:
+                self.group.addParam(dxl_id)
+        elif self.plan in (READ_PLAN_BULK, READ_PLAN_FAST_BULK):
+            self.group = GroupBulkRead(self.port, self.ph, self.plan == READ_PLAN_FAST_BULK)
+            for dxl_id, (start, end) in self.windows.items():
+                self.group.addParam(dxl_id, start, end - start)
+
+    def isPlanValid(self):
+        return not self.is_param_changed and \
+            self.plan_key == (self.port.tx_time_per_byte, tuple(self.fast_unsupported))
+
+    def txRxPacket(self):
+        """
+        Execute the cached plan (re-planned when the fields or the baud rate change)
+        :return: 全部成功时为 COMM_SUCCESS
+        """
+        if not self.isPlanValid():
+            self.makePlan()
+
+        if self.plan is None:
+            return COMM_NOT_AVAILABLE
+
+        if self.plan == READ_PLAN_PER_ID:
+            result = COMM_SUCCESS
+            for dxl_id, (start, end) in self.windows.items():
+                data, rx_result, error = self.ph.readTxRx(self.port, dxl_id, start, end - start)
+                if rx_result == COMM_SUCCESS:
+                    self.data_dict[dxl_id] = [data, rx_result, error]
+                elif dxl_id in self.data_dict:
+                    self.data_dict[dxl_id][1] = rx_result
+                else:
+                    self.data_dict[dxl_id] = [[], rx_result, 0]
+
+                if rx_result != COMM_SUCCESS and result == COMM_SUCCESS:
+                    result = rx_result
+            return result
+
+        result = self.group.txRxPacket()
+
+        # 设备不支持 Fast 指令时 (组读取已在本周期改用普通指令)，之后重新规划
+        if self.plan in (READ_PLAN_FAST_SYNC, READ_PLAN_FAST_BULK) and self.group.fast_read_supported is False:
+            self.fast_unsupported.add(self.plan)
+
+        return result
+
+    def getState(self, dxl_id, address, length):
+        """
+        :return: 数据, 通信状态, 错误
+        """
+        if dxl_id not in self.windows:
+            return bytearray(), COMM_NOT_AVAILABLE, 0
+
+        if self.plan == READ_PLAN_PER_ID:
+            if dxl_id not in self.data_dict:
+                return bytearray(), COMM_NOT_AVAILABLE, 0
+
+            data, result, error = self.data_dict[dxl_id]
+            offset = address - self.windows[dxl_id][0]
+            return bytearray(data[offset: offset + length]), result, error
+
+        data, result, error, _ = getMergedData(self.group, self.windows, dxl_id, address, length)
+        return data, result, error
+
+    def isAvailable(self, dxl_id, address, data_length):
+        if dxl_id not in self.windows:
+            return False
+
+        start, end = self.windows[dxl_id]
+        if (address < start) or (end - data_length < address):
+            return False
+
+        _, result, _ = self.getState(dxl_id, address, data_length)
+        return result == COMM_SUCCESS
+
+    def getData(self, dxl_id, address, data_length):
+        if not self.isAvailable(dxl_id, address, data_length):
+            return 0
+
+        data, _, _ = self.getState(dxl_id, address, data_length)
+        if data_length == 1:
+            return data[0]
+        elif data_length == 2:
+            return DXL_MAKEWORD(data[0], data[1])
+        elif data_length == 4:
+            return DXL_MAKEDWORD(DXL_MAKEWORD(data[0], data[1]),
+                                 DXL_MAKEWORD(data[2], data[3]))
+        else:
+            return 0
@@ -40,6 +40,8 @@ INST_REBOOT = 8         # 重新启动设备的说明
 INST_STATUS = 85  # 0x55    返回指令包的数据包
 INST_SYNC_READ = 130  # 0x82    对于多个设备，一次从同一地址以相同长度读取数据的指令
 INST_BULK_WRITE = 147  # 0x93   对于多个设备，一次在不同地址以不同长度写入数据的指令
+INST_FAST_SYNC_READ = 138  # 0x8A   Sync Read，所有设备的数据合并在一个状态包中返回
+INST_FAST_BULK_READ = 154  # 0x9A   Bulk Read，所有设备的数据合并在一个状态包中返回
 
 # Communication Result
 COMM_SUCCESS = 0  # tx or rx packet communication success   通信成功
@@ -52,6 +54,14 @@ COMM_RX_TIMEOUT = -3001  # There is no status packet        没有状态包
 COMM_RX_CORRUPT = -3002  # Incorrect status packet          错误的状态包
 COMM_NOT_AVAILABLE = -9000  #   连接失败，不可行
 
+# 不复制数据的字节视图；Python 2 的 memoryview 元素为 str，改用 bytearray
+if isinstance(memoryview(b'\x00')[0], int):
+    byteView = memoryview
+else:
+    byteView = bytearray
+
+EMPTY_DATA = byteView(b'')    # 读取失败时返回的空数据
+
 
 # Macro for Control Table Value 控制表值的宏
 def DXL_MAKEWORD(a, b):
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 往返时间估计 (与 TCP 的 RTO 计算方式相同, RFC 6298)
+# 样本为状态包到达时刻减去发送时刻，并扣除状态包本身的传输时间，
+# 即 USB 适配器延迟 + 设备的 Return Delay Time
+
+RTT_ALPHA = 0.125       # SRTT 平滑系数
+RTT_BETA = 0.25         # RTTVAR 平滑系数
+RTT_K = 4               # RTO = SRTT + K * RTTVAR
+MIN_RTT_TIMEOUT = 1.0   # 最小超时余量 (ms)
+MAX_RTT_BACKOFF = 64    # 连续超时时的最大退避倍数
+
+
+class RttEstimator(object):
+    def __init__(self, alpha=RTT_ALPHA, beta=RTT_BETA, k=RTT_K, min_timeout=MIN_RTT_TIMEOUT):
+        self.alpha = alpha
+        self.beta = beta
+        self.k = k
+        self.min_timeout_ns = int(min_timeout * 1000000)
+
+        self.srtt = {}      # key: 平滑往返时间 (ns)
+        self.rttvar = {}    # key: 往返时间偏差 (ns)
+        self.backoff = {}   # key: 超时退避倍数
+
+    def setMinTimeout(self, min_timeout):   # ms
+        self.min_timeout_ns = int(min_timeout * 1000000)
+
+    def getMinTimeout(self):
+        return self.min_timeout_ns / 1000000.0
+
+    def reset(self, key=None):
+        if key is None:
+            self.srtt.clear()
+            self.rttvar.clear()
+            self.backoff.clear()
+        else:
+            self.srtt.pop(key, None)
+            self.rttvar.pop(key, None)
+            self.backoff.pop(key, None)
+
+    def addSample(self, key, rtt_ns):
+        rtt_ns = max(rtt_ns, 0)
+
+        if key not in self.srtt:
+            self.srtt[key] = rtt_ns
+            self.rttvar[key] = rtt_ns / 2.0
+        else:
+            srtt = self.srtt[key]
+            self.rttvar[key] = (1 - self.beta) * self.rttvar[key] + self.beta * abs(srtt - rtt_ns)
+            self.srtt[key] = (1 - self.alpha) * srtt + self.alpha * rtt_ns
+
+        self.backoff[key] = 1
+
+    def onTimeout(self, key):
+        # 超时后退避，直到收到新的样本
+        if key in self.srtt:
+            self.backoff[key] = min(self.backoff[key] * 2, MAX_RTT_BACKOFF)
+
+    def hasEstimate(self, key):
+        return key in self.srtt
+
+    def getSrttNs(self, key):
+        return self.srtt.get(key)
+
+    def getRttVarNs(self, key):
+        return self.rttvar.get(key)
+
+    def getTimeoutNs(self, key):
+        """
+        :return: 超时余量 (ns，不含状态包传输时间)，尚无样本时返回 None
+        """
+        if key not in self.srtt:
+            return None
+
+        rto = self.srtt[key] + self.k * self.rttvar[key]
+        return int(max(rto, self.min_timeout_ns) * self.backoff[key])
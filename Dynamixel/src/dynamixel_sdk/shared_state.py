@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 进程间共享的设备状态块 (multiprocessing.shared_memory)，需要 Python 3.8 以上
+# 每个槽位由一个进程写入，用 seqlock 方式记录版本：写入期间序号为奇数，读取前后序号一致才有效
+
+import struct
+
+import multiprocessing
+
+from multiprocessing import shared_memory, resource_tracker
+
+from .robotis_def import *
+from .port_handler import monotonicNs
+
+SLOT_SEQ_FORMAT = '<I'
+SLOT_INFO_FORMAT = '<iBxHq'     # 通信状态, 错误, 数据长度, 数据时刻 (ns)
+SLOT_HEADER_SIZE = struct.calcsize(SLOT_SEQ_FORMAT) + struct.calcsize(SLOT_INFO_FORMAT)
+READ_RETRIES = 100      # 写入方持续占用槽位时的最大重试次数
+
+created_names = set()   # 本进程创建的共享内存
+
+
+def attachSharedMemory(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)   # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        # 只由创建方删除：独立进程有自己的 resource_tracker，退出时会删除共享内存
+        # (multiprocessing 子进程与创建方共用 resource_tracker，无需处理)
+        if multiprocessing.parent_process() is None and shm.name not in created_names:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class SharedStateBlock(object):
+    def __init__(self, slot_count, data_length, name=None, create=True):
+        """
+        :param slot_count: 槽位数量
+        :param data_length: 每个槽位的最大数据长度
+        :param name: 共享内存名称，create 为 False 时连接到已有的共享内存
+        """
+        self.slot_count = slot_count
+        self.data_length = data_length
+        self.slot_size = (SLOT_HEADER_SIZE + data_length + 7) & ~7     # 8 字节对齐
+        self.is_owner = create
+
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.slot_size * slot_count)
+            created_names.add(self.shm.name)
+            for slot in range(slot_count):
+                struct.pack_into(SLOT_INFO_FORMAT, self.shm.buf, slot * self.slot_size + 4,
+                                 COMM_NOT_AVAILABLE, 0, 0, 0)
+        else:
+            self.shm = attachSharedMemory(name)
+
+        self.buf = self.shm.buf
+
+    @classmethod
+    def attach(cls, name, slot_count, data_length):
+        return cls(slot_count, data_length, name, create=False)
+
+    def getName(self):
+        return self.shm.name
+
+    def getSeq(self, slot):
+        # 0: 尚未写入
+        return struct.unpack_from(SLOT_SEQ_FORMAT, self.buf, slot * self.slot_size)[0]
+
+    def write(self, slot, data, result=COMM_SUCCESS, error=0, timestamp=None):
+        if len(data) > self.data_length:
+            return False
+
+        buf = self.buf
+        offset = slot * self.slot_size
+        seq = struct.unpack_from(SLOT_SEQ_FORMAT, buf, offset)[0]
+
+        struct.pack_into(SLOT_SEQ_FORMAT, buf, offset, (seq + 1) & 0xFFFFFFFF)     # 奇数：写入中
+        struct.pack_into(SLOT_INFO_FORMAT, buf, offset + 4, result, error, len(data),
+                         monotonicNs() if timestamp is None else timestamp)
+        data_start = offset + SLOT_HEADER_SIZE
+        buf[data_start: data_start + len(data)] = bytes(data)
+        struct.pack_into(SLOT_SEQ_FORMAT, buf, offset, ((seq + 2) & 0xFFFFFFFF) or 2)    # 跳过 0
+
+        return True
+
+    def read(self, slot):
+        """
+        :return: 序号, 数据, 通信状态, 错误, 数据时刻 (ns)
+                 写入方持续占用时通信状态为 COMM_PORT_BUSY
+        """
+        buf = self.buf
+        offset = slot * self.slot_size
+        data_start = offset + SLOT_HEADER_SIZE
+
+        for _ in range(READ_RETRIES):
+            seq = struct.unpack_from(SLOT_SEQ_FORMAT, buf, offset)[0]
+            if seq & 1:
+                continue
+
+            result, error, length, timestamp = struct.unpack_from(SLOT_INFO_FORMAT, buf, offset + 4)
+            data = bytes(buf[data_start: data_start + min(length, self.data_length)])
+
+            if struct.unpack_from(SLOT_SEQ_FORMAT, buf, offset)[0] == seq:
+                return seq, data, result, error, timestamp
+
+        return None, b'', COMM_PORT_BUSY, 0, 0
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
+    def unlink(self):
+        if self.is_owner:
+            created_names.discard(self.shm.name)
+            self.shm.unlink()
+
+
+class SharedStateView(object):
+    # 按设备 ID 读取状态块，用法与 GroupSyncRead 的 isAvailable / getData 相同
+    def __init__(self, block, ids, address, length):
+        """
+        :param ids: 设备 ID，第 n 个设备使用第 n 个槽位
+        :param address, length: 槽位数据对应的控制表区域
+        """
+        self.block = block
+        self.slots = dict((dxl_id, idx) for idx, dxl_id in enumerate(ids))
+        self.address = address
+        self.length = length
+
+    def getIds(self):
+        return list(self.slots)
+
+    def getState(self, dxl_id):
+        """
+        :return: 数据, 通信状态, 错误, 数据时刻 (ns)
+        """
+        if dxl_id not in self.slots:
+            return b'', COMM_NOT_AVAILABLE, 0, 0
+
+        _, data, result, error, timestamp = self.block.read(self.slots[dxl_id])
+        return data[0: self.length], result, error, timestamp
+
+    def isAvailable(self, dxl_id, address, data_length):
+        data, result, _, _ = self.getState(dxl_id)
+        return self.isValid(data, result, address, data_length)
+
+    def isValid(self, data, result, address, data_length):
+        if result != COMM_SUCCESS or len(data) < self.length:
+            return False
+
+        if (address < self.address) or (self.address + self.length - data_length < address):
+            return False
+
+        return True
+
+    def getData(self, dxl_id, address, data_length):
+        # 只读取一次共享内存，数据与状态一致
+        data, result, _, _ = self.getState(dxl_id)
+        if not self.isValid(data, result, address, data_length):
+            return 0
+
+        idx = address - self.address
+        if data_length == 1:
+            return data[idx]
+        elif data_length == 2:
+            return DXL_MAKEWORD(data[idx], data[idx + 1])
+        elif data_length == 4:
+            return DXL_MAKEDWORD(DXL_MAKEWORD(data[idx + 0], data[idx + 1]),
+                                 DXL_MAKEWORD(data[idx + 2], data[idx + 3]))
+        else:
+            return 0
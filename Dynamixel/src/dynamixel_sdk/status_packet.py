@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 解析后的状态包，由各协议的 StatusParser 生成
+
+from collections import namedtuple
+
+# id: 设备 ID
+# error: 错误字节
+# params: 参数 (byteView，不含错误字节与校验)
+# packet: 完整数据包 (已去除字节填充)
+# timestamp: 接收完成时刻 (单调时钟, ns)
+StatusPacket = namedtuple('StatusPacket', ['id', 'error', 'params', 'packet', 'timestamp'])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 状态包接收循环：读取、解析与超时判断，由两种协议的阻塞接收、非阻塞接收 (poll) 与 asyncio 接收共用
+# 解析器由各协议提供 (Protocol1StatusParser / Protocol2StatusParser)
+
+from .robotis_def import *
+
+
+class StatusReceiver(object):
+    def __init__(self, parser, data_lengths=None, dxl_id=None):
+        """
+        :param parser: 状态包解析器
+        :param data_lengths: {dxl_id: data_length}，接收 Sync Read / Bulk Read 的多个状态包，None 时只接收一个
+        :param dxl_id: 只接收一个状态包时跳过其他设备的状态包，None 时不过滤
+        """
+        self.parser = parser
+        self.data_lengths = data_lengths
+        self.dxl_id = dxl_id
+
+        self.status = None      # 只接收一个状态包时的结果
+        self.status_list = {}   # dxl_id: StatusPacket
+        self.result = COMM_RX_TIMEOUT
+        self.is_done = False
+
+    def step(self, port):
+        """
+        Read and parse the data available on the port
+        :return: 是否接收结束 (全部收到、校验失败或超时)，False 时等待新数据后再次调用
+        """
+        parser = self.parser
+
+        while not self.is_done:
+            if self.data_lengths is not None and len(self.status_list) == len(self.data_lengths):
+                self.result = COMM_SUCCESS
+                self.is_done = True
+                break
+
+            data = port.readPort(parser.getBytesNeeded())
+            parser.addData(data)
+            status, result = parser.parsePacket()
+            if result == COMM_SUCCESS:
+                self.addStatus(status)
+            elif result == COMM_RX_CORRUPT:
+                # 多个状态包时单个设备失败不影响其他设备
+                self.result = COMM_RX_CORRUPT
+                self.is_done = self.data_lengths is None
+            elif data:
+                continue    # 先读完已到达的数据再判断超时，超时前已收到的状态包仍然有效
+            elif port.isPacketTimeout():
+                if parser.getRxLength() != 0:
+                    self.result = COMM_RX_CORRUPT
+                self.is_done = True
+            else:
+                return False
+
+        return True
+
+    def addStatus(self, status):
+        if self.data_lengths is None:
+            if self.dxl_id is None or status.id == self.dxl_id:
+                self.status = status
+                self.result = COMM_SUCCESS
+                self.is_done = True
+        elif status.id in self.data_lengths and len(status.params) >= self.data_lengths[status.id]:
+            self.status_list[status.id] = status
+
+    def getRxTime(self):
+        # 最后一个状态包的接收时刻 (ns)
+        if self.status is not None:
+            return self.status.timestamp
+        if self.status_list:
+            return max(status.timestamp for status in self.status_list.values())
+        return None
+
+    def finish(self, port):
+        port.releaseBus()
+        if self.result == COMM_SUCCESS:
+            port.updateRtt(self.result, self.getRxTime())
+        else:
+            port.updateRtt(self.result)
+
+
+def receiveStatus(port, receiver):
+    # 阻塞接收，直到 receiver 结束
+    while not receiver.step(port):
+        port.waitForData()
+
+    receiver.finish(port)
+    return receiver
+
+
+def pollStatus(port, make_receiver):
+    """
+    Non-blocking receive, continued on the next call through port.rx_poll_state
+    :param make_receiver: 没有未完成的接收时用于创建 StatusReceiver
+    :return: StatusReceiver，is_done 为 False 时尚未接收完成
+    """
+    receiver = port.beginRxPoll(make_receiver)
+    if receiver.step(port):
+        port.endRxPoll()
+        receiver.finish(port)
+
+    return receiver
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Author: Ryu Woon Jung (Leon)
+
+# 合并写入：with WriteBatch(port): 期间该线程在该端口上的 write*TxOnly 不立即发送，
+# 退出时地址与长度相同的写入合并为 Sync Write，其余合并为 Bulk Write (Protocol 2.0)
+# 合并后的写入以广播发送，没有状态包：发送结果由 flush() 返回 (with 结束后为 getLastResult())，
+# 无法获得设备的应答，期间的 write*TxRx 不发送并返回 COMM_NOT_AVAILABLE
+
+import threading
+
+from .robotis_def import *
+from .group_sync_write import GroupSyncWrite
+from .group_bulk_write import GroupBulkWrite
+
+WRITE_NUM_PH = 0
+WRITE_NUM_ID = 1
+WRITE_NUM_ADDRESS = 2
+WRITE_NUM_LENGTH = 3
+WRITE_NUM_DATA = 4
+
+
+class WriteBatch(object):
+    def __init__(self, port):
+        self.port = port
+        self.writes = []        # [ph, dxl_id, address, length, data]，按调用顺序
+        self.outer = None       # 嵌套时外层的 WriteBatch
+        self.thread = None      # 只合并该线程的写入
+        self.last_result = COMM_SUCCESS
+
+    def __enter__(self):
+        self.outer = self.port.write_batch
+        if self.outer is None:
+            self.thread = threading.current_thread()
+            self.port.write_batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.outer is not None:  # 嵌套时由外层发送
+            self.outer = None
+            return
+
+        self.port.write_batch = None
+        if exc_type is None:
+            self.flush()
+        else:   # 出现异常时丢弃未发送的写入
+            self.writes = []
+
+    def isBatching(self):
+        # 当前线程的写入是否由该 WriteBatch 合并
+        return self.thread is threading.current_thread()
+
+    def addWrite(self, ph, dxl_id, address, length, data):
+        """
+        :return: 是否加入合并，False 时由调用方直接发送
+        """
+        if not self.isBatching() or dxl_id >= BROADCAST_ID or len(data) < length:
+            return False
+
+        # 同一设备同一区域的重复写入只保留最后一次
+        for write in self.writes:
+            if write[WRITE_NUM_PH] is ph and write[WRITE_NUM_ID] == dxl_id and \
+                    write[WRITE_NUM_ADDRESS] == address and write[WRITE_NUM_LENGTH] == length:
+                write[WRITE_NUM_DATA] = list(data[0: length])
+                return True
+
+        self.writes.append([ph, dxl_id, address, length, list(data[0: length])])
+        return True
+
+    def getWriteCount(self):
+        return len(self.writes)
+
+    def getLastResult(self):
+        # 上一次 flush() 的结果
+        return self.last_result
+
+    def flush(self):
+        """
+        Send the collected writes
+        :return: 第一个失败的通信状态，全部成功时为 COMM_SUCCESS
+        """
+        writes, self.writes = self.writes, []
+        batch, self.port.write_batch = self.port.write_batch, None    # 发送期间不再合并
+
+        self.last_result = COMM_SUCCESS
+        try:
+            for ph, packet_writes in self.makeRounds(writes):
+                result = self.sendRound(ph, packet_writes)
+                if result != COMM_SUCCESS and self.last_result == COMM_SUCCESS:
+                    self.last_result = result
+        finally:
+            self.port.write_batch = batch
+
+        return self.last_result
+
+    def makeRounds(self, writes):
+        # 同一数据包中每个设备只能出现一次，同一设备的多次写入按顺序分到后续的数据包
+        rounds = []     # [ph, [write, ...]]
+        for write in writes:
+            for ph, packet_writes in rounds:
+                if ph is write[WRITE_NUM_PH] and \
+                        all(other[WRITE_NUM_ID] != write[WRITE_NUM_ID] for other in packet_writes):
+                    packet_writes.append(write)
+                    break
+            else:
+                rounds.append([write[WRITE_NUM_PH], [write]])
+
+        return rounds
+
+    def sendRound(self, ph, writes):
+        # 只有一个写入时也使用 Sync Write：单独的 Write 指令会有状态包，留在接收缓冲区中影响后续的读取
+        regions = []
+        for write in writes:
+            region = (write[WRITE_NUM_ADDRESS], write[WRITE_NUM_LENGTH])
+            if region not in regions:
+                regions.append(region)
+
+        if len(regions) > 1 and ph.getProtocolVersion() != 1.0:
+            group = GroupBulkWrite(self.port, ph)
+            for _, dxl_id, address, length, data in writes:
+                group.addParam(dxl_id, address, length, data)
+            return group.txPacket()
+
+        # 区域相同，或 Protocol 1.0 (不支持 Bulk Write) 时按区域分别 Sync Write
+        result = COMM_SUCCESS
+        for address, length in regions:
+            group = GroupSyncWrite(self.port, ph, address, length)
+            for write in writes:
+                if write[WRITE_NUM_ADDRESS] == address and write[WRITE_NUM_LENGTH] == length:
+                    group.addParam(write[WRITE_NUM_ID], write[WRITE_NUM_DATA])
+
+            group_result = group.txPacket()
+            if group_result != COMM_SUCCESS and result == COMM_SUCCESS:
+                result = group_result
+
+        return result
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Protocol 2.0 状态包解析性能测试，无需连接舵机
+# 用法: python status_parser_benchmark.py [录制的数据文件]
+# 未指定文件时生成 18 个舵机的同步读取响应 (含线路噪声)
+
+import random
+import sys
+import time
+
+from dynamixel_sdk import *
+
+CHUNK_SIZE = 64     # 每次输入解析器的字节数
+
+
+def makeStatusPacket(dxl_id, params):
+    packet = bytearray(len(params) + 11)
+    packet[0:4] = b'\xff\xff\xfd\x00'
+    packet[PKT_ID] = dxl_id
+    packet[PKT_LENGTH_L] = DXL_LOBYTE(len(params) + 4)
+    packet[PKT_LENGTH_H] = DXL_HIBYTE(len(params) + 4)
+    packet[PKT_INSTRUCTION] = INST_STATUS
+    packet[PKT_ERROR] = 0
+    packet[PKT_PARAMETER0 + 1: PKT_PARAMETER0 + 1 + len(params)] = params
+
+    crc = updateCRC(0, packet, len(packet) - 2)
+    packet[-2] = DXL_LOBYTE(crc)
+    packet[-1] = DXL_HIBYTE(crc)
+    return packet
+
+
+def makeStream(cycles, noise):
+    stream = bytearray()
+    for cycle in range(cycles):
+        for dxl_id in range(1, 19):
+            if noise:
+                stream += bytes(random.randint(0, 255) for _ in range(random.randint(0, 3)))
+            stream += makeStatusPacket(dxl_id, [cycle & 0xFF, dxl_id, 0x00, 0x00])
+    return stream
+
+
+def benchmark(name, stream):
+    parser = Protocol2StatusParser()
+    count = 0
+
+    start = time.perf_counter()
+    for idx in range(0, len(stream), CHUNK_SIZE):
+        count += len(parser.feed(stream[idx: idx + CHUNK_SIZE]))
+    elapsed = time.perf_counter() - start
+
+    print("%-24s %7d packets %8.2f us/packet %8.2f MB/s (corrupt %d)" % (
+        name, count, elapsed * 1000000.0 / max(count, 1), len(stream) / elapsed / 1000000.0, parser.corrupt_count))
+
+
+if len(sys.argv) > 1:
+    with open(sys.argv[1], 'rb') as f:
+        benchmark(sys.argv[1], f.read())
+else:
+    random.seed(0)
+    benchmark("clean stream", makeStream(1000, False))
+    benchmark("noisy stream", makeStream(1000, True))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# Protocol 2.0 字节填充性能测试，无需连接舵机
+# 输出每个数据包 addStuffing / removeStuffing 的平均耗时
+
+import timeit
+
+from dynamixel_sdk import *
+
+REPEAT = 20000
+
+
+def makePacket(params):
+    packet = bytearray(len(params) + 10)
+    packet[PKT_ID] = 1
+    packet[PKT_LENGTH_L] = DXL_LOBYTE(len(params) + 3)
+    packet[PKT_LENGTH_H] = DXL_HIBYTE(len(params) + 3)
+    packet[PKT_INSTRUCTION] = INST_WRITE
+    packet[PKT_PARAMETER0: PKT_PARAMETER0 + len(params)] = params
+    return packet
+
+
+def benchmark(name, func, packet):
+    elapsed = timeit.timeit(lambda: func(bytearray(packet)), number=REPEAT)
+    copy = timeit.timeit(lambda: bytearray(packet), number=REPEAT)
+    print("%-36s %8.2f us/packet" % (name, (elapsed - copy) * 1000000.0 / REPEAT))
+
+
+ph = Protocol2PacketHandler()
+
+plain = makePacket([0x74, 0x00, 0x00, 0x08, 0x00, 0x00])         # write goal position
+stuffed = makePacket([0x74, 0x00, 0xFF, 0xFF, 0xFD, 0x00])      # contains FF FF FD
+large = makePacket([0x74, 0x00] + [0x10, 0x20, 0x30, 0x40] * 64)
+
+benchmark("addStuffing (no stuffing, 6 B)", ph.addStuffing, plain)
+benchmark("addStuffing (stuffing, 6 B)", ph.addStuffing, stuffed)
+benchmark("addStuffing (no stuffing, 258 B)", ph.addStuffing, large)
+
+benchmark("removeStuffing (no stuffing, 6 B)", ph.removeStuffing, plain)
+benchmark("removeStuffing (stuffing, 7 B)", ph.removeStuffing, ph.addStuffing(bytearray(stuffed)))
+benchmark("removeStuffing (no stuffing, 258 B)", ph.removeStuffing, large)
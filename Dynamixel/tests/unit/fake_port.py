@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+# 单元测试使用的模拟串口与 Protocol 2.0 舵机，无需连接硬件
+# 状态包的构建 (CRC、字节填充) 独立实现，不依赖被测代码
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+
+from dynamixel_sdk import PortHandler
+
+MODEL_NUMBER = 1020     # XM430-W350
+FIRMWARE_VERSION = 42
+MEMORY_SIZE = 256
+
+
+def crc16(data):
+    # CRC-16-IBM (0x8005)，逐位计算
+    crc = 0
+    for byte in bytearray(data):
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x8005) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
+
+
+def stuff(body):
+    # FF FF FD -> FF FF FD FD
+    out = bytearray()
+    for byte in bytearray(body):
+        out.append(byte)
+        if byte == 0xFD and out[-3:] == b'\xff\xff\xfd':
+            out.append(0xFD)
+    return out
+
+
+def unstuff(body):
+    out = bytearray()
+    body = bytearray(body)
+    idx = 0
+    while idx < len(body):
+        out.append(body[idx])
+        if out[-3:] == b'\xff\xff\xfd' and idx + 1 < len(body) and body[idx + 1] == 0xFD:
+            idx += 1
+        idx += 1
+    return out
+
+
+def makePacket(dxl_id, instruction, params):
+    body = stuff(bytearray([instruction]) + bytearray(params))
+    length = len(body) + 2
+    packet = bytearray(b'\xff\xff\xfd\x00') + bytearray([dxl_id, length & 0xFF, length >> 8]) + body
+    crc = crc16(packet)
+    return packet + bytearray([crc & 0xFF, crc >> 8])
+
+
+def makeStatusPacket(dxl_id, error, params):
+    return makePacket(dxl_id, 0x55, bytearray([error]) + bytearray(params))
+
+
+def makeProtocol1StatusPacket(dxl_id, error, params):
+    packet = bytearray([0xFF, 0xFF, dxl_id, len(params) + 2, error]) + bytearray(params)
+    return packet + bytearray([~sum(packet[2:]) & 0xFF])
+
+
+class FakeSerial(object):
+    # 代替 serial.Serial：写入的数据交给 bus 处理，应答放入接收缓冲区
+    def __init__(self, bus=None):
+        self.bus = bus
+        self.rxbuffer = bytearray()
+        self.written = []
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return len(self.rxbuffer)
+
+    def read(self, length):
+        data = bytes(self.rxbuffer[0: length])
+        del self.rxbuffer[0: length]
+        return data
+
+    def write(self, data):
+        data = bytes(data)
+        self.written.append(data)
+        if self.bus is not None:
+            self.rxbuffer += self.bus.handle(data)
+        return len(data)
+
+    def inject(self, data):
+        self.rxbuffer += data
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        del self.rxbuffer[:]
+
+    def close(self):
+        self.is_open = False
+
+
+class PipeSerial(FakeSerial):
+    # 带文件描述符的 FakeSerial：接收缓冲区有数据时 fileno() 可读，用于 select / poll
+    def __init__(self, bus=None):
+        FakeSerial.__init__(self, bus)
+        self.rx_fd, self.notify_fd = os.pipe()
+
+    def fileno(self):
+        return self.rx_fd
+
+    def read(self, length):
+        data = FakeSerial.read(self, length)
+        if data:
+            os.read(self.rx_fd, len(data))
+        return data
+
+    def write(self, data):
+        length = len(self.rxbuffer)
+        FakeSerial.write(self, data)
+        self.notify(len(self.rxbuffer) - length)
+        return len(data)
+
+    def inject(self, data):
+        FakeSerial.inject(self, data)
+        self.notify(len(data))
+
+    def notify(self, length):
+        if length > 0:
+            os.write(self.notify_fd, b'\x00' * length)
+
+    def reset_input_buffer(self):
+        if self.rxbuffer:
+            os.read(self.rx_fd, len(self.rxbuffer))
+        FakeSerial.reset_input_buffer(self)
+
+    def close(self):
+        if self.is_open:
+            os.close(self.rx_fd)
+            os.close(self.notify_fd)
+        FakeSerial.close(self)
+
+
+class FakeServoBus(object):
+    """
+    Protocol 2.0 servos answering instruction packets
+    dead: 不应答的设备; fast_read: 是否支持 Fast Sync Read / Fast Bulk Read
+    """
+    def __init__(self, ids, dead=(), fast_read=True):
+        self.memory = dict((dxl_id, bytearray(MEMORY_SIZE)) for dxl_id in ids)
+        for dxl_id in ids:
+            self.memory[dxl_id][0: 2] = bytearray([MODEL_NUMBER & 0xFF, MODEL_NUMBER >> 8])
+            self.memory[dxl_id][132: 136] = bytearray([dxl_id, 1, 2, 3])     # Present Position
+        self.dead = set(dead)
+        self.fast_read = fast_read
+        self.errors = {}        # dxl_id: 状态包中的错误字节
+        self.instructions = []  # (dxl_id, instruction)
+
+    def isLive(self, dxl_id):
+        return dxl_id in self.memory and dxl_id not in self.dead
+
+    def status(self, dxl_id, params=b''):
+        return makeStatusPacket(dxl_id, self.errors.get(dxl_id, 0), params)
+
+    def read(self, dxl_id, address, length):
+        return self.memory[dxl_id][address: address + length]
+
+    def handle(self, packet):
+        packet = bytearray(packet)
+        if packet[0: 4] != b'\xff\xff\xfd\x00':
+            return b''
+
+        dxl_id = packet[4]
+        length = packet[5] | (packet[6] << 8)
+        body = unstuff(packet[7: 7 + length - 2])
+        instruction, params = body[0], body[1:]
+        self.instructions.append((dxl_id, instruction))
+
+        reply = bytearray()
+        if instruction == 0x01:     # Ping
+            for target in (self.memory if dxl_id == 0xFE else [dxl_id]):
+                if self.isLive(target):
+                    reply += self.status(target, [MODEL_NUMBER & 0xFF, MODEL_NUMBER >> 8, FIRMWARE_VERSION])
+        elif instruction in (0x02, 0x03, 0x06, 0x08, 0x10):     # Read, Write, Factory Reset, Reboot, Clear
+            if instruction == 0x03 and dxl_id in self.memory:
+                address = params[0] | (params[1] << 8)
+                self.memory[dxl_id][address: address + len(params) - 2] = params[2:]
+            if self.isLive(dxl_id):
+                if instruction == 0x02:
+                    reply += self.status(dxl_id, self.read(dxl_id, params[0] | (params[1] << 8),
+                                                           params[2] | (params[3] << 8)))
+                else:
+                    reply += self.status(dxl_id)
+        elif instruction in (0x82, 0x8A):   # Sync Read, Fast Sync Read
+            address, data_length = params[0] | (params[1] << 8), params[2] | (params[3] << 8)
+            reads = [(target, address, data_length) for target in params[4:]]
+            reply += self.groupRead(reads, instruction == 0x8A)
+        elif instruction in (0x92, 0x9A):   # Bulk Read, Fast Bulk Read
+            reads = [(params[idx], params[idx + 1] | (params[idx + 2] << 8), params[idx + 3] | (params[idx + 4] << 8))
+                     for idx in range(0, len(params), 5)]
+            reply += self.groupRead(reads, instruction == 0x9A)
+        elif instruction == 0x83:   # Sync Write
+            address, data_length = params[0] | (params[1] << 8), params[2] | (params[3] << 8)
+            for idx in range(4, len(params), data_length + 1):
+                if params[idx] in self.memory:
+                    self.memory[params[idx]][address: address + data_length] = params[idx + 1: idx + 1 + data_length]
+        elif instruction == 0x93:   # Bulk Write
+            idx = 0
+            while idx < len(params):
+                target = params[idx]
+                address, data_length = params[idx + 1] | (params[idx + 2] << 8), params[idx + 3] | (params[idx + 4] << 8)
+                if target in self.memory:
+                    self.memory[target][address: address + data_length] = params[idx + 5: idx + 5 + data_length]
+                idx += 5 + data_length
+
+        return bytes(reply)
+
+    def groupRead(self, reads, is_fast):
+        if not is_fast:
+            reply = bytearray()
+            for target, address, data_length in reads:
+                if self.isLive(target):
+                    reply += self.status(target, self.read(target, address, data_length))
+            return reply
+
+        # Fast 指令：所有设备的数据合并为一个状态包，有设备不应答时整个数据包缺失
+        if not self.fast_read or not all(self.isLive(target) for target, _, _ in reads):
+            return bytearray()
+
+        # FF FF FD 00 FE LEN_L LEN_H 55 (ERR ID DATA CRC) * n，最后的 CRC 为整个数据包的 CRC
+        params = bytearray()
+        for idx, (target, address, data_length) in enumerate(reads):
+            if idx > 0:
+                params += bytearray([0x00, 0x00])   # 前一个设备的 CRC (解析时不校验)
+            params += bytearray([self.errors.get(target, 0), target]) + self.read(target, address, data_length)
+        return makePacket(0xFE, 0x55, params)
+
+
+def makeFakePort(bus=None, baudrate=1000000, port_class=PortHandler, serial_class=FakeSerial):
+    port = port_class('fake')
+    port.ser = serial_class(bus)
+    port.is_open = True
+    port.baudrate = baudrate
+    port.setLatencyTimer(1)     # 缩短超时
+    port.updateActualBaudRate()
+    port.setupRxWait()      # serial_class 提供 fileno() 时可使用事件驱动接收
+    return port
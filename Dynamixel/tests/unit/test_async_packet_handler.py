@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import asyncio
+import threading
+import unittest
+
+import fake_port
+from dynamixel_sdk import (AsyncPortHandler, AsyncPacketHandler, AsyncGroupSyncRead, AsyncGroupBulkRead,
+                           COMM_SUCCESS, COMM_NOT_AVAILABLE, COMM_PORT_BUSY,
+                           TX_END_TIMING_NONE, TX_END_TIMING_DRAIN, TX_END_TIMING_COMPUTED)
+
+
+class AsyncPacketHandlerTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1, 2, 3])
+        self.port = fake_port.makeFakePort(self.bus, port_class=AsyncPortHandler)
+        self.aph = AsyncPacketHandler(2.0)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def runUntilComplete(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def testBroadcastPingDoesNotBlockEventLoop(self):
+        ticks = [0]
+
+        async def ticker():
+            while True:
+                ticks[0] += 1
+                await asyncio.sleep(0.001)
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            try:
+                return await self.aph.broadcastPing(self.port)
+            finally:
+                task.cancel()
+
+        data_list, result = self.runUntilComplete(main())
+        self.assertEqual(result, COMM_SUCCESS)
+        self.assertEqual(sorted(data_list), [1, 2, 3])
+        self.assertEqual(data_list[2], [fake_port.MODEL_NUMBER, fake_port.FIRMWARE_VERSION])
+        self.assertGreater(ticks[0], 10)    # 接收窗口期间其他任务仍在运行
+        self.assertFalse(self.port.bus_arbiter.isLocked())
+
+    def testInstructions(self):
+        self.assertEqual(self.runUntilComplete(self.aph.reboot(self.port, 1)), (COMM_SUCCESS, 0))
+        self.assertEqual(self.runUntilComplete(self.aph.clearMultiTurn(self.port, 2)), (COMM_SUCCESS, 0))
+        self.assertEqual(self.runUntilComplete(self.aph.factoryReset(self.port, 3, 0x02)), (COMM_SUCCESS, 0))
+        self.assertEqual(self.runUntilComplete(self.aph.action(self.port, 1)), COMM_SUCCESS)
+        self.assertEqual([instruction for _, instruction in self.bus.instructions], [0x08, 0x10, 0x06, 0x05])
+        self.assertFalse(self.port.bus_arbiter.isLocked())
+
+    def testProtocol1Unavailable(self):
+        aph = AsyncPacketHandler(1.0)
+        self.assertEqual(self.runUntilComplete(aph.broadcastPing(self.port)), (None, COMM_NOT_AVAILABLE))
+        self.assertEqual(self.runUntilComplete(aph.reboot(self.port, 1)), (COMM_NOT_AVAILABLE, 0))
+        self.assertEqual(self.runUntilComplete(aph.clearMultiTurn(self.port, 1)), (COMM_NOT_AVAILABLE, 0))
+        self.assertEqual(self.bus.instructions, [])
+
+    def testNoBlockingPassthrough(self):
+        self.assertEqual(self.aph.getProtocolVersion(), 2.0)
+        self.assertRaises(AttributeError, getattr, self.aph, 'rxPacketPoll')
+
+    def testDrainTxEndTimingRejected(self):
+        # DRAIN 会阻塞事件循环
+        self.assertFalse(self.port.setTxEndTiming(TX_END_TIMING_DRAIN))
+        self.assertEqual(self.port.getTxEndTiming(), TX_END_TIMING_NONE)
+        self.assertTrue(self.port.setTxEndTiming(TX_END_TIMING_COMPUTED))
+        self.assertEqual(self.port.getTxEndTiming(), TX_END_TIMING_COMPUTED)
+
+    def testGroupSyncRead(self):
+        group = AsyncGroupSyncRead(self.port, self.aph, 132, 4)
+        for dxl_id in (1, 2, 3):
+            group.addParam(dxl_id)
+
+        self.assertEqual(self.runUntilComplete(group.txRxPacket()), COMM_SUCCESS)
+        self.assertEqual(group.getData(3, 132, 4), 0x03020103)
+
+    def testRxPacketPollNotAvailable(self):
+        sync_read = AsyncGroupSyncRead(self.port, self.aph, 132, 4)
+        sync_read.addParam(1)
+        bulk_read = AsyncGroupBulkRead(self.port, self.aph)
+        bulk_read.addParam(1, 132, 4)
+
+        self.assertEqual(sync_read.rxPacketPoll(), COMM_NOT_AVAILABLE)
+        self.assertEqual(bulk_read.rxPacketPoll(), COMM_NOT_AVAILABLE)
+
+    def testReceiveWhileBusOwnedByOtherThread(self):
+        held, release = threading.Event(), threading.Event()
+
+        def holder():
+            self.port.holdBus()
+            held.set()
+            release.wait()
+            self.port.unholdBus()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        held.wait()
+        try:
+            self.port.setBusTimeout(0)
+            self.port.ser.inject(fake_port.makeStatusPacket(1, 0, [1, 2, 3, 4]))
+
+            self.assertEqual(self.runUntilComplete(self.aph.rxPacket(self.port)), (bytearray(), COMM_PORT_BUSY))
+            self.assertEqual(self.runUntilComplete(self.aph.readRx(self.port, 1, 4))[1], COMM_PORT_BUSY)
+            self.assertEqual(self.runUntilComplete(self.aph.readRxMulti(self.port, {1: 4})), ({}, COMM_PORT_BUSY))
+            self.assertEqual(self.runUntilComplete(self.aph.fastReadRx(self.port, [4])), ({}, COMM_PORT_BUSY))
+            self.assertEqual(self.port.ser.in_waiting, 15)  # 其他线程的状态包未被读取
+        finally:
+            release.set()
+            thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
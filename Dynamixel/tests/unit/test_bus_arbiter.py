@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import threading
+import time
+import unittest
+
+import fake_port
+from dynamixel_sdk import (PacketHandler, BusArbiter, BUS_PRIORITY_LOW, BUS_PRIORITY_HIGH,
+                           COMM_SUCCESS, COMM_RX_TIMEOUT, COMM_PORT_BUSY)
+
+
+class BusArbiterTest(unittest.TestCase):
+    def setUp(self):
+        self.arbiter = BusArbiter(timeout=1000)
+
+    def startWaiter(self, priority, order):
+        def waiter():
+            if self.arbiter.acquire(priority, None):
+                order.append(priority)
+                self.arbiter.release()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        return thread
+
+    def waitForWaiters(self, count):
+        deadline = time.time() + 1.0
+        while self.arbiter.getWaiterCount() < count and time.time() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(self.arbiter.getWaiterCount(), count)
+
+    def testReentrant(self):
+        self.assertTrue(self.arbiter.acquire())
+        self.assertTrue(self.arbiter.acquire())
+        self.assertTrue(self.arbiter.isOwner())
+        self.arbiter.release()
+        self.assertFalse(self.arbiter.isLocked())
+
+    def testPriorityOrder(self):
+        order = []
+        self.assertTrue(self.arbiter.acquire())
+        threads = [self.startWaiter(BUS_PRIORITY_LOW, order)]
+        self.waitForWaiters(1)
+        threads.append(self.startWaiter(BUS_PRIORITY_HIGH, order))
+        self.waitForWaiters(2)
+
+        self.arbiter.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, [BUS_PRIORITY_HIGH, BUS_PRIORITY_LOW])
+
+    def testTimeout(self):
+        held, release = threading.Event(), threading.Event()
+
+        def holder():
+            self.arbiter.acquire()
+            held.set()
+            release.wait()
+            self.arbiter.release()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        held.wait()
+        try:
+            self.assertFalse(self.arbiter.acquire(timeout=0))
+            self.assertFalse(self.arbiter.acquire(timeout=10))
+            self.assertEqual(self.arbiter.getWaiterCount(), 0)
+            self.arbiter.release()  # 不是占用者，不释放
+            self.assertTrue(self.arbiter.isLocked())
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertTrue(self.arbiter.acquire(timeout=0))
+
+    def testHoldKeepsBusAcrossRelease(self):
+        self.assertTrue(self.arbiter.hold())
+        self.assertTrue(self.arbiter.acquire())
+        self.arbiter.release()      # 单次通信结束
+        self.assertTrue(self.arbiter.isLocked())
+
+        self.arbiter.unhold()
+        self.assertFalse(self.arbiter.isLocked())
+
+    def testForceRelease(self):
+        with self.arbiter:
+            self.arbiter.hold()
+            self.arbiter.forceRelease()
+            self.assertFalse(self.arbiter.isLocked())
+
+
+class PortBusTest(unittest.TestCase):
+    def setUp(self):
+        self.port = fake_port.makeFakePort(fake_port.FakeServoBus([1]))
+        self.ph = PacketHandler(2.0)
+
+    def testTransactionReleasesBus(self):
+        self.assertEqual(self.ph.read4ByteTxRx(self.port, 1, 132)[1], COMM_SUCCESS)
+        self.assertEqual(self.ph.read4ByteTxRx(self.port, 2, 132)[1], COMM_RX_TIMEOUT)   # 超时后也释放
+        self.assertFalse(self.port.bus_arbiter.isLocked())
+
+    def testDefaultFailsFast(self):
+        thread = threading.Thread(target=self.port.acquireBus)
+        thread.start()
+        thread.join()
+
+        start = time.time()
+        self.assertEqual(self.ph.read4ByteTxRx(self.port, 1, 132)[1], COMM_PORT_BUSY)
+        self.assertLess(time.time() - start, 0.1)
+
+    def testLegacyFlagReleasesFromOtherThread(self):
+        # 旧代码：一个线程发送，另一个线程清除 is_using
+        thread = threading.Thread(target=self.ph.readTx, args=(self.port, 1, 132, 4))
+        thread.start()
+        thread.join()
+        self.assertTrue(self.port.is_using)
+
+        self.port.is_using = False
+        self.assertFalse(self.port.is_using)
+        self.assertEqual(self.ph.read4ByteTxRx(self.port, 1, 132)[1], COMM_SUCCESS)
+
+    def testBusyPort(self):
+        thread = threading.Thread(target=self.port.holdBus)
+        thread.start()
+        thread.join()   # 占用总线的线程未释放
+        self.port.setBusTimeout(0)
+        self.assertEqual(self.ph.read4ByteTxRx(self.port, 1, 132)[1], COMM_PORT_BUSY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    mock = None
+
+import fake_port
+from dynamixel_sdk import PacketHandler, BusDaemon, BusClient, COMM_SUCCESS, COMM_TX_ERROR, COMM_TX_FAIL
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix socket is not available')
+class BusDaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, 'bus.sock')
+
+        self.bus = fake_port.FakeServoBus([1, 2, 3])
+        self.daemon = BusDaemon(self.socket_path, cycle_time=2.0)
+        self.daemon.addPort('bus0', fake_port.makeFakePort(self.bus), PacketHandler(2.0))
+        self.assertTrue(self.daemon.start())
+
+        self.client = BusClient(self.socket_path)
+        self.assertTrue(self.client.connect())
+
+    def tearDown(self):
+        self.client.close()
+        self.daemon.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def testReadWrite(self):
+        self.assertEqual(self.client.write('bus0', 2, 64, [1]), (COMM_SUCCESS, 0))
+        self.assertEqual(self.bus.memory[2][64], 1)
+        self.assertEqual(self.client.read('bus0', 2, 132, 4), ([2, 1, 2, 3], COMM_SUCCESS, 0))
+
+    def testInvalidRequests(self):
+        for request in ({'op': 'write', 'port': 'bus0', 'id': 1, 'address': 64, 'data': [300]},
+                        {'op': 'write', 'port': 'bus0', 'id': 1, 'address': 64, 'data': []},
+                        {'op': 'write', 'port': 'bus0', 'id': 1, 'address': 65535, 'data': [1, 2]},
+                        {'op': 'write', 'port': 'bus0', 'id': 1, 'address': 64, 'data': 'abc'},
+                        {'op': 'read', 'port': 'bus0', 'id': 300, 'address': 132, 'length': 4},
+                        {'op': 'read', 'port': 'bus0', 'id': 1, 'address': -1, 'length': 4},
+                        {'op': 'read', 'port': 'bus0', 'id': 1, 'address': 132, 'length': True},
+                        {'op': 'subscribe', 'port': 'bus0', 'ids': [], 'address': 132, 'length': 4},
+                        {'op': 'subscribe', 'port': 'bus0', 'ids': [1, '2'], 'address': 132, 'length': 4}):
+            self.assertEqual(self.client.request(request)['result'], COMM_TX_ERROR, request)
+
+        # 守护进程仍在运行
+        self.assertEqual(self.client.read('bus0', 1, 132, 4)[1], COMM_SUCCESS)
+
+    def testFailedTransactionDoesNotStopDaemon(self):
+        def fail(*args):
+            raise IOError('device disconnected')
+
+        bus = self.daemon.buses['bus0']
+        bus.ph.writeTxRx = fail
+        self.assertEqual(self.client.write('bus0', 1, 64, [1]), (COMM_TX_FAIL, 0))
+        self.assertFalse(bus.port.bus_arbiter.isLocked())
+
+        del bus.ph.writeTxRx
+        self.assertEqual(self.client.write('bus0', 1, 64, [1]), (COMM_SUCCESS, 0))
+        self.assertTrue(self.daemon.is_running)
+
+    def testSlowClientIsDropped(self):
+        # 不读取响应的客户端：响应积压后被断开，其他客户端与读写周期不受影响
+        slow = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        slow.connect(self.socket_path)
+        slow.settimeout(0.1)
+        request = (json.dumps({'op': 'ports'}) + '\n').encode() * 1000
+        try:
+            for _ in range(1000):
+                slow.sendall(request)
+        except (IOError, OSError):  # 守护进程已断开该客户端
+            pass
+
+        deadline = time.time() + 5.0
+        while len(self.daemon.clients) > 1 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.daemon.clients), 1)
+        slow.close()
+
+        self.assertEqual(self.client.read('bus0', 1, 132, 4)[1], COMM_SUCCESS)   # 读取在下一个周期执行
+
+    @unittest.skipIf(mock is None, 'unittest.mock is not available')
+    def testSubscribeWithoutSharedMemory(self):
+        with mock.patch('dynamixel_sdk.bus_daemon.SharedStateBlock', side_effect=OSError('no space')):
+            response = self.client.request({'op': 'subscribe', 'port': 'bus0', 'ids': [1], 'address': 132, 'length': 4})
+        self.assertEqual(response['result'], COMM_TX_FAIL)
+        self.assertEqual(self.daemon.buses['bus0'].subscriptions, {})
+        self.assertEqual(self.client.read('bus0', 1, 132, 4)[1], COMM_SUCCESS)
+
+    def testSocketInUse(self):
+        other = BusDaemon(self.socket_path)
+        self.assertFalse(other.open())
+        self.assertEqual(self.client.read('bus0', 1, 132, 4)[1], COMM_SUCCESS)
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix socket is not available')
+class StaleSocketTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, 'bus.sock')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def testStaleSocketIsReplaced(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()   # 不再监听，连接被拒绝
+
+        daemon = BusDaemon(self.socket_path)
+        self.assertTrue(daemon.open())
+        daemon.close()
+
+    def testOtherFileIsKept(self):
+        with open(self.socket_path, 'w') as f:
+            f.write('data')
+
+        self.assertFalse(BusDaemon(self.socket_path).open())
+        self.assertTrue(os.path.isfile(self.socket_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    mock = None
+
+import fake_port
+from dynamixel_sdk import (BusMultiplexer, GroupSyncRead, GroupSyncWrite, PacketHandler, bus_multiplexer,
+                           COMM_SUCCESS, COMM_RX_TIMEOUT, COMM_NOT_AVAILABLE)
+
+
+class BusMultiplexerTest(object):
+    # 两个端口：port_a 的设备均应答，port_b 的设备 12 不应答；子类提供 serial_class
+    def setUp(self):
+        self.bus_a = fake_port.FakeServoBus([1, 2])
+        self.bus_b = fake_port.FakeServoBus([11, 12], dead=[12])
+        self.port_a = fake_port.makeFakePort(self.bus_a, serial_class=self.serial_class)
+        self.port_b = fake_port.makeFakePort(self.bus_b, serial_class=self.serial_class)
+        self.ph = PacketHandler(2.0)
+        self.mux = BusMultiplexer()
+
+    def tearDown(self):
+        self.port_a.ser.close()
+        self.port_b.ser.close()
+
+    def makeRead(self, port, ids):
+        group = GroupSyncRead(port, self.ph, 132, 4)
+        for dxl_id in ids:
+            group.addParam(dxl_id)
+        return group
+
+    def testReadGroupsOnTwoPorts(self):
+        read_a = self.makeRead(self.port_a, [1, 2])
+        read_b = self.makeRead(self.port_b, [11, 12])
+        self.assertTrue(self.mux.addGroup(read_a))
+        self.assertTrue(self.mux.addGroup(read_b))
+        self.assertFalse(self.mux.addGroup(read_a))
+        self.assertEqual(self.mux.getPorts(), [self.port_a, self.port_b])
+
+        self.assertEqual(self.mux.txRxPacket(), COMM_RX_TIMEOUT)
+        self.assertEqual(self.mux.getResult(read_a), COMM_SUCCESS)
+        self.assertEqual(self.mux.getResult(read_b), COMM_RX_TIMEOUT)
+        self.assertEqual(read_a.getData(2, 132, 4), 0x03020102)
+        self.assertEqual(read_b.getFreshIds(), [11])
+        self.assertEqual(read_b.getData(11, 132, 4), 0x0302010B)
+
+    def testGroupsOnSamePortRunInOrder(self):
+        # 同一端口：先写入，后读取到写入的值；另一端口的组同时进行
+        write_a = GroupSyncWrite(self.port_a, self.ph, 132, 1)
+        write_a.addParam(1, [0x55])
+        read_a = self.makeRead(self.port_a, [1])
+        read_b = self.makeRead(self.port_b, [11])
+        for group in (write_a, read_a, read_b):
+            self.mux.addGroup(group)
+
+        self.assertEqual(self.mux.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.mux.getResult(write_a), COMM_SUCCESS)
+        self.assertEqual([instruction for _, instruction in self.bus_a.instructions], [0x83, 0x82])
+        self.assertEqual(read_a.getData(1, 132, 1), 0x55)
+        self.assertEqual(read_b.getData(11, 132, 1), 11)
+
+    def testRemoveGroup(self):
+        read_a = self.makeRead(self.port_a, [1])
+        self.mux.addGroup(read_a)
+        self.assertEqual(self.mux.txRxPacket(), COMM_SUCCESS)
+
+        self.mux.removeGroup(read_a)
+        self.assertEqual(self.mux.getResult(read_a), COMM_NOT_AVAILABLE)
+        self.assertEqual(self.mux.getPorts(), [])
+        self.assertEqual(self.mux.txRxPacket(), COMM_SUCCESS)
+
+    @unittest.skipIf(mock is None, 'unittest.mock is not available')
+    def testWaitForTimeout(self):
+        # 超时的端口不阻塞另一端口，周期约为单条总线的超时
+        read_a = self.makeRead(self.port_a, [1, 2])
+        read_b = self.makeRead(self.port_b, [12])
+        self.mux.addGroup(read_a)
+        self.mux.addGroup(read_b)
+
+        with mock.patch.object(bus_multiplexer.time, 'sleep', wraps=time.sleep) as sleep:
+            start = time.time()
+            self.assertEqual(self.mux.txRxPacket(), COMM_RX_TIMEOUT)
+            elapsed = time.time() - start
+
+        self.assertEqual(self.mux.getResult(read_a), COMM_SUCCESS)
+        self.assertEqual(self.mux.getResult(read_b), COMM_RX_TIMEOUT)
+        self.assertLess(elapsed, 0.1)
+        self.checkWait(sleep)
+
+
+class PollingMultiplexerTest(BusMultiplexerTest, unittest.TestCase):
+    # 端口没有文件描述符：以 MUX_POLL_INTERVAL 间隔轮询
+    serial_class = fake_port.FakeSerial
+
+    def checkWait(self, sleep):
+        self.assertIsNone(self.port_b.rx_fd)
+        self.assertTrue(sleep.called)
+        self.assertLessEqual(max(call[0][0] for call in sleep.call_args_list), bus_multiplexer.MUX_POLL_INTERVAL)
+
+
+class SelectMultiplexerTest(BusMultiplexerTest, unittest.TestCase):
+    # 端口有文件描述符：在 selector 上等待，不轮询
+    serial_class = fake_port.PipeSerial
+
+    def checkWait(self, sleep):
+        self.assertIsNotNone(self.port_b.rx_fd)
+        self.assertFalse(sleep.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
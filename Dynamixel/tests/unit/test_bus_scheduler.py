@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import threading
+import unittest
+
+import fake_port
+from dynamixel_sdk import BusScheduler, SCHED_CLASS_CONTROL, SCHED_CLASS_NORMAL, SCHED_CLASS_BACKGROUND
+
+
+class BusSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.port = fake_port.makeFakePort()
+        self.scheduler = BusScheduler(self.port)
+
+    def testClassOrder(self):
+        order = []
+        self.scheduler.submit(lambda: order.append('background'), SCHED_CLASS_BACKGROUND)
+        self.scheduler.submit(lambda: order.append('normal'), SCHED_CLASS_NORMAL)
+        self.scheduler.addPeriodic(lambda: order.append('control'))
+
+        self.scheduler.runCycle()
+        self.assertEqual(order, ['control', 'normal', 'background'])
+        self.assertEqual(self.scheduler.getPendingCount(), 1)   # 周期性通信保留
+
+    def testFailingJobCompletes(self):
+        def fail():
+            raise ValueError('bad request')
+
+        ran = []
+        job = self.scheduler.submit(fail, SCHED_CLASS_NORMAL)
+        other = self.scheduler.submit(lambda: ran.append(1) or 5, SCHED_CLASS_NORMAL)
+
+        self.scheduler.runCycle()
+        self.assertTrue(job.wait(0))
+        self.assertIsInstance(job.getError(), ValueError)
+        self.assertIsNone(job.result)
+        self.assertEqual(other.result, 5)
+        self.assertEqual(self.scheduler.getStats(SCHED_CLASS_NORMAL)['failed'], 1)
+        self.assertFalse(self.port.bus_arbiter.isLocked())
+
+    def testFailingPeriodicJobKeepsRunning(self):
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise RuntimeError()
+
+        job = self.scheduler.addPeriodic(fail)
+        self.scheduler.runCycle()
+        self.scheduler.runCycle()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(job.error_count, 2)
+        self.assertFalse(job.isDone())
+
+    def testBusHeldByOtherThread(self):
+        held, release = threading.Event(), threading.Event()
+
+        def holder():
+            self.port.holdBus()
+            held.set()
+            release.wait()
+            self.port.unholdBus()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        held.wait()
+        try:
+            self.port.setBusTimeout(None)   # 等待总线的时间仍不超过周期
+            job = self.scheduler.addPeriodic(lambda: None, SCHED_CLASS_CONTROL)
+            used = self.scheduler.runCycle()
+            self.assertGreaterEqual(used, self.scheduler.cycle_time_ns)
+            self.assertLess(used, 100 * 1000000)
+            self.assertEqual(job.run_count, 0)
+            self.assertEqual(self.scheduler.busy_count, 1)
+        finally:
+            release.set()
+            thread.join()
+
+        self.scheduler.runCycle()
+        self.assertEqual(job.run_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+import multiprocessing
+import os
+import select
+import sys
+import time
+import unittest
+
+import fake_port
+import dynamixel_sdk
+from dynamixel_sdk import COMM_SUCCESS, COMM_TX_FAIL
+
+try:
+    import pty
+    import tty
+except ImportError:
+    pty = None
+
+
+def servePty(master, bus):
+    # 伪终端主端：按数据包应答
+    buf = bytearray()
+    while True:
+        select.select([master], [], [])
+        try:
+            buf += os.read(master, 1024)
+        except OSError:     # 工作进程尚未打开端口
+            time.sleep(0.01)
+            continue
+
+        while True:
+            start = buf.find(b'\xff\xff\xfd\x00')
+            if start < 0 or len(buf) < start + 7:
+                break
+            end = start + 7 + (buf[start + 5] | (buf[start + 6] << 8))
+            if len(buf) < end:
+                break
+            reply = bus.handle(buf[start: end])
+            del buf[0: end]
+            if reply:
+                os.write(master, reply)
+
+
+class PtyServoBus(object):
+    """
+    通过伪终端连接 FakeServoBus，工作进程像打开真实串口一样打开 port_name
+    主端只由应答进程持有，结束该进程即相当于拔出 USB 串口
+    """
+    def __init__(self, bus):
+        master, slave = pty.openpty()
+        tty.setraw(slave)
+        self.port_name = os.ttyname(slave)
+        os.close(slave)
+        self.process = multiprocessing.Process(target=servePty, args=(master, bus))
+        self.process.daemon = True
+        self.process.start()
+        os.close(master)
+
+    def close(self):
+        self.process.terminate()
+        self.process.join()
+
+
+def waitUntil(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@unittest.skipUnless(sys.version_info >= (3, 8) and pty is not None and sys.platform.startswith('linux'),
+                     'requires multiprocessing.shared_memory and a Linux pseudo terminal')
+class BusWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1, 2, 3], dead=[3])
+        self.pty_bus = PtyServoBus(self.bus)
+        self.worker = dynamixel_sdk.BusWorker(self.pty_bus.port_name, 2.0, [1, 2, 3], 132, 4,
+                                              write_address=64, write_length=1, baudrate=57600, cycle_time=2.0)
+
+    def tearDown(self):
+        self.worker.stop()
+        self.pty_bus.close()
+
+    def testStartStop(self):
+        self.assertTrue(self.worker.start())
+        self.assertTrue(self.worker.isAlive())
+        self.assertFalse(self.worker.start())   # 已启动
+
+        self.assertTrue(waitUntil(lambda: self.worker.getCycleCount() >= 3))
+        self.assertEqual(self.worker.getData(2, 132, 4), 0x03020102)
+        self.assertNotEqual(self.worker.getState(3)[1], COMM_SUCCESS)     # 未应答的设备
+        self.assertFalse(self.worker.isAvailable(3, 132, 4))
+
+        self.worker.stop()
+        self.assertFalse(self.worker.isAlive())
+        self.assertIsNone(self.worker.getStateBlockName())
+        self.assertEqual(self.worker.getData(2, 132, 4), 0)
+
+    def testCommand(self):
+        # 目标指令写入读取区域，由下一周期的读取结果确认
+        worker = dynamixel_sdk.BusWorker(self.pty_bus.port_name, 2.0, [1, 2], 132, 4,
+                                         write_address=132, write_length=1, baudrate=57600, cycle_time=2.0)
+        try:
+            self.assertTrue(worker.start())
+            self.assertTrue(worker.setCommand(1, [0x55]))
+            self.assertFalse(worker.setCommand(1, [1, 2]))
+            self.assertFalse(worker.setCommand(9, [1]))
+            self.assertTrue(waitUntil(lambda: worker.getData(1, 132, 1) == 0x55))
+            self.assertEqual(worker.getData(2, 132, 1), 2)
+        finally:
+            worker.stop()
+
+    def testOpenFailure(self):
+        worker = dynamixel_sdk.BusWorker('/dev/nonexistent-dxl-port', 2.0, [1], 132, 4)
+        self.assertFalse(worker.start())
+        self.assertFalse(worker.isAlive())
+
+    def testPortDisconnected(self):
+        self.assertTrue(self.worker.start())
+        self.assertTrue(waitUntil(lambda: self.worker.getCycleCount() >= 1))
+
+        # 通信中端口断开：工作进程记录 COMM_TX_FAIL 后退出，不留下异常
+        self.pty_bus.close()
+        self.assertTrue(waitUntil(lambda: not self.worker.isAlive()))
+        self.assertEqual(self.worker.getLastResult(), COMM_TX_FAIL)
+        self.assertGreaterEqual(self.worker.getCycleCount(), 1)
+        self.assertEqual(self.worker.process.exitcode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
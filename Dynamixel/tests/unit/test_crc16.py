@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import unittest
+
+import fake_port
+from dynamixel_sdk import CRC16, updateCRC, verifyCRC, verifyCRCBatch, byteView
+
+
+class CRC16Test(unittest.TestCase):
+    def setUp(self):
+        self.packet = fake_port.makeStatusPacket(1, 0, [0x12, 0x34, 0xff, 0xff, 0xfd])
+        self.expected = fake_port.crc16(self.packet[:-2])
+
+    def testAllInputTypes(self):
+        length = len(self.packet) - 2
+        for data in (bytes(self.packet), bytearray(self.packet), memoryview(bytes(self.packet)),
+                     list(self.packet), byteView(self.packet)):
+            self.assertEqual(updateCRC(0, data, length), self.expected)
+
+    def testListValuesAreMasked(self):
+        # list 中超出一个字节的值只取低 8 位
+        length = len(self.packet) - 2
+        data = [byte + 0x100 for byte in self.packet]
+        self.assertEqual(updateCRC(0, data, length), self.expected)
+        self.assertEqual(updateCRC(0, [-1], 1), updateCRC(0, [0xFF], 1))
+
+    def testOffset(self):
+        data = bytearray(b'\x00' * 5) + self.packet
+        self.assertEqual(updateCRC(0, data, len(self.packet) - 2, 5), self.expected)
+
+    def testIncremental(self):
+        crc = CRC16()
+        crc.update(self.packet, 4)
+        partial = crc.copy()
+        crc.update(self.packet, len(self.packet) - 6, 4)
+        self.assertEqual(crc.getCRC(), self.expected)
+
+        partial.update(self.packet[4: -2])
+        self.assertEqual(partial.getCRC(), self.expected)
+
+    def testVerify(self):
+        self.assertTrue(verifyCRC(self.packet, len(self.packet)))
+
+        corrupt = bytearray(self.packet)
+        corrupt[8] ^= 0x01
+        self.assertFalse(verifyCRC(corrupt, len(corrupt)))
+        self.assertEqual(list(verifyCRCBatch([self.packet, corrupt, self.packet])), [True, False, True])
+
+
+class ByteViewTest(unittest.TestCase):
+    def testElementsAreIntegers(self):
+        view = byteView(bytearray(b'\x01\xfe'))
+        self.assertEqual([view[0], view[1]], [1, 254])
+        self.assertEqual(list(view[1:]), [254])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import unittest
+
+import fake_port
+from dynamixel_sdk import (PacketHandler, GroupSyncRead, GroupBulkRead, HealthTracker,
+                           COMM_SUCCESS, COMM_RX_TIMEOUT, COMM_RX_CORRUPT)
+from dynamixel_sdk.protocol2_packet_handler import Protocol2StatusParser
+
+FAST_INSTRUCTIONS = (0x8A, 0x9A)
+CLASSIC_INSTRUCTIONS = (0x82, 0x92)
+
+
+class FastReadPacketTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1, 2, 3])
+        self.ph = PacketHandler(2.0)
+
+    def parse(self, reads, data_lengths):
+        status, = Protocol2StatusParser().feed(self.bus.groupRead(reads, True))
+        return self.ph.parseFastReadPacket(status.packet, data_lengths)
+
+    def testParse(self):
+        self.bus.errors[2] = 0x80
+        data_list, result = self.parse([(1, 132, 4), (2, 0, 2), (3, 133, 3)], [4, 2, 3])
+        self.assertEqual(result, COMM_SUCCESS)
+        self.assertEqual(sorted(data_list), [1, 2, 3])
+        self.assertEqual(list(data_list[1][0]), [1, 1, 2, 3])
+        self.assertEqual([list(data_list[2][0]), data_list[2][1]],
+                         [[fake_port.MODEL_NUMBER & 0xFF, fake_port.MODEL_NUMBER >> 8], 0x80])
+        self.assertEqual(list(data_list[3][0]), [1, 2, 3])
+
+    def testStuffedData(self):
+        # 数据中的 FF FF FD 经过字节填充
+        self.bus.memory[2][132: 136] = bytearray([0xff, 0xff, 0xfd, 0x00])
+        data_list, result = self.parse([(1, 132, 4), (2, 132, 4)], [4, 4])
+        self.assertEqual(result, COMM_SUCCESS)
+        self.assertEqual(list(data_list[2][0]), [0xff, 0xff, 0xfd, 0x00])
+
+    def testLengthMismatch(self):
+        self.assertEqual(self.parse([(1, 132, 4), (2, 132, 4)], [4, 2]), ({}, COMM_RX_CORRUPT))
+        self.assertEqual(self.parse([(1, 132, 4)], [4, 4])[1], COMM_RX_CORRUPT)
+
+    def testNotBroadcast(self):
+        packet = fake_port.makePacket(1, 0x55, [0x00, 1, 1, 1, 2, 3])     # 长度正确，ID 不是广播 ID
+        self.assertEqual(self.ph.parseFastReadPacket(packet, [4]), ({}, COMM_RX_CORRUPT))
+
+
+class FastReadFallbackTest(object):
+    # Fast Sync Read / Fast Bulk Read 共用的测试，子类提供 makeGroup
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1, 2, 3])
+        self.port = fake_port.makeFakePort(self.bus)
+        self.group = self.makeGroup()
+        for dxl_id in (1, 2, 3):
+            self.addParam(dxl_id)
+
+    def lastInstruction(self):
+        return self.bus.instructions[-1][1]
+
+    def testFastRead(self):
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIn(self.lastInstruction(), FAST_INSTRUCTIONS)
+        self.assertIs(self.group.fast_read_supported, True)
+        self.assertEqual(self.group.getData(2, 132, 4), 0x03020102)
+
+    def testDeadServoAfterFastReadFallsBack(self):
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+
+        # 设备 2 掉线：同一周期内改用普通读取，其他设备的数据仍然更新
+        self.bus.dead.add(2)
+        self.bus.memory[1][132] = 0x11
+        self.assertNotEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIn(self.lastInstruction(), CLASSIC_INSTRUCTIONS)
+        self.assertEqual(self.group.getFreshIds(), [1, 3])
+        self.assertEqual(self.group.getData(1, 132, 1), 0x11)
+
+        # 设备 2 未恢复前继续使用普通读取
+        self.bus.memory[3][132] = 0x33
+        self.group.txRxPacket()
+        self.assertIn(self.lastInstruction(), CLASSIC_INSTRUCTIONS)
+        self.assertEqual(self.group.getFreshIds(), [1, 3])
+        self.assertEqual(self.group.getData(3, 132, 1), 0x33)
+
+        # 设备 2 恢复后回到 Fast 读取
+        self.bus.dead.discard(2)
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIn(self.lastInstruction(), FAST_INSTRUCTIONS)
+        self.assertIs(self.group.fast_read_supported, True)
+
+    def testUnsupportedFastRead(self):
+        self.bus.fast_read = False
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIs(self.group.fast_read_supported, False)
+        self.assertEqual(self.group.getFreshIds(), [1, 2, 3])
+
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIn(self.lastInstruction(), CLASSIC_INSTRUCTIONS)
+        self.assertEqual(len([1 for _, instruction in self.bus.instructions if instruction in FAST_INSTRUCTIONS]), 1)
+
+    def testFastReadStopsWorking(self):
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIs(self.group.fast_read_supported, True)
+
+        # 固件不再应答 Fast 读取而普通读取正常：不再每周期先发送一次 Fast 读取
+        self.bus.fast_read = False
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIs(self.group.fast_read_supported, False)
+        fast_count = len([1 for _, instruction in self.bus.instructions if instruction in FAST_INSTRUCTIONS])
+
+        for _ in range(3):
+            self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+            self.assertIn(self.lastInstruction(), CLASSIC_INSTRUCTIONS)
+        self.assertEqual(len([1 for _, instruction in self.bus.instructions if instruction in FAST_INSTRUCTIONS]),
+                         fast_count)
+
+        # setFastRead() 重新探测
+        self.bus.fast_read = True
+        self.group.setFastRead(True)
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIn(self.lastInstruction(), FAST_INSTRUCTIONS)
+
+    def testDeadServoAtStartDoesNotDisableFastRead(self):
+        # 首次 Fast 读取失败由掉线设备引起，不能判定为不支持
+        self.bus.dead.add(2)
+        self.assertNotEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIsNone(self.group.fast_read_supported)
+
+        self.bus.dead.discard(2)
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIsNone(self.group.fast_read_supported)
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIn(self.lastInstruction(), FAST_INSTRUCTIONS)
+        self.assertIs(self.group.fast_read_supported, True)
+
+    def testDeadServoInFastReadIsQuarantined(self):
+        health_tracker = HealthTracker(max_timeouts=2)
+        self.port.setHealthTracker(health_tracker)
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+
+        self.bus.dead.add(2)
+        self.group.txRxPacket()
+        self.assertEqual(health_tracker.getTimeoutCount(2), 1)
+        self.group.txRxPacket()
+        self.assertTrue(health_tracker.isQuarantined(2))
+        self.assertEqual(health_tracker.getTimeoutCount(1), 0)
+
+        # 隔离后其他设备回到 Fast 读取
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+        self.assertIn(self.lastInstruction(), FAST_INSTRUCTIONS)
+        self.assertEqual(self.group.getFreshIds(), [1, 3])
+
+    def testServoMissingFromFastDataIsReported(self):
+        health_tracker = HealthTracker(max_timeouts=1)
+        self.port.setHealthTracker(health_tracker)
+        self.assertEqual(self.group.txRxPacket(), COMM_SUCCESS)
+
+        data = bytearray([9, 9, 9, 9])
+        self.assertNotEqual(self.group.setFastDataList({1: [data, 0], 3: [data, 0]}, COMM_SUCCESS), COMM_SUCCESS)
+        self.assertEqual(self.group.getRxResult(2)[0], COMM_RX_TIMEOUT)
+        self.assertTrue(health_tracker.isQuarantined(2))
+        self.assertEqual(self.group.getFreshIds(), [1, 3])
+        self.assertEqual(self.group.getData(3, 132, 4), 0x09090909)
+
+
+class GroupSyncReadFallbackTest(FastReadFallbackTest, unittest.TestCase):
+    def makeGroup(self):
+        return GroupSyncRead(self.port, PacketHandler(2.0), 132, 4, fast_read=True)
+
+    def addParam(self, dxl_id):
+        self.assertTrue(self.group.addParam(dxl_id))
+
+
+class GroupBulkReadFallbackTest(FastReadFallbackTest, unittest.TestCase):
+    def makeGroup(self):
+        return GroupBulkRead(self.port, PacketHandler(2.0), fast_read=True)
+
+    def addParam(self, dxl_id):
+        self.assertTrue(self.group.addParam(dxl_id, 132, 4))
+
+
+
+class PartialReadFailureTest(unittest.TestCase):
+    # 一个设备超时，其他设备的数据仍可通过 group 接口读取
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1, 2, 3])
+        self.port = fake_port.makeFakePort(self.bus)
+
+    def checkPartialFailure(self, group):
+        self.assertEqual(group.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(group.getData(2, 132, 1), 2)
+
+        self.bus.dead.add(2)
+        self.bus.memory[1][132] = 0x11
+        self.bus.memory[3][132] = 0x33
+        self.assertEqual(group.txRxPacket(), COMM_RX_TIMEOUT)
+        self.assertFalse(group.last_result)
+
+        self.assertEqual(group.getFreshIds(), [1, 3])
+        self.assertEqual(group.getData(1, 132, 4), 0x03020111)
+        self.assertEqual(group.getData(3, 132, 4), 0x03020133)
+        self.assertTrue(group.isAvailable(3, 132, 4))
+        self.assertFalse(group.isAvailable(2, 132, 4))
+        self.assertEqual(group.getData(2, 132, 4), 0)
+        self.assertEqual(group.getRxResult(2)[0], COMM_RX_TIMEOUT)
+        self.assertEqual(group.getRxResult(3)[0], COMM_SUCCESS)
+
+        # 设备恢复后下一周期即可读取
+        self.bus.dead.discard(2)
+        self.assertEqual(group.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(group.getFreshIds(), [1, 2, 3])
+
+    def testGroupSyncRead(self):
+        group = GroupSyncRead(self.port, PacketHandler(2.0), 132, 4)
+        for dxl_id in (1, 2, 3):
+            group.addParam(dxl_id)
+        self.checkPartialFailure(group)
+        self.assertIsInstance(group.data_dict[1], list)
+
+    def testGroupBulkRead(self):
+        group = GroupBulkRead(self.port, PacketHandler(2.0))
+        for dxl_id in (1, 2, 3):
+            group.addParam(dxl_id, 132, 4)
+        self.checkPartialFailure(group)
+        self.assertIsInstance(group.data_dict[1][0], list)
+
+    def testFastReadDataIsList(self):
+        group = GroupSyncRead(self.port, PacketHandler(2.0), 132, 4, fast_read=True)
+        for dxl_id in (1, 2, 3):
+            group.addParam(dxl_id)
+        self.assertEqual(group.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(group.data_dict[2], [2, 1, 2, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import unittest
+
+import fake_port
+from dynamixel_sdk import PacketHandler, HealthTracker, COMM_SUCCESS, COMM_RX_TIMEOUT, COMM_RX_CORRUPT
+
+
+class HealthTrackerTest(unittest.TestCase):
+    def testQuarantineAfterConsecutiveTimeouts(self):
+        tracker = HealthTracker(max_timeouts=3)
+        for _ in range(2):
+            tracker.reportResult(1, COMM_RX_TIMEOUT)
+        tracker.reportResult(1, COMM_SUCCESS)   # 成功后重新计数
+        tracker.reportResult(1, COMM_RX_TIMEOUT)
+        tracker.reportResult(1, COMM_RX_TIMEOUT)
+        self.assertFalse(tracker.isQuarantined(1))
+
+        version = tracker.version
+        tracker.reportResult(1, COMM_RX_TIMEOUT)
+        self.assertTrue(tracker.isQuarantined(1))
+        self.assertEqual(tracker.version, version + 1)
+        self.assertEqual(tracker.filterIds([1, 2]), [2])
+
+    def testOnlyTimeoutsCount(self):
+        tracker = HealthTracker(max_timeouts=1)
+        tracker.reportResult(1, COMM_RX_CORRUPT)
+        self.assertFalse(tracker.isQuarantined(1))
+        self.assertEqual(tracker.getTimeoutCount(1), 0)
+
+    def testReprobe(self):
+        bus = fake_port.FakeServoBus([1, 2], dead=[2])
+        port = fake_port.makeFakePort(bus)
+        tracker = HealthTracker(max_timeouts=1, reprobe_interval=0)
+        port.setHealthTracker(tracker)
+        tracker.reportResult(1, COMM_RX_TIMEOUT)
+        tracker.reportResult(2, COMM_RX_TIMEOUT)
+
+        self.assertEqual(tracker.reprobe(port, PacketHandler(2.0)), [1])
+        self.assertEqual(tracker.getQuarantinedIds(), [2])
+
+    def testReprobeWaitsForInterval(self):
+        tracker = HealthTracker(max_timeouts=1, reprobe_interval=1000)
+        tracker.reportResult(1, COMM_RX_TIMEOUT)
+        self.assertFalse(tracker.isProbeDue(1))
+        self.assertEqual(tracker.getProbeIds(), [])
+        self.assertFalse(tracker.isReachable(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import os
+import platform
+import shutil
+import tempfile
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    mock = None
+
+import fake_port
+from dynamixel_sdk import (PortHandler, PacketHandler, COMM_SUCCESS,
+                           TX_END_TIMING_NONE, TX_END_TIMING_DRAIN, TX_END_TIMING_COMPUTED)
+
+
+@unittest.skipUnless(platform.system() == 'Linux' and hasattr(os, 'openpty'), 'termios2 is Linux only')
+class CustomBaudrateTest(unittest.TestCase):
+    def setUp(self):
+        self.master, slave = os.openpty()
+        self.slave_path = os.ttyname(slave)
+        self.slave = slave
+        self.port = PortHandler(self.slave_path)
+
+    def tearDown(self):
+        if self.port.is_open:
+            self.port.closePort()
+        os.close(self.master)
+        os.close(self.slave)
+
+    def testRejectedRateRestoresPreviousBaudrate(self):
+        self.assertTrue(self.port.setBaudRate(57600))
+        self.port.writeTermios2Speed = lambda baudrate: False   # 驱动拒绝该波特率
+
+        self.assertFalse(self.port.setBaudRate(1500000))
+        self.assertTrue(self.port.is_open)
+        self.assertEqual(self.port.getBaudRate(), 57600)
+        self.assertAlmostEqual(self.port.tx_time_per_byte, 10000.0 / 57600)
+
+    def testRejectedRateOnOpenClosesPort(self):
+        self.port.baudrate = 1500000
+        self.port.writeTermios2Speed = lambda baudrate: False
+
+        self.assertFalse(self.port.openPort())
+        self.assertFalse(self.port.is_open)
+
+
+class PacketTimeoutTest(unittest.TestCase):
+    def testTimeoutUsesActualBaudrate(self):
+        port = fake_port.makeFakePort(baudrate=57600)
+        port.setPacketTimeout(10)
+        self.assertAlmostEqual(port.packet_timeout, 10 * 10000.0 / 57600 + 2.0 + 2.0, places=4)
+        self.assertFalse(port.isPacketTimeout())
+
+    def testPacketStartTimeInMilliseconds(self):
+        port = fake_port.makeFakePort()
+        port.setPacketTimeoutMillis(5)
+        self.assertEqual(port.packet_start_time, port.packet_start_time_ns / 1000000.0)
+        self.assertAlmostEqual(port.getCurrentTime() - port.packet_start_time, port.getTimeSinceStart(), delta=1.0)
+
+        with self.assertRaises(AttributeError):     # 只读
+            port.packet_start_time = 0
+
+
+@unittest.skipUnless(hasattr(os, 'pipe'), 'pipe is not available')
+class EventDrivenRxTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1])
+        self.port = fake_port.makeFakePort(self.bus, serial_class=fake_port.PipeSerial)
+
+    def tearDown(self):
+        self.port.ser.close()
+
+    def testEnable(self):
+        self.assertIsNotNone(self.port.rx_fd)
+        self.assertTrue(self.port.setEventDrivenRx(True))
+        self.assertTrue(self.port.isEventDrivenRx())
+
+        self.assertEqual(PacketHandler(2.0).read4ByteTxRx(self.port, 1, 132), (0x03020101, COMM_SUCCESS, 0))
+
+        self.assertTrue(self.port.setEventDrivenRx(False))
+        self.assertFalse(self.port.isEventDrivenRx())
+
+    def testNoFileDescriptor(self):
+        # 没有文件描述符的串口：不能启用，继续轮询接收
+        port = fake_port.makeFakePort(self.bus)
+        self.assertIsNone(port.rx_fd)
+        self.assertFalse(port.setEventDrivenRx(True))
+        self.assertFalse(port.isEventDrivenRx())
+
+        start = time.time()
+        port.setPacketTimeoutMillis(50)
+        port.waitForData()      # 立即返回
+        self.assertLess(time.time() - start, 0.04)
+        self.assertEqual(PacketHandler(2.0).read4ByteTxRx(port, 1, 132), (0x03020101, COMM_SUCCESS, 0))
+
+    def testWaitForDataReturnsWhenReadable(self):
+        self.port.setEventDrivenRx(True)
+        self.port.ser.inject(b'\xff')
+        start = time.time()
+        self.port.setPacketTimeoutMillis(500)
+        self.port.waitForData()
+        self.assertLess(time.time() - start, 0.4)
+        self.assertEqual(self.port.readPort(1), bytearray(b'\xff'))
+
+    def testWaitForDataTimeout(self):
+        self.port.setEventDrivenRx(True)
+        for rx_poller in (self.port.rx_poller, None):   # poll，以及不支持 poll 时的 select
+            self.port.rx_poller = rx_poller
+            start = time.time()
+            self.port.setPacketTimeoutMillis(20)
+            self.port.waitForData()
+            self.assertGreaterEqual(time.time() - start, 0.015)
+            self.assertLess(time.time() - start, 0.5)
+
+    def testWaitForDataAfterTimeout(self):
+        self.port.setEventDrivenRx(True)
+        self.port.setPacketTimeoutMillis(0)
+        start = time.time()
+        self.port.waitForData()
+        self.assertLess(time.time() - start, 0.01)
+
+class LowLatencySerial(fake_port.FakeSerial):
+    # 记录 ASYNC_LOW_LATENCY 的设置
+    def __init__(self, bus=None):
+        fake_port.FakeSerial.__init__(self, bus)
+        self.low_latency_mode = False
+
+    def set_low_latency_mode(self, enable):
+        self.low_latency_mode = enable
+
+
+@unittest.skipUnless(platform.system() == 'Linux', 'low latency mode is Linux only')
+class LowLatencyTest(unittest.TestCase):
+    def setUp(self):
+        # 临时文件代替 /sys/bus/usb-serial/devices/ttyUSB0/latency_timer
+        self.tmpdir = tempfile.mkdtemp()
+        self.sysfs_path = os.path.join(self.tmpdir, 'latency_timer')
+        self.writeSysfs('16')
+
+        self.port = fake_port.makeFakePort(serial_class=LowLatencySerial)
+        self.port.getSysfsLatencyTimerPath = lambda: self.sysfs_path
+        self.port.setLatencyTimer(16)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def writeSysfs(self, value):
+        with open(self.sysfs_path, 'w') as f:
+            f.write(value + '\n')
+
+    def readSysfs(self):
+        with open(self.sysfs_path) as f:
+            return f.read().strip()
+
+    def testEnableAndRestore(self):
+        self.assertTrue(self.port.setLowLatency(True))
+        self.assertTrue(self.port.isLowLatency())
+        self.assertEqual(self.readSysfs(), '1')
+        self.assertEqual(self.port.getLatencyTimer(), 1)
+        self.assertTrue(self.port.ser.low_latency_mode)
+
+        # 关闭时恢复原来的值
+        self.assertTrue(self.port.setLowLatency(False))
+        self.assertFalse(self.port.isLowLatency())
+        self.assertEqual(self.readSysfs(), '16')
+        self.assertEqual(self.port.getLatencyTimer(), 16)
+        self.assertFalse(self.port.ser.low_latency_mode)
+
+    def testEnableTwiceKeepsOriginalValue(self):
+        self.port.setLowLatency(True)
+        self.port.setLowLatency(True, 2)
+        self.assertEqual(self.readSysfs(), '2')
+        self.port.setLowLatency(False)
+        self.assertEqual(self.readSysfs(), '16')
+
+    def testClosedPortAppliesOnOpen(self):
+        self.port.is_open = False
+        self.assertTrue(self.port.setLowLatency(True))
+        self.assertEqual(self.readSysfs(), '16')    # 打开端口时才设置
+        self.assertTrue(self.port.isLowLatency())
+
+    def testReadOnlySysfs(self):
+        # 无写入权限且串口不支持 ASYNC_LOW_LATENCY：设置失败，保持原来的延迟
+        port = fake_port.makeFakePort()
+        port.getSysfsLatencyTimerPath = lambda: self.sysfs_path
+        port.setLatencyTimer(16)
+        os.chmod(self.sysfs_path, 0o444)
+        if os.access(self.sysfs_path, os.W_OK):     # root 忽略文件权限
+            self.skipTest('file permissions are not enforced')
+
+        self.assertFalse(port.setLowLatency(True))
+        self.assertEqual(self.readSysfs(), '16')
+        self.assertEqual(port.getLatencyTimer(), 16)
+
+    def testNoSysfs(self):
+        # 不是 USB 串口：只设置 ASYNC_LOW_LATENCY
+        self.port.getSysfsLatencyTimerPath = lambda: None
+        self.assertTrue(self.port.setLowLatency(True))
+        self.assertTrue(self.port.ser.low_latency_mode)
+        self.assertEqual(self.port.getLatencyTimer(), 16)
+        self.assertTrue(self.port.setLowLatency(False))
+
+class OutWaitingSerial(fake_port.FakeSerial):
+    # 驱动中尚有未发出的字节
+    out_waiting = 0
+
+
+@unittest.skipIf(mock is None, 'unittest.mock is not available')
+class TxEndTimingTest(unittest.TestCase):
+    def setUp(self):
+        self.port = fake_port.makeFakePort(baudrate=1000000, serial_class=OutWaitingSerial)
+        self.byte_time_ns = self.port.tx_time_per_byte * 1000000    # 1 Mbps: 10 us / byte
+        self.now = mock.patch('dynamixel_sdk.port_handler.monotonicNs', return_value=1000000)
+        self.now.start()
+
+    def tearDown(self):
+        self.now.stop()
+
+    def testNoneStartsTimeoutAtWrite(self):
+        self.assertEqual(self.port.getTxEndTiming(), TX_END_TIMING_NONE)
+        self.port.writePort(bytearray(10))
+        self.port.setPacketTimeoutMillis(1)
+        self.assertEqual(self.port.packet_start_time_ns, 1000000)
+
+    def testComputedTxEnd(self):
+        self.assertTrue(self.port.setTxEndTiming(TX_END_TIMING_COMPUTED))
+        self.port.writePort(bytearray(10))
+        self.assertEqual(self.port.tx_end_time_ns, 1000000 + int(10 * self.byte_time_ns))
+
+        # 上一个数据包尚未发完：排在其后
+        self.port.writePort(bytearray(5))
+        self.assertEqual(self.port.tx_end_time_ns, 1000000 + int(10 * self.byte_time_ns) + int(5 * self.byte_time_ns))
+
+        # 超时从发送完成时刻开始计时
+        self.port.setPacketTimeoutMillis(1)
+        self.assertEqual(self.port.packet_start_time_ns, self.port.tx_end_time_ns)
+        self.assertEqual(self.port.packet_deadline_ns, self.port.tx_end_time_ns + 1000000)
+
+    def testComputedTxEndUsesOutWaiting(self):
+        self.port.setTxEndTiming(TX_END_TIMING_COMPUTED)
+        self.port.ser.out_waiting = 100     # 驱动报告的待发送字节多于本次写入
+        self.port.writePort(bytearray(10))
+        self.assertEqual(self.port.tx_end_time_ns, 1000000 + int(100 * self.byte_time_ns))
+
+    def testDrainWaitsForFlush(self):
+        self.port.setTxEndTiming(TX_END_TIMING_DRAIN)
+        with mock.patch.object(self.port.ser, 'flush') as flush:
+            self.port.writePort(bytearray(10))
+        self.assertTrue(flush.called)
+        self.assertEqual(self.port.tx_end_time_ns, 1000000)
+
+    def testSetTxEndTimingResetsTxEnd(self):
+        self.port.setTxEndTiming(TX_END_TIMING_COMPUTED)
+        self.port.writePort(bytearray(10))
+        self.port.setTxEndTiming(TX_END_TIMING_COMPUTED)
+        self.assertEqual(self.port.tx_end_time_ns, 0)
+
+if __name__ == '__main__':
+    unittest.main()
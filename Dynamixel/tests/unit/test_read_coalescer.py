@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import unittest
+
+import fake_port
+from dynamixel_sdk import PacketHandler, ReadCoalescer, mergeReadWindows, COMM_SUCCESS, COMM_TX_FAIL
+
+
+class MergeReadWindowsTest(unittest.TestCase):
+    def testMerge(self):
+        windows = mergeReadWindows([([1, 2], 132, 4), ([2], 128, 4), ([3], 64, 1)])
+        self.assertEqual(windows, {1: [132, 136], 2: [128, 136], 3: [64, 65]})
+
+
+class ReadCoalescerTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1, 2, 3])
+        self.port = fake_port.makeFakePort(self.bus)
+        self.coalescer = ReadCoalescer(self.port, PacketHandler(2.0))
+
+    def enqueue(self, *requests):
+        return [self.coalescer.enqueue(*request)[0] for request in requests]
+
+    def getInstructions(self):
+        return [instruction for _, instruction in self.bus.instructions]
+
+    def testSingleRequestUsesRead(self):
+        self.assertEqual(self.coalescer.read4Byte(2, 132), (0x03020102, COMM_SUCCESS, 0))
+        self.assertEqual(self.getInstructions(), [0x02])
+
+    def testSameRegionUsesSyncRead(self):
+        futures = self.enqueue((1, 132, 4), (2, 132, 4), (3, 132, 4))
+        self.coalescer.flush()
+
+        self.assertEqual(self.getInstructions(), [0x82])
+        self.assertEqual(futures[0].wait(0), ([1, 1, 2, 3], COMM_SUCCESS, 0))
+        self.assertEqual(futures[2].wait(0), ([3, 1, 2, 3], COMM_SUCCESS, 0))
+
+    def testDifferentRegionsUseBulkRead(self):
+        futures = self.enqueue((1, 132, 4), (1, 0, 2), (2, 134, 2))
+        self.coalescer.flush()
+
+        self.assertEqual(self.getInstructions(), [0x92])
+        self.assertEqual(futures[1].wait(0), ([fake_port.MODEL_NUMBER & 0xFF, fake_port.MODEL_NUMBER >> 8],
+                                               COMM_SUCCESS, 0))
+        self.assertEqual(futures[2].wait(0), ([2, 3], COMM_SUCCESS, 0))
+
+    def testExceptionResolvesFutures(self):
+        def fail(data):
+            raise IOError('device disconnected')
+
+        self.port.ser.write = fail
+        futures = self.enqueue((1, 132, 4), (2, 132, 4))
+        self.assertRaises(IOError, self.coalescer.flush)
+
+        for future in futures:
+            self.assertTrue(future.isDone())
+            self.assertEqual(future.wait(0), ([], COMM_TX_FAIL, 0))
+        self.assertEqual(self.coalescer.pending, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import unittest
+
+import fake_port
+from dynamixel_sdk import (PacketHandler, ReadPlanner, COMM_SUCCESS, COMM_NOT_AVAILABLE, COMM_RX_TIMEOUT,
+                           READ_PLAN_PER_ID, READ_PLAN_SYNC, READ_PLAN_BULK, READ_PLAN_FAST_SYNC, READ_PLAN_FAST_BULK)
+
+
+class ReadPlannerTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus(range(1, 9))
+        self.port = fake_port.makeFakePort(self.bus)
+        self.planner = ReadPlanner(self.port, PacketHandler(2.0))
+
+    def addFields(self, ids, address, length):
+        for dxl_id in ids:
+            self.assertTrue(self.planner.addParam(dxl_id, address, length))
+
+    def testEmpty(self):
+        self.assertEqual(self.planner.txRxPacket(), COMM_NOT_AVAILABLE)
+        self.assertEqual(self.planner.estimateCosts(), {})
+
+    def testSingleIdUsesRead(self):
+        self.addFields([1], 132, 4)
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_PER_ID)
+        self.assertEqual(self.planner.getData(1, 132, 4), 0x03020101)
+
+    def testSameRegionUsesSyncRead(self):
+        self.addFields(range(1, 9), 132, 4)
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_SYNC)
+        self.assertEqual(self.bus.instructions[-1][1], 0x82)
+        self.assertEqual(self.planner.getData(5, 134, 2), 0x0302)
+
+    def testDistantRegionsUseBulkRead(self):
+        self.addFields(range(1, 5), 132, 4)
+        self.addFields(range(5, 9), 0, 2)
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_BULK)
+        self.assertEqual(self.planner.getData(6, 0, 2), fake_port.MODEL_NUMBER)
+        self.assertFalse(self.planner.isAvailable(6, 132, 4))
+
+    def testFastRead(self):
+        self.planner.setFastRead(True)
+        self.addFields(range(1, 9), 132, 4)
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_FAST_SYNC)
+        self.assertEqual(self.planner.getData(8, 132, 4), 0x03020108)
+
+    def testFastReadUnsupported(self):
+        self.bus.fast_read = False
+        self.planner.setFastRead(True)
+        self.addFields(range(1, 9), 132, 4)
+
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)   # 同一周期改用 Sync Read
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_FAST_SYNC)
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_FAST_BULK)  # 下一个最快的方式
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_SYNC)
+        self.assertEqual(sorted(self.planner.estimateCosts()), [READ_PLAN_PER_ID, READ_PLAN_SYNC, READ_PLAN_BULK])
+
+    def testDeadServoKeepsFastRead(self):
+        # 设备掉线不代表不支持 Fast 指令
+        self.planner.setFastRead(True)
+        self.addFields(range(1, 9), 132, 4)
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+
+        self.bus.dead.add(3)
+        self.assertEqual(self.planner.txRxPacket(), COMM_RX_TIMEOUT)
+        self.assertEqual(self.planner.getState(3, 132, 4)[1], COMM_RX_TIMEOUT)
+        self.assertEqual(self.planner.getData(4, 132, 4), 0x03020104)
+
+        self.bus.dead.discard(3)
+        self.planner.txRxPacket()
+        self.assertEqual(self.planner.txRxPacket(), COMM_SUCCESS)
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_FAST_SYNC)
+
+    def testReplanOnChange(self):
+        self.addFields([1], 132, 4)
+        self.planner.txRxPacket()
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_PER_ID)
+
+        self.addFields(range(2, 9), 132, 4)
+        self.assertFalse(self.planner.isPlanValid())
+        self.planner.txRxPacket()
+        self.assertEqual(self.planner.getPlan(), READ_PLAN_SYNC)
+
+        self.port.tx_time_per_byte *= 2     # 波特率变化
+        self.assertFalse(self.planner.isPlanValid())
+
+    def testPerIdFailure(self):
+        self.addFields([1], 132, 4)
+        self.planner.txRxPacket()
+        self.bus.dead.add(1)
+        self.assertEqual(self.planner.txRxPacket(), COMM_RX_TIMEOUT)
+        self.assertEqual(self.planner.getState(1, 132, 4), (bytearray([1, 1, 2, 3]), COMM_RX_TIMEOUT, 0))
+        self.assertFalse(self.planner.isAvailable(1, 132, 4))
+
+    def testProtocol1Strategies(self):
+        planner = ReadPlanner(self.port, PacketHandler(1.0), fast_read=True)
+        planner.addParam(1, 36, 2)
+        self.assertEqual(sorted(planner.estimateCosts()), [READ_PLAN_PER_ID, READ_PLAN_BULK])
+
+    def testFastBulkEstimate(self):
+        self.planner.setFastRead(True)
+        self.addFields(range(1, 5), 132, 4)
+        self.addFields(range(5, 9), 0, 2)
+        costs = self.planner.estimateCosts()
+        self.assertLess(costs[READ_PLAN_FAST_BULK][0], costs[READ_PLAN_BULK][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import unittest
+
+import fake_port
+from dynamixel_sdk import PacketHandler, RttEstimator, COMM_SUCCESS, COMM_RX_TIMEOUT
+
+MS = 1000000
+
+
+class RttEstimatorTest(unittest.TestCase):
+    def testFirstSample(self):
+        estimator = RttEstimator(min_timeout=0)
+        self.assertIsNone(estimator.getTimeoutNs(1))
+
+        estimator.addSample(1, 2 * MS)
+        self.assertEqual(estimator.getSrttNs(1), 2 * MS)
+        self.assertEqual(estimator.getRttVarNs(1), 1 * MS)
+        self.assertEqual(estimator.getTimeoutNs(1), 6 * MS)     # SRTT + 4 * RTTVAR
+
+    def testSmoothing(self):
+        estimator = RttEstimator(min_timeout=0)
+        estimator.addSample(1, 2 * MS)
+        estimator.addSample(1, 4 * MS)
+        self.assertAlmostEqual(estimator.getRttVarNs(1), 0.75 * MS + 0.25 * 2 * MS)
+        self.assertAlmostEqual(estimator.getSrttNs(1), 0.875 * 2 * MS + 0.125 * 4 * MS)
+
+    def testMinTimeout(self):
+        estimator = RttEstimator(min_timeout=1.0)
+        estimator.addSample(1, 1000)
+        self.assertEqual(estimator.getTimeoutNs(1), 1 * MS)
+
+    def testBackoff(self):
+        estimator = RttEstimator(min_timeout=0)
+        estimator.onTimeout(1)      # 尚无样本时不退避
+        self.assertFalse(estimator.hasEstimate(1))
+
+        estimator.addSample(1, 2 * MS)
+        for _ in range(10):
+            estimator.onTimeout(1)
+        self.assertEqual(estimator.getTimeoutNs(1), 6 * MS * 64)
+
+        estimator.addSample(1, 2 * MS)  # 收到新样本后恢复
+        self.assertLess(estimator.getTimeoutNs(1), 6 * MS)
+
+    def testNegativeSample(self):
+        estimator = RttEstimator()
+        estimator.addSample(1, -5)
+        self.assertEqual(estimator.getSrttNs(1), 0)
+
+
+class PortRttTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1, 2])
+        self.port = fake_port.makeFakePort(self.bus)
+        self.estimator = RttEstimator()
+        self.port.setRttEstimator(self.estimator)
+        self.ph = PacketHandler(2.0)
+
+    def testSamplesPerId(self):
+        self.assertEqual(self.ph.read4ByteTxRx(self.port, 1, 132)[1], COMM_SUCCESS)
+        self.assertTrue(self.estimator.hasEstimate(1))
+        self.assertFalse(self.estimator.hasEstimate(2))
+
+        # 有估计值后超时不超过固定公式
+        fixed = self.port.tx_time_per_byte * 15 + self.port.latency_timer * 2.0 + 2.0
+        self.port.setPacketTimeoutFor(1, 15)
+        self.assertLessEqual(self.port.packet_timeout, fixed + 1e-6)
+
+    def testTimeoutBacksOff(self):
+        self.ph.read4ByteTxRx(self.port, 1, 132)
+        self.bus.dead.add(1)
+        self.assertEqual(self.ph.read4ByteTxRx(self.port, 1, 132)[1], COMM_RX_TIMEOUT)
+        self.assertEqual(self.estimator.backoff[1], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
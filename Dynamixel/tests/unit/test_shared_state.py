@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+
+import struct
+import sys
+import unittest
+
+import fake_port
+import dynamixel_sdk
+from dynamixel_sdk import COMM_SUCCESS, COMM_RX_TIMEOUT, COMM_NOT_AVAILABLE, COMM_PORT_BUSY
+
+
+@unittest.skipUnless(sys.version_info >= (3, 8), 'multiprocessing.shared_memory is not available')
+class SharedStateBlockTest(unittest.TestCase):
+    def setUp(self):
+        self.block = dynamixel_sdk.SharedStateBlock(3, 4)
+
+    def tearDown(self):
+        self.block.close()
+        self.block.unlink()
+
+    def testInitialState(self):
+        self.assertEqual(self.block.getSeq(0), 0)
+        self.assertEqual(self.block.read(0), (0, b'', COMM_NOT_AVAILABLE, 0, 0))
+
+    def testReadWrite(self):
+        self.assertTrue(self.block.write(1, [1, 2, 3, 4], COMM_SUCCESS, 0x20, 1234))
+        self.assertEqual(self.block.read(1), (2, b'\x01\x02\x03\x04', COMM_SUCCESS, 0x20, 1234))
+
+        self.assertTrue(self.block.write(1, [5], COMM_RX_TIMEOUT, 0, 5678))
+        self.assertEqual(self.block.read(1), (4, b'\x05', COMM_RX_TIMEOUT, 0, 5678))
+
+        # 其他槽位不受影响
+        self.assertEqual(self.block.getSeq(0), 0)
+        self.assertEqual(self.block.getSeq(2), 0)
+
+    def testDataTooLong(self):
+        self.assertFalse(self.block.write(0, [1, 2, 3, 4, 5]))
+        self.assertEqual(self.block.getSeq(0), 0)
+
+    def testAttach(self):
+        other = dynamixel_sdk.SharedStateBlock.attach(self.block.getName(), 3, 4)
+        try:
+            other.write(2, [9, 8, 7, 6], COMM_SUCCESS, 0, 1)
+            self.assertEqual(self.block.read(2)[1], b'\x09\x08\x07\x06')
+        finally:
+            other.close()
+
+    def testTornWriteIsDetected(self):
+        self.block.write(0, [1, 2, 3, 4], COMM_SUCCESS, 0, 1)
+
+        # 写入方在写入中途停止：序号为奇数，读取方不返回未完成的数据
+        offset = 0
+        seq = self.block.getSeq(0)
+        struct.pack_into('<I', self.block.buf, offset, seq + 1)
+        self.block.buf[offset + dynamixel_sdk.SLOT_HEADER_SIZE] = 0xAA
+        self.assertEqual(self.block.read(0), (None, b'', COMM_PORT_BUSY, 0, 0))
+
+        # 写入完成后读取到新的数据
+        struct.pack_into('<I', self.block.buf, offset, seq + 2)
+        self.assertEqual(self.block.read(0)[0: 3], (seq + 2, b'\xaa\x02\x03\x04', COMM_SUCCESS))
+
+    def testSequenceSkipsZero(self):
+        struct.pack_into('<I', self.block.buf, 0, 0xFFFFFFFE)
+        self.block.write(0, [1])
+        self.assertEqual(self.block.getSeq(0), 2)
+
+
+@unittest.skipUnless(sys.version_info >= (3, 8), 'multiprocessing.shared_memory is not available')
+class SharedStateViewTest(unittest.TestCase):
+    def setUp(self):
+        self.block = dynamixel_sdk.SharedStateBlock(2, 4)
+        self.view = dynamixel_sdk.SharedStateView(self.block, [5, 7], 132, 4)
+
+    def tearDown(self):
+        self.block.close()
+        self.block.unlink()
+
+    def testGetData(self):
+        self.block.write(1, [0x01, 0x02, 0x03, 0x04], COMM_SUCCESS, 0, 1)
+        self.assertTrue(self.view.isAvailable(7, 132, 4))
+        self.assertEqual(self.view.getData(7, 132, 4), 0x04030201)
+        self.assertEqual(self.view.getData(7, 134, 2), 0x0403)
+        self.assertEqual(self.view.getData(7, 133, 1), 0x02)
+        self.assertFalse(self.view.isAvailable(7, 134, 4))
+
+    def testUnavailable(self):
+        self.assertFalse(self.view.isAvailable(5, 132, 4))    # 尚未写入
+        self.assertEqual(self.view.getState(9), (b'', COMM_NOT_AVAILABLE, 0, 0))
+
+        self.block.write(0, [1, 2, 3, 4], COMM_RX_TIMEOUT, 0, 1)
+        self.assertFalse(self.view.isAvailable(5, 132, 4))
+        self.assertEqual(self.view.getData(5, 132, 4), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
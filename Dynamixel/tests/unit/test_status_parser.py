@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import unittest
+
+import fake_port
+from dynamixel_sdk import PacketHandler, COMM_SUCCESS, COMM_RX_CORRUPT, COMM_RX_TIMEOUT, COMM_RX_WAITING
+from dynamixel_sdk.protocol1_packet_handler import Protocol1StatusParser
+from dynamixel_sdk.protocol2_packet_handler import Protocol2StatusParser
+
+NOISE = bytes(bytearray(range(0x00, 0xFD))) * 4000     # 不含帧头的线路噪声 (约 1 MB)
+
+
+class Protocol2StatusParserTest(unittest.TestCase):
+    def testNoiseDoesNotGrowBuffer(self):
+        parser = Protocol2StatusParser()
+        self.assertEqual(parser.feed(NOISE), [])
+        self.assertLessEqual(len(parser.rxbuffer), 3)
+
+        for idx in range(0, len(NOISE), 64):    # 分片输入
+            parser.feed(NOISE[idx: idx + 64])
+        self.assertLess(len(parser.rxbuffer), 2048)
+
+        packets = parser.feed(bytes(fake_port.makeStatusPacket(7, 0, [1, 2])))
+        self.assertEqual([(status.id, list(status.params)) for status in packets], [(7, [1, 2])])
+
+    def testHeaderSplitAcrossCompaction(self):
+        parser = Protocol2StatusParser()
+        packet = bytes(fake_port.makeStatusPacket(3, 0, [9]))
+        parser.feed(NOISE[0: 5000] + packet[0: 2])
+        self.assertEqual([status.id for status in parser.feed(packet[2:])], [3])
+
+    def testFragmentsAndMultiplePackets(self):
+        parser = Protocol2StatusParser()
+        data = bytes(fake_port.makeStatusPacket(1, 0, [0xff, 0xff, 0xfd, 4]) + fake_port.makeStatusPacket(2, 0x80, []))
+        packets = []
+        for idx in range(len(data)):
+            packets += parser.feed(data[idx: idx + 1])
+
+        self.assertEqual([(status.id, status.error) for status in packets], [(1, 0), (2, 0x80)])
+        self.assertEqual(list(packets[0].params), [0xff, 0xff, 0xfd, 4])    # 已去除字节填充
+        self.assertEqual(parser.getRxLength(), 0)
+
+    def testCorruptPacketIsSkipped(self):
+        parser = Protocol2StatusParser()
+        corrupt = fake_port.makeStatusPacket(1, 0, [1, 2])
+        corrupt[-1] ^= 0xFF
+        parser.addData(bytes(corrupt + fake_port.makeStatusPacket(2, 0, [3])))
+
+        self.assertEqual(parser.parsePacket(), (None, COMM_RX_CORRUPT))
+        status, result = parser.parsePacket()
+        self.assertEqual((status.id, result), (2, COMM_SUCCESS))
+        self.assertEqual(parser.parsePacket(), (None, COMM_RX_WAITING))
+        self.assertEqual(parser.corrupt_count, 1)
+
+
+class StatusReceiverTest(unittest.TestCase):
+    def setUp(self):
+        self.port = fake_port.makeFakePort()
+        self.ph = PacketHandler(2.0)
+
+    def startReceive(self, data):
+        self.port.ser.inject(data)
+        self.port.acquireBus()
+        self.port.setPacketTimeout(20)
+
+    def testRxPacket(self):
+        self.startReceive(bytes(fake_port.makeStatusPacket(5, 0, [1])))
+        rxpacket, result = self.ph.rxPacket(self.port)
+        self.assertEqual((rxpacket[4], result), (5, COMM_SUCCESS))
+        self.assertFalse(self.port.bus_arbiter.isLocked())
+
+    def testRxPacketTimeoutAndCorrupt(self):
+        self.startReceive(b'')
+        self.assertEqual(self.ph.rxPacket(self.port)[1], COMM_RX_TIMEOUT)
+
+        self.startReceive(bytes(fake_port.makeStatusPacket(5, 0, [1, 2, 3])[0: 9]))   # 不完整的状态包
+        self.assertEqual(self.ph.rxPacket(self.port)[1], COMM_RX_CORRUPT)
+
+    def testPacketReceivedBeforeDeadline(self):
+        # 超时前已到达缓冲区的状态包，在超时后才解析完也有效
+        self.startReceive(bytes(fake_port.makeStatusPacket(5, 0, [1, 2, 3])))
+        self.port.setPacketTimeoutMillis(0)
+        self.assertEqual(self.ph.rxPacket(self.port)[1], COMM_SUCCESS)
+
+        self.startReceive(bytes(fake_port.makeStatusPacket(1, 0, [1, 2]) + fake_port.makeStatusPacket(2, 0, [3, 4])))
+        self.port.setPacketTimeoutMillis(0)
+        self.assertEqual(self.ph.readRxMulti(self.port, {1: 2, 2: 2})[1], COMM_SUCCESS)
+
+    def testReadRxMultiKeepsReceivedPackets(self):
+        self.startReceive(bytes(fake_port.makeStatusPacket(1, 0, [1, 2]) + fake_port.makeStatusPacket(3, 0, [5, 6])))
+        status_list, result = self.ph.readRxMulti(self.port, {1: 2, 2: 2, 3: 2})
+        self.assertEqual(result, COMM_RX_TIMEOUT)
+        self.assertEqual(sorted(status_list), [1, 3])
+
+        self.startReceive(bytes(fake_port.makeStatusPacket(2, 0, [1, 2]) + fake_port.makeStatusPacket(1, 0, [3, 4])))
+        status_list, result = self.ph.readRxMulti(self.port, {1: 2, 2: 2})
+        self.assertEqual(result, COMM_SUCCESS)
+        self.assertEqual(list(status_list[1].params), [3, 4])
+
+    def testReadRxMultiSkipsShortPackets(self):
+        self.startReceive(bytes(fake_port.makeStatusPacket(1, 0, [1]) + fake_port.makeStatusPacket(2, 0, [1, 2])))
+        status_list, result = self.ph.readRxMulti(self.port, {1: 2, 2: 2})
+        self.assertEqual((sorted(status_list), result), ([2], COMM_RX_TIMEOUT))
+
+    def testRxStatusPollAcrossCalls(self):
+        packet = bytes(fake_port.makeStatusPacket(2, 0, [7, 8]) + fake_port.makeStatusPacket(5, 0, [1]))
+        self.startReceive(packet[0: 6])
+        self.assertEqual(self.ph.readRxPoll(self.port, 5, 1), ([], COMM_RX_WAITING, 0))
+        self.assertTrue(self.port.isRxPolling())
+
+        self.port.ser.inject(packet[6:])
+        self.assertEqual(self.ph.readRxPoll(self.port, 5, 1), ([1], COMM_SUCCESS, 0))   # 跳过 ID 2
+        self.assertFalse(self.port.isRxPolling())
+        self.assertFalse(self.port.bus_arbiter.isLocked())
+
+    def testReadRxMultiPollReturnsPartialResults(self):
+        self.startReceive(bytes(fake_port.makeStatusPacket(1, 0, [1, 2])))
+        status_list, result = self.ph.readRxMultiPoll(self.port, {1: 2, 2: 2})
+        self.assertEqual((sorted(status_list), result), ([1], COMM_RX_WAITING))
+
+        self.port.ser.inject(bytes(fake_port.makeStatusPacket(2, 0, [3, 4])))
+        status_list, result = self.ph.readRxMultiPoll(self.port, {1: 2, 2: 2})
+        self.assertEqual((sorted(status_list), result), ([1, 2], COMM_SUCCESS))
+
+    def testPollTimeout(self):
+        self.startReceive(b'')
+        self.port.setPacketTimeoutMillis(0)
+        self.assertEqual(self.ph.rxStatusPoll(self.port), (None, COMM_RX_TIMEOUT))
+        self.assertFalse(self.port.isRxPolling())
+
+
+class Protocol1StatusParserTest(unittest.TestCase):
+    def testNoiseDoesNotGrowBuffer(self):
+        parser = Protocol1StatusParser()
+        noise = bytes(bytearray(range(0x00, 0xFF))) * 4000
+        self.assertEqual(parser.feed(noise), [])
+        self.assertLessEqual(len(parser.rxbuffer), 2)
+
+        packets = parser.feed(bytes(fake_port.makeProtocol1StatusPacket(4, 0, [5, 6])))
+        self.assertEqual([(status.id, list(status.params)) for status in packets], [(4, [5, 6])])
+
+
+if __name__ == '__main__':
+    unittest.main()
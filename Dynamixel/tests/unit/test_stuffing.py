@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import unittest
+
+import fake_port
+from dynamixel_sdk import addStuffing, removeStuffing
+
+
+def makeRawPacket(body):
+    # 未填充的数据包，CRC 位置留空
+    length = len(body) + 2
+    return bytearray(b'\xff\xff\xfd\x00\x01') + bytearray([length & 0xFF, length >> 8]) + bytearray(body) + \
+        bytearray(2)
+
+
+class StuffingTest(unittest.TestCase):
+    BODIES = [
+        [0x03, 0x74, 0x00, 0x10, 0x20],                     # 无需填充
+        [0x03, 0xff, 0xff, 0xfd, 0x01],                     # 一处
+        [0x03, 0xff, 0xff, 0xfd, 0xff, 0xff, 0xfd, 0xfd],   # 多处，末尾已有 FD
+        [0xff, 0xff, 0xfd] * 50,
+    ]
+
+    def testAddStuffing(self):
+        for body in self.BODIES:
+            packet = addStuffing(makeRawPacket(body))
+            self.assertEqual(packet, makeRawPacket(fake_port.stuff(body)))
+
+    def testRoundTrip(self):
+        for body in self.BODIES:
+            packet = removeStuffing(addStuffing(makeRawPacket(body)))
+            self.assertEqual(packet, makeRawPacket(body))
+
+    def testRemoveStuffing(self):
+        body = fake_port.stuff([0x55, 0x00, 0xff, 0xff, 0xfd, 0x12])
+        packet = removeStuffing(makeRawPacket(body))
+        self.assertEqual(packet, makeRawPacket([0x55, 0x00, 0xff, 0xff, 0xfd, 0x12]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+################################################################################
+# Copyright 2017 ROBOTIS CO., LTD.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################
+
+import threading
+import unittest
+
+import fake_port
+from dynamixel_sdk import PacketHandler, WriteBatch, COMM_SUCCESS, COMM_TX_FAIL, COMM_NOT_AVAILABLE
+
+
+class WriteBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = fake_port.FakeServoBus([1, 2, 3])
+        self.port = fake_port.makeFakePort(self.bus)
+        self.ph = PacketHandler(2.0)
+
+    def getInstructions(self):
+        return [instruction for _, instruction in self.bus.instructions]
+
+    def testSingleWriteHasNoStatusPacket(self):
+        with WriteBatch(self.port):
+            self.assertEqual(self.ph.write1ByteTxOnly(self.port, 1, 64, 1), COMM_SUCCESS)
+            self.assertEqual(self.bus.instructions, [])
+
+        self.assertEqual(self.getInstructions(), [0x83])   # 广播的 Sync Write
+        self.assertEqual(self.bus.memory[1][64], 1)
+        self.assertEqual(self.port.ser.in_waiting, 0)
+
+        self.assertEqual(self.ph.read4ByteTxRx(self.port, 2, 132), (0x03020102, COMM_SUCCESS, 0))
+
+    def testMergeWrites(self):
+        with WriteBatch(self.port):
+            for dxl_id in (1, 2, 3):
+                self.ph.write4ByteTxOnly(self.port, dxl_id, 116, 1000 + dxl_id)
+            self.ph.write1ByteTxOnly(self.port, 1, 64, 1)
+            self.ph.write1ByteTxOnly(self.port, 1, 64, 0)     # 同一区域只保留最后一次
+
+        # 同一设备的第二次写入分到下一个数据包
+        self.assertEqual(self.getInstructions(), [0x83, 0x83])
+        self.assertEqual(self.bus.memory[3][116], 1003 & 0xFF)
+        self.assertEqual(self.bus.memory[1][64], 0)
+
+    def testDifferentRegionsUseBulkWrite(self):
+        with WriteBatch(self.port):
+            self.ph.write4ByteTxOnly(self.port, 1, 116, 1000)
+            self.ph.write1ByteTxOnly(self.port, 2, 64, 1)
+
+        self.assertEqual(self.getInstructions(), [0x93])
+        self.assertEqual(self.bus.memory[1][116], 1000 & 0xFF)
+        self.assertEqual(self.bus.memory[2][64], 1)
+
+    def testSameRegionUsesSyncWrite(self):
+        with WriteBatch(self.port):
+            for dxl_id in (1, 2, 3):
+                self.ph.write1ByteTxOnly(self.port, dxl_id, 64, 1)
+
+        self.assertEqual(self.getInstructions(), [0x83])
+        self.assertEqual([self.bus.memory[dxl_id][64] for dxl_id in (1, 2, 3)], [1, 1, 1])
+
+    def testFlushReturnsFailure(self):
+        self.port.ser.write = lambda data: 0    # 发送失败
+        batch = WriteBatch(self.port)
+        with batch:
+            self.assertEqual(self.ph.write1ByteTxOnly(self.port, 1, 64, 1), COMM_SUCCESS)
+
+        self.assertEqual(batch.getLastResult(), COMM_TX_FAIL)
+
+    def testTxRxIsRefused(self):
+        # 合并的写入没有状态包，write*TxRx 不能报告尚未发送的写入成功
+        with WriteBatch(self.port) as batch:
+            self.assertEqual(self.ph.write1ByteTxRx(self.port, 1, 64, 1), (COMM_NOT_AVAILABLE, 0))
+            self.assertEqual(batch.getWriteCount(), 0)
+
+        self.assertEqual(self.bus.instructions, [])
+        self.assertEqual(self.bus.memory[1][64], 0)
+        self.assertEqual(self.ph.write1ByteTxRx(self.port, 1, 64, 1), (COMM_SUCCESS, 0))
+
+    def testOtherThreadIsNotBatched(self):
+        results = []
+        with WriteBatch(self.port) as batch:
+            thread = threading.Thread(target=lambda: results.append(self.ph.write1ByteTxRx(self.port, 2, 64, 1)))
+            thread.start()
+            thread.join()
+            self.assertEqual(batch.getWriteCount(), 0)
+
+        self.assertEqual(results, [(COMM_SUCCESS, 0)])
+        self.assertEqual(self.bus.memory[2][64], 1)
+
+    def testExceptionDiscardsWrites(self):
+        try:
+            with WriteBatch(self.port):
+                self.ph.write1ByteTxOnly(self.port, 1, 64, 1)
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+        self.assertEqual(self.bus.instructions, [])
+        self.assertIsNone(self.port.write_batch)
+
+
+if __name__ == '__main__':
+    unittest.main()